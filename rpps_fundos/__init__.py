@@ -0,0 +1 @@
+# Pacote de apoio às análises de fundos previdenciários (RPPS) - IPREM/DGBC
@@ -0,0 +1,5 @@
+import sys
+
+from rpps_fundos.cli import main
+
+sys.exit(main())
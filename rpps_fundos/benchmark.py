@@ -0,0 +1,180 @@
+import glob
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from rpps_fundos.cache import NOME_PASTA_CACHE, ler_aba
+from rpps_fundos.cubo import gravar_cubo, mes_do_arquivo
+from rpps_fundos.escrita import escrever
+from rpps_fundos.esquema import compactar
+from rpps_fundos.historico import gravar_historico
+from rpps_fundos.instrumentacao import ETAPAS as ETAPAS_PIPELINE, Instrumentacao
+from rpps_fundos.pipeline import PASTA_RESULTADOS, POPULACOES, RAIZ, classificar, selecionar_aba, selecionar_arquivo
+from rpps_fundos.sintetico import LIMITE_LINHAS_XLSX, gerar_bases
+
+# === CONFIGURAÇÕES ===
+ESCALAS_PADRAO = (100_000, 1_000_000)
+NOME_PASTA_BENCHMARK = "benchmark"  # resultados/benchmark/benchmark.csv: histórico entre versões
+LIMIAR_REGRESSAO = 0.20  # etapa 20% mais lenta que na versão anterior...
+MINIMO_REGRESSAO = 0.05  # ...e ao menos 50 ms mais lenta (etapas de milissegundos oscilam muito)
+
+# Etapas medidas, na ordem do pipeline (completar faz duplicidade de CPF e cenários juntos)
+ETAPAS = {
+    **ETAPAS_PIPELINE,
+    "leitura": "Leitura (sem cache)",
+    "gravacao_cache": "Leitura com gravação do cache",
+    "leitura_cache": "Leitura do cache",
+}
+
+
+def versao():
+    """Commit atual (com '+' se houver alterações não commitadas) ou 'desconhecida'."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        alterado = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+    return commit + ("+" if alterado else "")
+
+
+def _ler_colunar(arquivo, config):
+    # Equivalente de ler_aba para as bases em parquet (escalas acima do limite do Excel)
+    import pyarrow.parquet as pq
+
+    nomes = pq.read_schema(arquivo).names
+    df = pd.read_parquet(arquivo, columns=[c for c in nomes if c in config["colunas"] or c in config["aliases"]])
+    return df.rename(columns=config["aliases"])
+
+
+def executar_etapas(populacao, pasta_dados, pasta_saida, entrada, instrumentacao):
+    """Roda o pipeline de uma população etapa a etapa, medindo cada uma (gravação sem segundo plano)."""
+    config = POPULACOES[populacao]
+    if entrada == "xlsx":
+        with instrumentacao.etapa("descoberta"):
+            arquivo = selecionar_arquivo(config["termo"], pasta_dados)
+            aba = selecionar_aba(arquivo, config["termo"])
+        with instrumentacao.etapa("leitura"):
+            df = ler_aba(arquivo, aba, colunas=config["colunas"], aliases=config["aliases"],
+                         opcionais=config["opcionais"], usar_cache=False)
+        shutil.rmtree(os.path.join(pasta_dados, NOME_PASTA_CACHE), ignore_errors=True)
+        with instrumentacao.etapa("gravacao_cache"):
+            ler_aba(arquivo, aba, colunas=config["colunas"], aliases=config["aliases"], opcionais=config["opcionais"])
+        with instrumentacao.etapa("leitura_cache"):
+            df = ler_aba(arquivo, aba, colunas=config["colunas"], aliases=config["aliases"], opcionais=config["opcionais"])
+    else:
+        with instrumentacao.etapa("descoberta"):
+            arquivo = sorted(glob.glob(os.path.join(pasta_dados, f"{config['termo']}_*.parquet")))[-1]
+        with instrumentacao.etapa("leitura"):
+            df = _ler_colunar(arquivo, config)
+
+    with instrumentacao.etapa("compactacao", len(df)):
+        df = compactar(df, config["colunas"])
+    df = classificar(populacao, df, instrumentacao)
+    with instrumentacao.etapa("rotulos", len(df)):
+        saida = config["saida"](df)
+    with instrumentacao.etapa("escrita", len(saida)):
+        formato = "xlsx" if len(saida) <= LIMITE_LINHAS_XLSX else "parquet"
+        escrever(saida, os.path.join(pasta_saida, config["arquivo_saida"]), (formato,))
+    with instrumentacao.etapa("resumo", len(df)):
+        config["resumo"](df)
+    with instrumentacao.etapa("cubo", len(df)):
+        gravar_cubo(populacao, df, mes_do_arquivo(arquivo), pasta_saida)
+    with instrumentacao.etapa("historico", len(df)):
+        gravar_historico(populacao, df, mes_do_arquivo(arquivo), pasta_saida)
+    return len(df)
+
+
+# === EXECUÇÃO EM VÁRIAS ESCALAS ===
+def _colunas_usadas():
+    return {p: set(config["colunas"]) | set(config["aliases"]) for p, config in POPULACOES.items()}
+
+
+def executar_benchmark(escalas=ESCALAS_PADRAO, populacoes=None, memoria=True, pasta=None, semente=0):
+    """Gera bases sintéticas em cada escala e mede as etapas de cada população.
+
+    Até o limite de linhas do Excel as bases são .xlsx com todas as colunas do layout; acima
+    dele, parquet só com as colunas usadas. Com memoria, cada escala roda uma segunda vez sob
+    o tracemalloc (o pico não contamina os tempos). Retorna um DataFrame com uma linha por etapa.
+    """
+    populacoes = list(populacoes or POPULACOES)
+    registro = {"data": datetime.now().isoformat(timespec="seconds"), "versao": versao()}
+    linhas = []
+    for escala in escalas:
+        entrada = "xlsx" if escala <= LIMITE_LINHAS_XLSX else "parquet"
+        pasta_escala = tempfile.mkdtemp(prefix=f"benchmark_{escala}_", dir=pasta)
+        try:
+            pasta_dados = os.path.join(pasta_escala, "dados")
+            pasta_saida = os.path.join(pasta_escala, "resultados")
+            os.makedirs(pasta_saida)
+            print(f"Gerando bases sintéticas: {escala} linhas ({entrada})...")
+            gerar_bases(pasta_dados, {p: escala for p in populacoes}, formatos=(entrada,), semente=semente,
+                        colunas=None if entrada == "xlsx" else _colunas_usadas())
+
+            for populacao in populacoes:
+                with Instrumentacao(populacao) as tempos:
+                    total = executar_etapas(populacao, pasta_dados, pasta_saida, entrada, tempos)
+                picos = {}
+                if memoria:
+                    with Instrumentacao(populacao, rastrear_alocacoes=True) as alocacoes:
+                        executar_etapas(populacao, pasta_dados, pasta_saida, entrada, alocacoes)
+                    picos = alocacoes.medidas()
+                for etapa in tempos.etapas:
+                    pico = picos[etapa.nome].tracemalloc_pico_mb if etapa.nome in picos else None
+                    linhas.append({**registro, "populacao": populacao, "linhas": total, "entrada": entrada,
+                                   "etapa": etapa.nome, "segundos": round(etapa.segundos, 4),
+                                   "cpu_s": round(etapa.cpu, 4), "pico_mb": None if pico is None else round(pico, 1)})
+                print(f"- {populacao}: {tempos.total:.1f}s")
+        finally:
+            shutil.rmtree(pasta_escala, ignore_errors=True)
+    return pd.DataFrame(linhas)
+
+
+# === HISTÓRICO E REGRESSÕES ===
+def arquivo_historico(pasta_resultados=PASTA_RESULTADOS):
+    return os.path.join(pasta_resultados, NOME_PASTA_BENCHMARK, "benchmark.csv")
+
+
+def salvar_medidas(medidas, pasta_resultados=PASTA_RESULTADOS):
+    """Acrescenta as medidas ao histórico; retorna (histórico anterior, caminho)."""
+    caminho = arquivo_historico(pasta_resultados)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    anterior = pd.read_csv(caminho) if os.path.exists(caminho) else medidas.iloc[:0]
+    # Reescreve o arquivo inteiro: colunas novas entram sem desalinhar as linhas antigas
+    pd.concat([anterior, medidas], ignore_index=True).to_csv(caminho, index=False)
+    return anterior, caminho
+
+
+def comparar(medidas, anterior, limiar=LIMIAR_REGRESSAO):
+    """Compara cada etapa com a execução mais recente de outra versão (mesma população, linhas e entrada)."""
+    chave = ["populacao", "linhas", "entrada", "etapa"]
+    outras = anterior[anterior["versao"] != medidas["versao"].iloc[0]] if len(medidas) else anterior
+    referencia = outras.sort_values("data").groupby(chave, as_index=False).last()
+    comparacao = medidas.merge(referencia[chave + ["versao", "segundos"]], on=chave, how="left",
+                               suffixes=("", "_anterior"))
+    comparacao["variacao"] = comparacao["segundos"] / comparacao["segundos_anterior"] - 1
+    diferenca = comparacao["segundos"] - comparacao["segundos_anterior"]
+    comparacao["regressao"] = (comparacao["variacao"] > limiar) & (diferenca > MINIMO_REGRESSAO)
+    return comparacao
+
+
+def relatorio(comparacao):
+    linhas = []
+    for (populacao, total, entrada), grupo in comparacao.groupby(["populacao", "linhas", "entrada"], sort=False):
+        linhas.append(f"\n=== {populacao.upper()} | {total} linhas ({entrada}) ===")
+        for registro in grupo.itertuples(index=False):
+            texto = f"- {ETAPAS[registro.etapa]}: {registro.segundos:.3f}s"
+            if pd.notna(registro.pico_mb):
+                texto += f" | pico {registro.pico_mb:.1f} MB"
+            if pd.notna(registro.variacao):
+                texto += f" | {registro.variacao:+.1%} vs {registro.versao_anterior}"
+                texto += " (REGRESSÃO)" if registro.regressao else ""
+            linhas.append(texto)
+    regressoes = int(comparacao["regressao"].sum())
+    linhas.append(f"\nEtapas mais de {LIMIAR_REGRESSAO:.0%} mais lentas que a versão anterior: {regressoes}")
+    return linhas
@@ -0,0 +1,175 @@
+import glob
+import hashlib
+import json
+import numbers
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from rpps_fundos.leitura import ler_colunas, listar_abas  # noqa: F401 (listar_abas reexportada)
+
+# === CONFIGURAÇÕES ===
+NOME_PASTA_CACHE = ".cache"  # criada ao lado do arquivo de origem (ex.: dados/.cache)
+ARQUIVO_INDICE = "indice.json"
+META_COLUNAS_MISTAS = b"rpps_fundos.colunas_mistas"
+FORMATO_CACHE = 2  # entra na chave: caches gravados em outro formato são ignorados
+
+
+# === HASH DO ARQUIVO DE ORIGEM ===
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _carregar_indice(pasta_cache):
+    caminho = os.path.join(pasta_cache, ARQUIVO_INDICE)
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_indice(pasta_cache, indice):
+    caminho = os.path.join(pasta_cache, ARQUIVO_INDICE)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def hash_com_indice(caminho, pasta_cache):
+    """Retorna o hash do arquivo, recalculando apenas se tamanho ou mtime mudaram."""
+    caminho = os.path.abspath(caminho)
+    info = os.stat(caminho)
+    indice = _carregar_indice(pasta_cache)
+    registro = indice.get(caminho)
+    if registro and registro["tamanho"] == info.st_size and registro["mtime_ns"] == info.st_mtime_ns:
+        return registro["hash"]
+
+    digest = hash_arquivo(caminho)
+    indice[caminho] = {"tamanho": info.st_size, "mtime_ns": info.st_mtime_ns, "hash": digest}
+    _salvar_indice(pasta_cache, indice)
+    return digest
+
+
+# === COLUNAS MISTAS ===
+# Colunas com tipos mistos (ex.: CO_TIPO_FUNDO com 1 e "FUNPREV") são gravadas como texto, com
+# uma coluna paralela ({nome}__tipo, int8) que guarda o tipo de cada célula para reconstruí-la
+SUFIXO_TIPO = "__tipo"
+TIPO_NULO, TIPO_TEXTO, TIPO_INTEIRO, TIPO_REAL, TIPO_LOGICO, TIPO_DATA = range(6)
+CONVERSORES = {
+    TIPO_TEXTO: str, TIPO_INTEIRO: int, TIPO_REAL: float,
+    TIPO_LOGICO: lambda texto: texto == "1", TIPO_DATA: pd.Timestamp,
+}
+
+
+def _codificar_celula(valor):
+    """(tipo, texto) de uma célula; tipos fora da lista são gravados como texto."""
+    if valor is None or valor is pd.NA:
+        return TIPO_NULO, None
+    if isinstance(valor, (bool, np.bool_)):
+        return TIPO_LOGICO, "1" if valor else "0"
+    if isinstance(valor, numbers.Integral):
+        return TIPO_INTEIRO, str(int(valor))
+    if isinstance(valor, numbers.Real):
+        return TIPO_REAL, repr(float(valor))  # repr volta exatamente ao mesmo float (inclusive nan)
+    if isinstance(valor, datetime):
+        return TIPO_DATA, pd.Timestamp(valor).isoformat()
+    return TIPO_TEXTO, str(valor)
+
+
+def _decodificar_celula(tipo, texto):
+    return None if tipo == TIPO_NULO else CONVERSORES[tipo](texto)
+
+
+# === CONVERSÃO PARA ARROW ===
+def _para_tabela_arrow(df):
+    colunas = {}
+    mistas = []
+    for nome in df.columns:
+        serie = df[nome]
+        try:
+            colunas[str(nome)] = pa.array(serie, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            tipos, textos = zip(*map(_codificar_celula, serie)) if len(serie) else ((), ())
+            colunas[str(nome)] = pa.array(textos, type=pa.string())
+            colunas[str(nome) + SUFIXO_TIPO] = pa.array(tipos, type=pa.int8())
+            mistas.append(str(nome))
+    tabela = pa.table(colunas)
+    return tabela.replace_schema_metadata({META_COLUNAS_MISTAS: json.dumps(mistas)})
+
+
+def _gravar_arrow(df, destino):
+    tabela = _para_tabela_arrow(df)
+    temporario = destino + ".tmp"
+    with pa.OSFile(temporario, "wb") as sink:
+        with ipc.new_file(sink, tabela.schema) as writer:
+            writer.write_table(tabela)
+    os.replace(temporario, destino)
+
+
+def _ler_arrow(origem):
+    # Leitura mapeada em memória: apenas as páginas efetivamente usadas são carregadas
+    tabela = ipc.open_file(pa.memory_map(origem, "r")).read_all()
+    metadados = tabela.schema.metadata or {}
+    mistas = json.loads(metadados.get(META_COLUNAS_MISTAS, b"[]"))
+    tipos = [nome + SUFIXO_TIPO for nome in mistas]
+
+    df = tabela.drop_columns(mistas + tipos).to_pandas(split_blocks=True)
+    for nome, coluna_tipo in zip(mistas, tipos):
+        valores = map(_decodificar_celula, tabela.column(coluna_tipo).to_pylist(), tabela.column(nome).to_pylist())
+        df[nome] = pd.Series(list(valores), dtype=object)
+    return df[[nome for nome in tabela.column_names if nome not in tipos]]
+
+
+# === LEITURA COM CACHE ===
+def caminho_cache(caminho, aba, pasta_cache=None, variante=""):
+    caminho = os.path.abspath(caminho)
+    if pasta_cache is None:
+        pasta_cache = os.path.join(os.path.dirname(caminho), NOME_PASTA_CACHE)
+    os.makedirs(pasta_cache, exist_ok=True)
+
+    origem = hashlib.sha1(f"{caminho}|{aba}|{variante}|{FORMATO_CACHE}".encode("utf-8")).hexdigest()[:12]
+    conteudo = hash_com_indice(caminho, pasta_cache)[:16]
+    prefixo = f"{os.path.splitext(os.path.basename(caminho))[0]}__{origem}"
+    return pasta_cache, prefixo, os.path.join(pasta_cache, f"{prefixo}__{conteudo}.arrow")
+
+
+def _ler_planilha(caminho, aba, colunas, aliases, opcionais):
+    if colunas is None:
+        return pd.read_excel(caminho, sheet_name=aba, engine="openpyxl")
+    return ler_colunas(caminho, aba, colunas, aliases=aliases, opcionais=opcionais)
+
+
+def ler_aba(caminho, aba, colunas=None, aliases=None, pasta_cache=None, usar_cache=True, opcionais=()):
+    """Lê uma aba do .xlsx, usando o cache colunar (Arrow IPC) quando disponível.
+
+    Com colunas ({nome: tipo}), lê em streaming apenas essas colunas (ver leitura.py)
+    e o cache guarda a projeção já tipada, sem as colunas opcionais ausentes na aba.
+    """
+    if not usar_cache:
+        return _ler_planilha(caminho, aba, colunas, aliases, opcionais)
+
+    variante = "" if colunas is None else json.dumps([colunas, aliases or {}, sorted(opcionais)], sort_keys=True)
+    pasta_cache, prefixo, destino = caminho_cache(caminho, aba, pasta_cache, variante)
+    if os.path.exists(destino):
+        return _ler_arrow(destino)
+
+    df = _ler_planilha(caminho, aba, colunas, aliases, opcionais)
+
+    # Remove versões anteriores do mesmo arquivo/aba (arquivo de origem alterado)
+    for antigo in glob.glob(os.path.join(pasta_cache, glob.escape(prefixo) + "__*.arrow")):
+        os.remove(antigo)
+    _gravar_arrow(df, destino)
+    # Relê do cache para que a primeira execução tenha os mesmos tipos das seguintes
+    return _ler_arrow(destino)
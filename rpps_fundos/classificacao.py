@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# === DATAS DE CORTE (DECRETOS 61.151/2022 E 64.144/2025) ===
+DATA_CORTE_ENTE = np.datetime64("2018-12-27")
+DATA_CORTE_NASC = np.datetime64("1957-02-28")
+
+# === CÓDIGOS ===
+# CALCULO_FUNDO segue o vocabulário de CO_TIPO_FUNDO (1 = FUNPREV, 2 = FUNFIN)
+FUNDO_INDEFINIDO = 0
+FUNPREV = 1
+FUNFIN = 2
+
+# COMPATIBILIDADE_FUNDO
+INCOMPATIVEL = 0
+COMPATIVEL = 1
+FORA_DA_ANALISE = -1  # pensionista com CALCULO_FUNDO = Null
+
+# CENARIO_FUNDO (apenas para incompatíveis)
+SEM_CENARIO = 0
+CENARIO_1 = 1  # CPF único
+CENARIO_2 = 2  # CPF duplicado, situação (ou tipo de aposentadoria) = 1
+CENARIO_3 = 3  # CPF duplicado, situação (ou tipo de aposentadoria) != 1
+
+ROTULOS_COMPATIBILIDADE = {COMPATIVEL: "compativel", INCOMPATIVEL: "incompativel", FORA_DA_ANALISE: "fora da analise"}
+ROTULOS_CENARIO = {CENARIO_1: "Cenario 1", CENARIO_2: "Cenario 2", CENARIO_3: "Cenario 3"}
+
+CODIGO_AUSENTE = -1
+
+Classificacao = namedtuple("Classificacao", ["calculo", "compatibilidade", "cenario"])
+
+
+# === CONVERSÕES DE ENTRADA ===
+def datas(valores):
+    """Converte Series/array para datetime64 (valores inválidos viram NaT)."""
+    valores = np.asarray(valores)
+    if np.issubdtype(valores.dtype, np.datetime64):
+        return valores
+    return pd.to_datetime(pd.Series(valores), errors="coerce").to_numpy()
+
+
+def codigos(valores):
+    """Converte Series/array de códigos para int8 (vazio ou não numérico vira CODIGO_AUSENTE)."""
+    valores = np.asarray(valores)
+    if valores.dtype == np.int8:
+        return valores
+    numeros = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    validos = np.isfinite(numeros) & (numeros >= -128) & (numeros <= 127)
+    return np.where(validos, numeros, CODIGO_AUSENTE).astype(np.int8)
+
+
+# === CÁLCULO DO FUNDO ===
+def calcular_fundo(dt_ing_ente, dt_nasc, prev_comp, corte_ente=DATA_CORTE_ENTE, corte_nasc=DATA_CORTE_NASC):
+    """FUNFIN: ingresso até o corte, nascimento após o corte e sem RPC.
+    FUNPREV: ingresso após o corte, nascimento até o corte ou com RPC.
+    Registros que não se enquadram (ex.: datas inválidas) ficam FUNDO_INDEFINIDO.
+    """
+    dt_ing_ente = datas(dt_ing_ente)
+    dt_nasc = datas(dt_nasc)
+    prev_comp = codigos(prev_comp)
+    corte_ente = np.datetime64(corte_ente)
+    corte_nasc = np.datetime64(corte_nasc)
+
+    # Comparações com NaT são sempre falsas, como no pandas
+    funprev = (dt_ing_ente > corte_ente) | (dt_nasc <= corte_nasc) | (prev_comp == 1)
+    funfin = (dt_ing_ente <= corte_ente) & (dt_nasc > corte_nasc) & (prev_comp == 2)
+
+    calculo = np.zeros(len(prev_comp), dtype=np.int8)
+    calculo[funfin] = FUNFIN
+    calculo[funprev] = FUNPREV
+    return calculo
+
+
+def calcular_fundo_pensionista(dt_nasc_instituidor, corte_nasc=DATA_CORTE_NASC):
+    """FUNPREV se o instituidor nasceu até o corte ou a data é inválida; senão FUNDO_INDEFINIDO."""
+    dt_nasc = datas(dt_nasc_instituidor)
+    funprev = np.isnat(dt_nasc) | (dt_nasc <= np.datetime64(corte_nasc))
+    return np.where(funprev, FUNPREV, FUNDO_INDEFINIDO).astype(np.int8)
+
+
+# === COMPATIBILIDADE E CENÁRIOS ===
+def calcular_compatibilidade(fundo_informado, calculo):
+    """Compatível quando o fundo informado (CO_TIPO_FUNDO) é igual ao calculado."""
+    return (codigos(fundo_informado) == calculo).astype(np.int8)
+
+
+def calcular_cenario(compatibilidade, cpf_duplicado, situacao):
+    """Cenário de adequação dos incompatíveis: 1 (CPF único), 2 e 3 (CPF duplicado, situação = 1 / != 1)."""
+    incompativel = compatibilidade == INCOMPATIVEL
+    duplicado = np.asarray(cpf_duplicado, dtype=bool)
+    em_exercicio = codigos(situacao) == 1
+
+    cenario = np.zeros(len(incompativel), dtype=np.int8)
+    cenario[incompativel & ~duplicado] = CENARIO_1
+    cenario[incompativel & duplicado & em_exercicio] = CENARIO_2
+    cenario[incompativel & duplicado & ~em_exercicio] = CENARIO_3
+    return cenario
+
+
+def classificar(dt_ing_ente, dt_nasc, prev_comp, fundo_informado, cpf_duplicado, situacao,
+                corte_ente=DATA_CORTE_ENTE, corte_nasc=DATA_CORTE_NASC):
+    """Servidores e aposentados: CALCULO_FUNDO, COMPATIBILIDADE_FUNDO e CENARIO_FUNDO em códigos int8.
+
+    situacao é CO_SITUACAO_FUNCIONAL (servidores) ou CO_TIPO_APOSENTADORIA (aposentados).
+    """
+    calculo = calcular_fundo(dt_ing_ente, dt_nasc, prev_comp, corte_ente, corte_nasc)
+    compatibilidade = calcular_compatibilidade(fundo_informado, calculo)
+    cenario = calcular_cenario(compatibilidade, cpf_duplicado, situacao)
+    return Classificacao(calculo, compatibilidade, cenario)
+
+
+def classificar_pensionistas(dt_nasc_instituidor, fundo_informado, corte_nasc=DATA_CORTE_NASC):
+    """Pensionistas: compatível quando informado FUNPREV e calculado FUNPREV (sem cenários).
+
+    Registros com CALCULO_FUNDO = Null recebem FORA_DA_ANALISE, e não INCOMPATIVEL.
+    """
+    calculo = calcular_fundo_pensionista(dt_nasc_instituidor, corte_nasc)
+    compatibilidade = ((codigos(fundo_informado) == FUNPREV) & (calculo == FUNPREV)).astype(np.int8)
+    compatibilidade[calculo == FUNDO_INDEFINIDO] = FORA_DA_ANALISE
+    cenario = np.zeros(len(calculo), dtype=np.int8)
+    return Classificacao(calculo, compatibilidade, cenario)
@@ -0,0 +1,449 @@
+import argparse
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rpps_fundos.benchmark import ESCALAS_PADRAO, comparar, executar_benchmark, relatorio, salvar_medidas
+from rpps_fundos.cubo import DIMENSOES, MEDIDAS, carregar_cubo, comparar_meses, consultar, normalizar_mes
+from rpps_fundos.escrita import FORMATOS
+from rpps_fundos.exploratoria import TAMANHO_BLOCO, analisar, arquivo_relatorio, escrever_relatorio
+from rpps_fundos.historico import (
+    AGRUPAVEIS, caminho_historico, historico_cpf, historico_matricula, historico_orgao, incompativeis,
+    meses_carregados,
+)
+from rpps_fundos.incremental import processar_incremental
+from rpps_fundos.monitor import ESPERA, INTERVALO, Monitor
+from rpps_fundos.indice_cpf import cruzar_bases, extrair_chaves
+from rpps_fundos.pipeline import PASTA_DADOS, PASTA_RESULTADOS, POPULACOES, carregar, imprimir_resultado, processar
+from rpps_fundos.projecao import BASES, FIM_HORIZONTE, POPULACOES_PROJECAO, base_da_populacao, projetar_bases
+from rpps_fundos.sintetico import gerar_bases
+from rpps_fundos.validacao import LIMITES, definir_limites
+
+
+# === ARGUMENTOS ===
+def _arquivos_explicitos(valores):
+    # --arquivo servidor=dados/servidor_2025_10.xlsx
+    arquivos = {}
+    for valor in valores or []:
+        populacao, separador, caminho = valor.partition("=")
+        if not separador or populacao not in POPULACOES:
+            raise SystemExit(f"--arquivo inválido: {valor!r}. Use <populacao>=<caminho>, com populacao em {list(POPULACOES)}.")
+        arquivos[populacao] = os.path.abspath(caminho)
+    return arquivos
+
+
+def _filtros(valores):
+    # --filtro COMPATIBILIDADE_FUNDO=incompativel --filtro NO_ORGAO=A --filtro NO_ORGAO=B
+    filtros = {}
+    for valor in valores or []:
+        dimensao, separador, conteudo = valor.partition("=")
+        if not separador or dimensao not in DIMENSOES:
+            raise SystemExit(f"--filtro inválido: {valor!r}. Use <dimensao>=<valor>, com dimensao em {DIMENSOES}.")
+        filtros.setdefault(dimensao, []).append(conteudo)
+    return filtros
+
+
+def _percentual(texto):
+    # "5%", "5,5%" ou "0.055"
+    texto = texto.strip().replace(",", ".")
+    return float(texto[:-1]) / 100 if texto.endswith("%") else float(texto)
+
+
+def _degraus(valores, opcao):
+    # --aliquota 2025_11=5% --aliquota 2027_01=8%: {mes_inicial: valor}
+    degraus = {}
+    for valor in valores or []:
+        mes, _, percentual = valor.partition("=")
+        try:
+            degraus[normalizar_mes(mes)] = _percentual(percentual)
+        except ValueError:
+            raise SystemExit(f"{opcao} inválido: {valor!r}. Use AAAA_MM=PERCENTUAL (ex.: 2025_11=5%).") from None
+    return degraus
+
+
+def _opcoes_limites(parser):
+    # Limites das regras de qualidade, atualizados todo ano (padrões em validacao.LIMITES)
+    parser.add_argument("--salario-minimo", type=float, default=None, metavar="VALOR",
+                        help=f"Salário mínimo vigente (padrão: {LIMITES['SALARIO_MINIMO']})")
+    parser.add_argument("--teto", type=float, default=None, metavar="VALOR",
+                        help=f"Teto remuneratório vigente (padrão: {LIMITES['TETO_REMUNERATORIO']})")
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m rpps_fundos", description="Análise de fundos previdenciários (RPPS)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    run = sub.add_parser("run", help="Classifica e gera os resultados de uma ou mais populações")
+    run.add_argument("populacoes", nargs="*", metavar="POPULACAO",
+                     help=f"Populações a processar: {', '.join(POPULACOES)}")
+    run.add_argument("--all", action="store_true", help="Processa as três populações")
+    run.add_argument("--mes", help="Mês do extrato no nome do arquivo (ex.: 2025_10); padrão: o mais recente")
+    run.add_argument("--arquivo", action="append", metavar="POPULACAO=CAMINHO",
+                     help="Arquivo de entrada explícito (pode repetir)")
+    run.add_argument("--dados", default=PASTA_DADOS, help="Pasta dos extratos (padrão: dados/)")
+    run.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta de saída (padrão: resultados/)")
+    run.add_argument("--processos", type=int, default=None,
+                     help="Processos em paralelo (padrão: um por população, limitado aos núcleos)")
+    run.add_argument("--formato", nargs="+", choices=FORMATOS, default=["xlsx"], metavar="FORMATO",
+                     help=f"Formatos da saída: {', '.join(FORMATOS)} (padrão: xlsx)")
+    run.add_argument("--apenas-incompativeis", action="store_true",
+                     help="Grava só os registros incompatíveis (POPULACAO_incompativeis.*)")
+    run.add_argument("--memoria", action="store_true", help="Mostra a memória por coluna antes e depois da compactação")
+    run.add_argument("--tempos", action="store_true", help="Mostra o tempo de cada etapa (também gravado em POPULACAO_execucao.json)")
+    run.add_argument("--rastrear-alocacoes", action="store_true",
+                     help="Mede o pico de alocações de cada etapa com o tracemalloc (execução mais lenta)")
+    run.add_argument("--perfil", action="store_true", help="Grava o cProfile da execução em POPULACAO_execucao.prof")
+    run.add_argument("--incremental", action="store_true",
+                     help="Reclassifica só as matrículas novas ou alteradas desde o último mês e gera o relatório de variações")
+    run.add_argument("--sem-cruzamento", action="store_true",
+                     help="Não cruza os CPFs entre as bases ao processar as três populações")
+    _opcoes_limites(run)
+
+    cpf = sub.add_parser("cpf", help="Cruza os CPFs das três bases do mês (sem gerar os resultados por população)")
+    cpf.add_argument("--mes", help="Mês do extrato no nome do arquivo (ex.: 2025_10); padrão: o mais recente")
+    cpf.add_argument("--arquivo", action="append", metavar="POPULACAO=CAMINHO",
+                     help="Arquivo de entrada explícito (pode repetir)")
+    cpf.add_argument("--dados", default=PASTA_DADOS, help="Pasta dos extratos (padrão: dados/)")
+    cpf.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta de saída (padrão: resultados/)")
+
+    exploratoria = sub.add_parser("exploratoria", help="Análise exploratória em uma passada, lendo a base em blocos")
+    exploratoria.add_argument("populacoes", nargs="*", metavar="POPULACAO",
+                              help=f"Populações a analisar (padrão: todas): {', '.join(POPULACOES)}")
+    exploratoria.add_argument("--mes", help="Mês do extrato no nome do arquivo (ex.: 2025_10); padrão: o mais recente")
+    exploratoria.add_argument("--arquivo", action="append", metavar="POPULACAO=CAMINHO",
+                              help="Arquivo de entrada explícito, .xlsx ou .parquet (pode repetir)")
+    exploratoria.add_argument("--dados", default=PASTA_DADOS, help="Pasta dos extratos (padrão: dados/)")
+    exploratoria.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta de saída (padrão: resultados/)")
+    exploratoria.add_argument("--bloco", type=int, default=TAMANHO_BLOCO,
+                              help=f"Linhas por bloco de leitura (padrão: {TAMANHO_BLOCO})")
+    _opcoes_limites(exploratoria)
+
+    projecao = sub.add_parser("projecao", help="Projeta as contribuições extraordinárias ao FUNFIN mês a mês até o fim do horizonte")
+    projecao.add_argument("--aliquota", action="append", required=True, metavar="AAAA_MM=PERCENTUAL",
+                          help="Degrau do cronograma: alíquota a partir do mês (pode repetir; ex.: 2025_11=5%%)")
+    projecao.add_argument("--aliquota-aposentado", action="append", metavar="AAAA_MM=PERCENTUAL",
+                          help="Cronograma próprio dos aposentados (padrão: o de --aliquota)")
+    projecao.add_argument("--populacao", nargs="+", choices=list(POPULACOES_PROJECAO), default=list(POPULACOES_PROJECAO),
+                          help="Populações projetadas (padrão: servidor e aposentado)")
+    projecao.add_argument("--inicio", help="Primeiro mês projetado, AAAA_MM (padrão: o seguinte ao do extrato)")
+    projecao.add_argument("--fim", default=FIM_HORIZONTE, help=f"Último mês projetado (padrão: {FIM_HORIZONTE})")
+    projecao.add_argument("--base", choices=list(BASES),
+                          help="Base da alíquota: remuneracao (VL_CONTRIBUICAO / 14%%, só servidores) ou contribuicao "
+                               "(padrão: remuneracao para servidores, contribuicao para aposentados)")
+    projecao.add_argument("--reajuste", action="append", metavar="AAAA_MM=PERCENTUAL",
+                          help="Reajuste da base a partir do mês, acumulado (pode repetir; ex.: 2026_05=4%%)")
+    projecao.add_argument("--mes", help="Mês do extrato no nome do arquivo (ex.: 2025_10); padrão: o mais recente")
+    projecao.add_argument("--arquivo", action="append", metavar="POPULACAO=CAMINHO",
+                          help="Arquivo de entrada explícito (pode repetir)")
+    projecao.add_argument("--dados", default=PASTA_DADOS, help="Pasta dos extratos (padrão: dados/)")
+    projecao.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta de saída (padrão: resultados/)")
+
+    monitor = sub.add_parser("monitor", help="Vigia dados/ e processa cada extrato novo ou alterado, sem reiniciar")
+    monitor.add_argument("--dados", default=PASTA_DADOS, help="Pasta vigiada (padrão: dados/)")
+    monitor.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta de saída (padrão: resultados/)")
+    monitor.add_argument("--intervalo", type=float, default=INTERVALO,
+                         help=f"Segundos entre varreduras (padrão: {INTERVALO:g})")
+    monitor.add_argument("--espera", type=float, default=ESPERA,
+                         help=f"Segundos com o arquivo inalterado antes de processar (padrão: {ESPERA:g})")
+    monitor.add_argument("--formato", nargs="+", choices=FORMATOS, default=["xlsx"], metavar="FORMATO",
+                         help=f"Formatos da saída: {', '.join(FORMATOS)} (padrão: xlsx)")
+    monitor.add_argument("--apenas-incompativeis", action="store_true",
+                         help="Grava só os registros incompatíveis (POPULACAO_incompativeis.*)")
+    monitor.add_argument("--incremental", action="store_true", help="Processa no modo incremental")
+    monitor.add_argument("--sem-cruzamento", action="store_true", help="Não refaz o cruzamento de CPF entre as bases")
+    monitor.add_argument("--uma-vez", action="store_true",
+                         help="Processa o que estiver pendente e sai (em vez de vigiar continuamente)")
+    _opcoes_limites(monitor)
+
+    cubo = sub.add_parser("cubo", help="Consulta o cubo de agregados gravado pelo run (sem ler os extratos)")
+    cubo.add_argument("--populacao", nargs="+", choices=list(POPULACOES), default=None,
+                      help="Populações consultadas (padrão: todas)")
+    cubo.add_argument("--mes", nargs="+", default=None, help="Meses consultados, AAAA_MM (padrão: todos)")
+    cubo.add_argument("--filtro", action="append", metavar="DIMENSAO=VALOR",
+                      help="Filtro por código ou rótulo (pode repetir; a mesma dimensão repetida soma os valores)")
+    cubo.add_argument("--por", nargs="+", choices=DIMENSOES, default=[], metavar="DIMENSAO",
+                      help=f"Dimensões do agrupamento: {', '.join(DIMENSOES)}")
+    cubo.add_argument("--top", type=int, default=None, help="Mostra só as N primeiras linhas")
+    cubo.add_argument("--ordenar", choices=MEDIDAS, default="REGISTROS", help="Medida da ordenação (padrão: REGISTROS)")
+    cubo.add_argument("--comparar", nargs=2, metavar=("MES_ANTERIOR", "MES_ATUAL"),
+                      help="Compara dois meses lado a lado (ordenado pela maior variação de registros)")
+    cubo.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta dos resultados (padrão: resultados/)")
+
+    historico = sub.add_parser("historico", help="Consulta o histórico SQLite dos registros classificados (todos os meses)")
+    consulta = historico.add_mutually_exclusive_group()
+    consulta.add_argument("--cpf", help="Registros do CPF mês a mês (com ou sem pontuação)")
+    consulta.add_argument("--matricula", help="Registros da matrícula mês a mês")
+    consulta.add_argument("--orgao", help="Totais do órgão (NO_ORGAO) por mês")
+    consulta.add_argument("--incompativeis", nargs="?", const="", metavar="MES",
+                          help="Registros incompatíveis do mês AAAA_MM (padrão: o mais recente)")
+    historico.add_argument("--populacao", choices=list(POPULACOES), default=None,
+                           help="Restringe a consulta por matrícula, órgão ou incompatíveis a uma população")
+    historico.add_argument("--por", nargs="+", choices=AGRUPAVEIS, default=["COMPATIBILIDADE_FUNDO"], metavar="COLUNA",
+                           help="Colunas do agrupamento por órgão (padrão: COMPATIBILIDADE_FUNDO)")
+    historico.add_argument("--ultimos", type=int, default=None, help="Só os N meses mais recentes carregados")
+    historico.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta dos resultados (padrão: resultados/)")
+
+    sintetico = sub.add_parser("sintetico", help="Gera extratos sintéticos das três populações (layout do dicionário de dados)")
+    sintetico.add_argument("pasta", help="Pasta de destino dos arquivos")
+    sintetico.add_argument("--linhas", type=int, default=100_000, help="Linhas por população (padrão: 100000)")
+    sintetico.add_argument("--mes", default="2025_10", help="Mês no nome dos arquivos (padrão: 2025_10)")
+    sintetico.add_argument("--formato", nargs="+", choices=FORMATOS, default=["xlsx"], metavar="FORMATO",
+                           help=f"Formatos: {', '.join(FORMATOS)} (padrão: xlsx)")
+    sintetico.add_argument("--semente", type=int, default=0, help="Semente do gerador aleatório")
+    sintetico.add_argument("--taxa-cpf-duplicado", type=float, default=0.13, help="Fração de linhas com CPF repetido")
+    sintetico.add_argument("--taxa-data-invalida", type=float, default=0.001, help="Fração de datas inválidas")
+    sintetico.add_argument("--taxa-incompativel", type=float, default=0.03,
+                           help="Fração de linhas com CO_TIPO_FUNDO diferente do fundo calculado")
+
+    benchmark = sub.add_parser("benchmark", help="Mede tempo e memória de cada etapa em bases sintéticas")
+    benchmark.add_argument("--escalas", nargs="+", type=int, default=list(ESCALAS_PADRAO), metavar="LINHAS",
+                           help="Linhas por população em cada rodada (padrão: 100000 1000000)")
+    benchmark.add_argument("--populacao", nargs="+", choices=list(POPULACOES), default=None,
+                           help="Populações medidas (padrão: as três)")
+    benchmark.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória (tracemalloc)")
+    benchmark.add_argument("--pasta", default=None, help="Pasta temporária das bases geradas (padrão: a do sistema)")
+    benchmark.add_argument("--resultados", default=PASTA_RESULTADOS, help="Pasta do histórico (padrão: resultados/)")
+    return parser
+
+
+# === EXECUÇÃO ===
+def executar(args):
+    arquivos = _arquivos_explicitos(args.arquivo)
+    populacoes = list(POPULACOES) if args.all else list(dict.fromkeys(args.populacoes or arquivos))
+    if not populacoes:
+        raise SystemExit("Informe as populações (servidor, aposentado, pensionista) ou use --all.")
+    invalidas = [p for p in populacoes if p not in POPULACOES]
+    if invalidas:
+        raise SystemExit(f"Populações inválidas: {invalidas}. Use {list(POPULACOES)}.")
+
+    processos = args.processos or min(len(populacoes), os.cpu_count() or 1)
+    tarefas = {
+        p: dict(populacao=p, arquivo=arquivos.get(p), pasta_dados=args.dados,
+                pasta_resultados=args.resultados, mes=args.mes,
+                formatos=tuple(dict.fromkeys(args.formato)), apenas_incompativeis=args.apenas_incompativeis,
+                rastrear_alocacoes=args.rastrear_alocacoes, perfil=args.perfil)
+        for p in populacoes
+    }
+
+    executar_populacao = processar_incremental if args.incremental else processar
+
+    inicio = time.perf_counter()
+    falhas = {}
+    chaves = {}
+    if processos <= 1 or len(tarefas) == 1:
+        for populacao, kwargs in tarefas.items():
+            try:
+                resultado = executar_populacao(**kwargs)
+            except Exception as erro:  # noqa: BLE001 - segue com as demais populações
+                falhas[populacao] = erro
+                continue
+            chaves[populacao] = resultado["chaves"]
+            imprimir_resultado(resultado, args.memoria, args.tempos)
+    else:
+        # Cada população é lida, classificada e gravada em um processo próprio
+        with ProcessPoolExecutor(max_workers=processos, initializer=definir_limites,
+                                 initargs=(args.salario_minimo, args.teto)) as pool:
+            futuros = {pool.submit(executar_populacao, **kwargs): populacao for populacao, kwargs in tarefas.items()}
+            for futuro in as_completed(futuros):
+                populacao = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as erro:  # noqa: BLE001 - segue com as demais populações
+                    falhas[populacao] = erro
+                    continue
+                chaves[populacao] = resultado["chaves"]
+                print(f"\n=== {populacao.upper()} ===")
+                imprimir_resultado(resultado, args.memoria, args.tempos)
+
+    # === CRUZAMENTO DE CPF ENTRE AS BASES (APENAS COM AS TRÊS POPULAÇÕES) ===
+    if len(chaves) == len(POPULACOES) and not args.sem_cruzamento:
+        imprimir_cruzamento(cruzar_bases(chaves, args.resultados))
+
+    for populacao, erro in falhas.items():
+        print(f"\nFalha ao processar {populacao}: {erro}", file=sys.stderr)
+    print(f"\nTempo total: {time.perf_counter() - inicio:.1f}s ({len(tarefas) - len(falhas)}/{len(tarefas)} populações)")
+    return 1 if falhas else 0
+
+
+def imprimir_cruzamento(cruzamento):
+    print("\n=== CRUZAMENTO DE CPF ENTRE BASES ===")
+    print("\n".join(cruzamento["resumo"]))
+    saidas = "\n".join(f"- {caminho}" for caminho in cruzamento["saidas"])
+    print(f"\nCruzamento concluído. Arquivos salvos em:\n{saidas}")
+
+
+def executar_cpf(args):
+    arquivos = _arquivos_explicitos(args.arquivo)
+    inicio = time.perf_counter()
+    chaves = {}
+    for populacao in POPULACOES:
+        df, arquivo, _ = carregar(populacao, arquivos.get(populacao), args.dados, args.mes)
+        print(f"Arquivo selecionado ({populacao}): {arquivo}")
+        chaves[populacao] = extrair_chaves(populacao, df)
+    imprimir_cruzamento(cruzar_bases(chaves, args.resultados))
+    print(f"\nTempo total: {time.perf_counter() - inicio:.1f}s")
+    return 0
+
+
+def executar_exploratoria(args):
+    arquivos = _arquivos_explicitos(args.arquivo)
+    populacoes = list(dict.fromkeys(args.populacoes or arquivos or POPULACOES))
+    invalidas = [p for p in populacoes if p not in POPULACOES]
+    if invalidas:
+        raise SystemExit(f"Populações inválidas: {invalidas}. Use {list(POPULACOES)}.")
+
+    os.makedirs(args.resultados, exist_ok=True)
+    for populacao in populacoes:
+        resultado, arquivo, ausentes = analisar(populacao, arquivos.get(populacao), args.dados, args.mes, args.bloco)
+        caminho = arquivo_relatorio(populacao, args.resultados)
+        escrever_relatorio(resultado, caminho)
+        print(f"Arquivo selecionado ({populacao}): {arquivo}")
+        if ausentes:
+            print(f"- itens sem as colunas necessárias na base: {', '.join(ausentes)}")
+        print(f"- análise salva em: {caminho}")
+    return 0
+
+
+def executar_projecao(args):
+    aliquotas = _degraus(args.aliquota, "--aliquota")
+    aposentados = _degraus(args.aliquota_aposentado, "--aliquota-aposentado") or aliquotas
+    cronogramas = {populacao: aposentados if populacao == "aposentado" else aliquotas
+                   for populacao in dict.fromkeys(args.populacao)}
+    try:
+        for populacao in cronogramas:
+            base_da_populacao(populacao, args.base)
+    except ValueError as erro:
+        raise SystemExit(f"--base inválida: {erro}") from None
+    inicio = time.perf_counter()
+    resumo, saidas, tempos = projetar_bases(
+        cronogramas, args.inicio, args.fim, args.base, _degraus(args.reajuste, "--reajuste"),
+        _arquivos_explicitos(args.arquivo), args.dados, args.resultados, args.mes,
+    )
+    print("\n".join(resumo))
+    for populacao, (segundos, (registros, meses)) in tempos.items():
+        print(f"- projeção {populacao}: {registros} registros × {meses} meses em {segundos * 1000:.0f} ms")
+    arquivos = "\n".join(f"- {caminho}" for caminho in saidas)
+    print(f"\nProjeção concluída. Arquivos salvos em:\n{arquivos}")
+    print(f"\nTempo total: {time.perf_counter() - inicio:.1f}s")
+    return 0
+
+
+def executar_monitor(args):
+    monitor = Monitor(args.dados, args.resultados, args.intervalo, args.espera, tuple(dict.fromkeys(args.formato)),
+                      args.apenas_incompativeis, args.incremental, cruzamento=not args.sem_cruzamento)
+    vigia = threading.Thread(target=monitor.executar, kwargs={"ate_vazio": args.uma_vez}, daemon=True)
+    vigia.start()
+    # Como serviço (systemd, nohup...), SIGTERM encerra depois da execução em andamento
+    signal.signal(signal.SIGTERM, lambda *_: monitor.parar())
+    print(f"Vigiando {os.path.abspath(args.dados)} (Ctrl+C para sair). Execuções registradas em {monitor.historico}")
+    falhas = 0
+    try:
+        while vigia.is_alive() or not monitor.concluidas.empty():
+            try:
+                registro = monitor.concluidas.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            momento = registro["data"][11:]
+            if registro["erro"]:
+                falhas += 1
+                print(f"[{momento}] Falha ao processar {registro['populacao']} ({registro['arquivo']}): {registro['erro']}",
+                      file=sys.stderr)
+                continue
+            saidas = "\n".join(f"  - {caminho}" for caminho in registro["saidas"])
+            print(f"[{momento}] {registro['populacao']}: {os.path.basename(registro['arquivo'])} "
+                  f"processado em {registro['segundos']:.1f}s\n{saidas}")
+    except KeyboardInterrupt:
+        print("\nEncerrando o monitor (aguardando a execução em andamento)...")
+        monitor.parar()
+        vigia.join()
+    return 1 if falhas and args.uma_vez else 0
+
+
+def executar_cubo(args):
+    inicio = time.perf_counter()
+    meses = args.comparar if args.comparar else args.mes
+    cubo = carregar_cubo(args.resultados, args.populacao, meses)
+    if cubo.empty:
+        print(f"Nenhum cubo encontrado em {os.path.join(args.resultados, 'cubo')}. Rode o comando run antes.",
+              file=sys.stderr)
+        return 1
+    filtros = _filtros(args.filtro)
+    if args.comparar:
+        tabela = comparar_meses(cubo, *args.comparar, por=args.por, top=args.top, **filtros)
+    else:
+        tabela = consultar(cubo, por=args.por, top=args.top, ordenar=args.ordenar, **filtros)
+    print(tabela.to_string(index=False))
+    print(f"\n{len(tabela)} linhas em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    return 0
+
+
+def executar_historico(args):
+    if not os.path.exists(caminho_historico(args.resultados)):
+        print(f"Nenhum histórico encontrado em {caminho_historico(args.resultados)}. Rode o comando run antes.",
+              file=sys.stderr)
+        return 1
+    inicio = time.perf_counter()
+    if args.cpf:
+        tabela = historico_cpf(args.resultados, args.cpf, args.ultimos)
+    elif args.matricula:
+        tabela = historico_matricula(args.resultados, args.matricula, args.populacao, args.ultimos)
+    elif args.orgao:
+        tabela = historico_orgao(args.resultados, args.orgao, args.por, args.populacao, args.ultimos)
+    elif args.incompativeis is not None:
+        tabela = incompativeis(args.resultados, args.incompativeis, args.populacao)
+    else:
+        tabela = meses_carregados(args.resultados)
+    print(tabela.to_string(index=False) if len(tabela) else "Nenhum registro encontrado.")
+    print(f"\n{len(tabela)} linhas em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    return 0
+
+
+def executar_sintetico(args):
+    arquivos = gerar_bases(
+        args.pasta, args.linhas, mes=args.mes, formatos=tuple(dict.fromkeys(args.formato)), semente=args.semente,
+        taxa_cpf_duplicado=args.taxa_cpf_duplicado, taxa_data_invalida=args.taxa_data_invalida,
+        taxa_incompativel=args.taxa_incompativel,
+    )
+    saidas = "\n".join(f"- {caminho}" for caminhos in arquivos.values() for caminho in caminhos)
+    print(f"Bases sintéticas geradas:\n{saidas}")
+    return 0
+
+
+def executar_benchmark_cli(args):
+    medidas = executar_benchmark(args.escalas, args.populacao, memoria=not args.sem_memoria, pasta=args.pasta)
+    anterior, caminho = salvar_medidas(medidas, args.resultados)
+    comparacao = comparar(medidas, anterior)
+    print("\n".join(relatorio(comparacao)))
+    print(f"\nMedidas acrescentadas a:\n- {caminho}")
+    return 1 if comparacao["regressao"].any() else 0
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    try:
+        definir_limites(getattr(args, "salario_minimo", None), getattr(args, "teto", None))
+    except ValueError as erro:
+        raise SystemExit(f"Limite inválido: {erro}") from None
+    if args.comando == "run":
+        return executar(args)
+    if args.comando == "cpf":
+        return executar_cpf(args)
+    if args.comando == "exploratoria":
+        return executar_exploratoria(args)
+    if args.comando == "projecao":
+        return executar_projecao(args)
+    if args.comando == "monitor":
+        return executar_monitor(args)
+    if args.comando == "cubo":
+        return executar_cubo(args)
+    if args.comando == "historico":
+        return executar_historico(args)
+    if args.comando == "sintetico":
+        return executar_sintetico(args)
+    if args.comando == "benchmark":
+        return executar_benchmark_cli(args)
+    return 0
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# === CONFIGURAÇÕES ===
+CPF_AUSENTE = -1
+MAIOR_CPF = 99_999_999_999  # 11 dígitos
+REPETIDOS = 11_111_111_111  # 000.000.000-00, 111.111.111-11...: dígitos verificadores corretos, CPF inválido
+RE_PONTUACAO = r"[.\-/\s]"
+RE_FORMATADO = r"^\d{1,11}$"  # após remover pontos, traços, barras e espaços
+
+
+# === NORMALIZAÇÃO ===
+def _de_textos(textos):
+    # Textos (None/NaN = vazio) -> int64, no Arrow: remove a pontuação e exige só dígitos
+    limpos = pc.replace_substring_regex(pa.array(textos, type=pa.string(), from_pandas=True), RE_PONTUACAO, "")
+    numeros = pc.cast(pc.if_else(pc.match_substring_regex(limpos, RE_FORMATADO), limpos, None), pa.int64())
+    return pc.fill_null(numeros, CPF_AUSENTE).to_numpy()
+
+
+def normalizar(valores):
+    """CPF como int64: inteiros, floats inteiros e textos com ou sem pontuação (zeros à esquerda
+    perdidos ou não). Vazio, zero, negativo, mais de 11 dígitos ou texto com outros caracteres
+    vira CPF_AUSENTE.
+    """
+    valores = np.asarray(valores)
+    if np.issubdtype(valores.dtype, np.integer):
+        cpfs = valores.astype(np.int64)
+    elif np.issubdtype(valores.dtype, np.floating):
+        inteiros = np.isfinite(valores) & (np.abs(valores) <= MAIOR_CPF)
+        inteiros[inteiros] = valores[inteiros] == np.floor(valores[inteiros])
+        cpfs = np.where(inteiros, valores, CPF_AUSENTE).astype(np.int64)
+    elif pd.api.types.infer_dtype(valores, skipna=True) in ("string", "empty"):
+        cpfs = _de_textos(valores)
+    else:
+        # Base mista (ex.: números e textos formatados na mesma coluna): cada parte pelo seu caminho
+        textos = np.frompyfunc(lambda valor: isinstance(valor, str), 1, 1)(valores).astype(bool)
+        cpfs = np.full(len(valores), CPF_AUSENTE, dtype=np.int64)
+        cpfs[textos] = _de_textos(valores[textos])
+        cpfs[~textos] = normalizar(pd.to_numeric(pd.Series(valores[~textos]), errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan))
+    return np.where((cpfs > 0) & (cpfs <= MAIOR_CPF), cpfs, CPF_AUSENTE)
+
+
+# === DÍGITOS VERIFICADORES ===
+def digitos_verificadores(bases):
+    """Os dois dígitos verificadores (dv1, dv2) das bases de 9 dígitos (int64), sem laço por linha."""
+    # As bases têm até 9 dígitos: int32 basta e as divisões ficam mais rápidas
+    resto = np.asarray(bases).astype(np.int32)
+    soma1 = np.zeros(len(resto), dtype=np.int32)
+    soma2 = np.zeros(len(resto), dtype=np.int32)
+    # Do último para o primeiro dígito da base: pesos 2..10 no dv1 e 3..11 no dv2
+    for peso in range(2, 11):
+        resto, digito = np.divmod(resto, 10)
+        soma1 += digito * peso
+        soma2 += digito * (peso + 1)
+    dv1 = 11 - soma1 % 11
+    dv1[dv1 >= 10] = 0
+    dv2 = 11 - (soma2 + dv1 * 2) % 11
+    dv2[dv2 >= 10] = 0
+    return dv1.astype(np.int64), dv2.astype(np.int64)
+
+
+def validar(cpfs):
+    """True para CPFs (já normalizados) presentes, com os dois dígitos verificadores corretos e
+    que não sejam um único dígito repetido."""
+    cpfs = np.asarray(cpfs, dtype=np.int64)
+    presentes = cpfs != CPF_AUSENTE
+    bases, verificadores = np.divmod(np.where(presentes, cpfs, 0), 100)
+    dv1, dv2 = digitos_verificadores(bases)
+    return presentes & (cpfs % REPETIDOS != 0) & (dv1 * 10 + dv2 == verificadores)
+
+
+def duplicados(cpfs):
+    """True para as chaves que aparecem mais de uma vez (como duplicated(keep=False), sobre int64)."""
+    return pd.Series(np.asarray(cpfs, dtype=np.int64)).duplicated(keep=False).to_numpy()
@@ -0,0 +1,164 @@
+import glob
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.classificacao import (
+    CODIGO_AUSENTE, FUNDO_INDEFINIDO, ROTULOS_CENARIO, ROTULOS_COMPATIBILIDADE, SEM_CENARIO,
+)
+from rpps_fundos.esquema import decodificar
+from rpps_fundos.vocabularios import vocab_fundo
+
+# === CONFIGURAÇÕES ===
+NOME_PASTA_CUBO = "cubo"  # resultados/cubo/{populacao}_{mes}.arrow: um arquivo por população e mês
+RE_MES = re.compile(r"(\d{4})[_-](\d{1,2})(?!\d)")
+
+# Dimensões do cubo (códigos int8, exceto NO_ORGAO e CPF_DUPLICADO) e medidas somadas
+DIMENSOES = ['POPULACAO', 'MES', 'NO_ORGAO', 'CO_TIPO_FUNDO', 'CALCULO_FUNDO', 'COMPATIBILIDADE_FUNDO',
+             'CENARIO_FUNDO', 'CPF_DUPLICADO']
+MEDIDAS = ['REGISTROS', 'VL_CONTRIBUICAO']
+
+# Rótulos aplicados só na consulta (pensionistas sem CENARIO_FUNDO ficam "Sem cenario")
+ROTULOS = {
+    'CO_TIPO_FUNDO': {**vocab_fundo, CODIGO_AUSENTE: "Não informado"},
+    'CALCULO_FUNDO': {**vocab_fundo, FUNDO_INDEFINIDO: "Indefinido"},
+    'COMPATIBILIDADE_FUNDO': ROTULOS_COMPATIBILIDADE,
+    'CENARIO_FUNDO': {**ROTULOS_CENARIO, SEM_CENARIO: "Sem cenario"},
+}
+
+
+def normalizar_mes(mes):
+    """'2025-10', '2025_10' ou '2025_1' -> '2025_10' / '2025_01'."""
+    encontrado = RE_MES.search(str(mes))
+    if not encontrado:
+        raise ValueError(f"Mês inválido: {mes}. Use AAAA_MM (ex.: 2025_10).")
+    return f"{encontrado.group(1)}_{int(encontrado.group(2)):02d}"
+
+
+def mes_do_arquivo(arquivo, mes=None):
+    """Mês AAAA_MM: o informado, o do nome do arquivo (ex.: servidor_2025_10.xlsx) ou o da modificação."""
+    if mes:
+        return normalizar_mes(mes)
+    if RE_MES.search(os.path.basename(arquivo)):
+        return normalizar_mes(os.path.basename(arquivo))
+    return datetime.fromtimestamp(os.path.getmtime(arquivo)).strftime("%Y_%m")
+
+
+# === CONSTRUÇÃO ===
+def construir_cubo(populacao, df, mes):
+    """Contagem de registros e soma de VL_CONTRIBUICAO por combinação das dimensões."""
+    n = len(df)
+    cenario = df['CENARIO_FUNDO'] if 'CENARIO_FUNDO' in df else np.full(n, SEM_CENARIO, dtype=np.int8)
+    base = pd.DataFrame({
+        'NO_ORGAO': df['NO_ORGAO'].astype(object).to_numpy(),
+        'CO_TIPO_FUNDO': np.asarray(df['CO_TIPO_FUNDO'], dtype=np.int8),
+        'CALCULO_FUNDO': np.asarray(df['CALCULO_FUNDO'], dtype=np.int8),
+        'COMPATIBILIDADE_FUNDO': np.asarray(df['COMPATIBILIDADE_FUNDO'], dtype=np.int8),
+        'CENARIO_FUNDO': np.asarray(cenario, dtype=np.int8),
+        'CPF_DUPLICADO': np.asarray(df['CPF_DUPLICADO'], dtype=bool),
+        'VL_CONTRIBUICAO': df['VL_CONTRIBUICAO'].to_numpy(dtype=np.float64),
+    })
+    grupos = base.groupby(DIMENSOES[2:], sort=False, dropna=False)
+    cubo = grupos['VL_CONTRIBUICAO'].agg(REGISTROS='size', VL_CONTRIBUICAO='sum').reset_index()
+    cubo.insert(0, 'MES', mes)
+    cubo.insert(0, 'POPULACAO', populacao)
+    return cubo[DIMENSOES + MEDIDAS]
+
+
+def caminho_cubo(populacao, mes, pasta_resultados):
+    return os.path.join(pasta_resultados, NOME_PASTA_CUBO, f"{populacao}_{mes}.arrow")
+
+
+def gravar_cubo(populacao, df, mes, pasta_resultados):
+    """Grava o cubo da população no mês (substitui o anterior do mesmo mês); retorna o caminho."""
+    caminho = caminho_cubo(populacao, mes, pasta_resultados)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + ".tmp"
+    construir_cubo(populacao, df, mes).to_feather(temporario)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+# === CONSULTA ===
+def carregar_cubo(pasta_resultados, populacoes=None, meses=None):
+    """Cubos gravados, concatenados; opcionalmente só das populações e meses informados."""
+    meses = None if meses is None else {normalizar_mes(mes) for mes in meses}
+    partes = []
+    for caminho in sorted(glob.glob(os.path.join(pasta_resultados, NOME_PASTA_CUBO, "*.arrow"))):
+        populacao, _, mes = os.path.basename(caminho)[:-len(".arrow")].partition("_")
+        if (populacoes is None or populacao in populacoes) and (meses is None or mes in meses):
+            partes.append(pd.read_feather(caminho))
+    if not partes:
+        return pd.DataFrame({coluna: pd.Series(dtype=object) for coluna in DIMENSOES + MEDIDAS})
+    return pd.concat(partes, ignore_index=True)
+
+
+def _codigos_do_filtro(dimensao, valores):
+    # Aceita o código ou o rótulo (sem diferenciar maiúsculas): compativel, FUNFIN, Cenario 1...
+    if dimensao == 'CPF_DUPLICADO':
+        return [str(v).lower() in ("1", "true", "sim", "verdadeiro") if not isinstance(v, bool) else v for v in valores]
+    rotulos = ROTULOS.get(dimensao)
+    if rotulos is None:
+        return list(valores)
+    por_rotulo = {str(rotulo).lower(): codigo for codigo, rotulo in rotulos.items()}
+    codigos = []
+    for valor in valores:
+        texto = str(valor).lower()
+        codigos.append(por_rotulo[texto] if texto in por_rotulo else int(valor))
+    return codigos
+
+
+def fatiar(cubo, **filtros):
+    """Linhas do cubo que atendem os filtros (dimensão=valor ou lista de valores, código ou rótulo)."""
+    mascara = np.ones(len(cubo), dtype=bool)
+    for dimensao, valores in filtros.items():
+        if dimensao not in DIMENSOES:
+            raise ValueError(f"Dimensão inválida: {dimensao}. Use {DIMENSOES}.")
+        valores = valores if isinstance(valores, (list, tuple, set)) else [valores]
+        mascara &= cubo[dimensao].isin(_codigos_do_filtro(dimensao, valores)).to_numpy()
+    return cubo[mascara]
+
+
+def rotular(tabela):
+    """Troca os códigos das dimensões pelos rótulos (para exibição)."""
+    tabela = tabela.copy()
+    for dimensao, rotulos in ROTULOS.items():
+        if dimensao in tabela:
+            tabela[dimensao] = decodificar(tabela[dimensao].to_numpy(dtype=np.int64), rotulos)
+    return tabela
+
+
+def consultar(cubo, por=(), top=None, ordenar='REGISTROS', **filtros):
+    """Fatia o cubo e soma as medidas por `por` (em ordem decrescente de `ordenar`); top limita as linhas.
+
+        consultar(cubo, por=['NO_ORGAO'], top=5, POPULACAO='servidor', COMPATIBILIDADE_FUNDO='incompativel')
+    """
+    fatia = fatiar(cubo, **filtros)
+    por = list(por)
+    if por:
+        resultado = fatia.groupby(por, sort=False, observed=True)[MEDIDAS].sum().reset_index()
+    else:
+        resultado = pd.DataFrame({medida: [fatia[medida].sum()] for medida in MEDIDAS})
+    resultado = resultado.sort_values(ordenar, ascending=False, kind="stable").reset_index(drop=True)
+    return rotular(resultado.head(top) if top else resultado)
+
+
+def comparar_meses(cubo, mes_anterior, mes_atual, por=(), top=None, **filtros):
+    """Medidas por `por` em dois meses lado a lado, com a variação (atual - anterior)."""
+    mes_anterior, mes_atual = normalizar_mes(mes_anterior), normalizar_mes(mes_atual)
+    fatia = fatiar(cubo, MES=[mes_anterior, mes_atual], **filtros)
+    por = list(por)
+    agrupado = fatia.groupby(por + ['MES'], sort=False)[MEDIDAS].sum() if por else fatia.groupby('MES')[MEDIDAS].sum()
+    tabela = agrupado.unstack('MES', fill_value=0).reindex(columns=[mes_anterior, mes_atual], level=1, fill_value=0)
+    comparacao = pd.DataFrame(index=tabela.index)
+    for medida in MEDIDAS:
+        comparacao[f"{medida}_{mes_anterior}"] = tabela[(medida, mes_anterior)]
+        comparacao[f"{medida}_{mes_atual}"] = tabela[(medida, mes_atual)]
+        comparacao[f"{medida}_VARIACAO"] = tabela[(medida, mes_atual)] - tabela[(medida, mes_anterior)]
+    comparacao = comparacao.reset_index() if por else comparacao.reset_index(drop=True)
+    ordem = np.argsort(-comparacao["REGISTROS_VARIACAO"].abs().to_numpy(), kind="stable")
+    comparacao = comparacao.iloc[ordem].reset_index(drop=True)
+    return rotular(comparacao.head(top) if top else comparacao)
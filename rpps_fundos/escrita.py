@@ -0,0 +1,229 @@
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+# === FORMATOS DE SAÍDA ===
+# xlsx    -> planilha gravada em streaming: o XML da aba é gerado por blocos de linhas
+#            e comprimido direto no arquivo (memória constante, sem openpyxl)
+# csv     -> separador ";" e decimal ",", UTF-8 com BOM (abre direto no Excel em português)
+# parquet -> colunar (pyarrow), para consumo por outras ferramentas
+FORMATOS = ("xlsx", "csv", "parquet")
+
+LINHAS_POR_BLOCO = 20_000
+ORIGEM_EXCEL = np.datetime64("1899-12-30", "ns")
+RE_CONTROLE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")  # caracteres inválidos em XML
+
+# Estilos: 0 = padrão, 1 = data (mesmo formato do pandas.to_excel), 2 = cabeçalho em negrito
+ESTILO_DATA = 1
+ESTILO_CABECALHO = 2
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{abas}</Types>'
+)
+_CONTENT_TYPE_ABA = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>{abas}</sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{abas}'
+    '<Relationship Id="rIdEstilos" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>'
+)
+_REL_ABA = (
+    '<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd\\ hh:mm:ss"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_INICIO_ABA = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_FIM_ABA = "</sheetData></worksheet>"
+
+
+# === CÉLULAS ===
+def _letra_coluna(indice):
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _texto_xml(valor):
+    return escape(RE_CONTROLE.sub("", str(valor)))
+
+
+def _celula_objeto(valor, ref):
+    # Colunas object podem misturar textos e números (ex.: ID_PENSIONISTA_MATRICULA)
+    if valor is None or valor is pd.NaT or valor is pd.NA or (isinstance(valor, float) and valor != valor):
+        return ""
+    if isinstance(valor, (bool, np.bool_)):
+        return f'<c r="{ref}" t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return f'<c r="{ref}"><v>{valor}</v></c>'
+    if isinstance(valor, pd.Timestamp):
+        serial = (valor.to_datetime64() - ORIGEM_EXCEL) / np.timedelta64(1, "D")
+        return f'<c r="{ref}" s="{ESTILO_DATA}"><v>{serial}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{_texto_xml(valor)}</t></is></c>'
+
+
+def _celulas(serie, refs):
+    """XML das células de uma coluna (vazio onde o valor é nulo), vetorizado por tipo."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Rótulos decodificados (esquema.decodificar): cada categoria é convertida uma única vez
+        finais = np.array([_celula_objeto(c, "")[len('<c r="'):] for c in serie.cat.categories] + [""], dtype=object)
+        codigos = serie.cat.codes.to_numpy()
+        celulas = '<c r="' + refs + finais[codigos]
+        celulas[codigos < 0] = ""
+        return celulas
+    if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype) and serie.dtype.kind in "iu":
+        # Inteiros anuláveis (esquema.restaurar_inteiros): CPF/matrícula ausente fica vazio
+        nulos = serie.isna().to_numpy()
+        celulas = _celulas(pd.Series(serie.fillna(0).to_numpy(dtype=np.int64)), refs)
+        celulas[nulos] = ""
+        return celulas
+    valores = serie.to_numpy()
+    if valores.dtype == bool:
+        return '<c r="' + refs + np.where(valores, '" t="b"><v>1</v></c>', '" t="b"><v>0</v></c>').astype(object)
+    if np.issubdtype(valores.dtype, np.integer):
+        return '<c r="' + refs + '"><v>' + valores.astype(str).astype(object) + "</v></c>"
+    if np.issubdtype(valores.dtype, np.floating):
+        nulos = ~np.isfinite(valores)
+        celulas = '<c r="' + refs + '"><v>' + valores.astype(str).astype(object) + "</v></c>"
+        celulas[nulos] = ""
+        return celulas
+    if np.issubdtype(valores.dtype, np.datetime64):
+        valores = valores.astype("datetime64[ns]")
+        nulos = np.isnat(valores)
+        seriais = (valores - ORIGEM_EXCEL) / np.timedelta64(1, "D")
+        inteiros = np.all(seriais[~nulos] == np.floor(seriais[~nulos]))
+        texto = (np.nan_to_num(seriais).astype(np.int64) if inteiros else seriais).astype(str).astype(object)
+        celulas = '<c r="' + refs + f'" s="{ESTILO_DATA}"><v>' + texto + "</v></c>"
+        celulas[nulos] = ""
+        return celulas
+    return np.array([_celula_objeto(v, r) for v, r in zip(valores, refs)], dtype=object)
+
+
+def _xml_bloco(bloco, primeira_linha):
+    numeros = np.arange(primeira_linha, primeira_linha + len(bloco)).astype(str).astype(object)
+    linhas = '<row r="' + numeros + '">'
+    for i, nome in enumerate(bloco.columns):
+        linhas = linhas + _celulas(bloco[nome], _letra_coluna(i) + numeros)
+    return "".join(linhas + "</row>")
+
+
+def _xml_cabecalho(colunas):
+    celulas = "".join(
+        f'<c r="{_letra_coluna(i)}1" t="inlineStr" s="{ESTILO_CABECALHO}"><is><t>{_texto_xml(nome)}</t></is></c>'
+        for i, nome in enumerate(colunas)
+    )
+    return f'<row r="1">{celulas}</row>'
+
+
+# === ESCRITORES ===
+def escrever_xlsx(dados, caminho, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Grava um DataFrame (aba "Sheet1") ou um dict {aba: DataFrame} em .xlsx, em streaming.
+
+    O arquivo é montado em um temporário e só substitui o destino quando completo.
+    """
+    abas = dados if isinstance(dados, dict) else {"Sheet1": dados}
+    temporario = caminho + ".tmp"
+    with zipfile.ZipFile(temporario, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        z.writestr("[Content_Types].xml", _CONTENT_TYPES.format(
+            abas="".join(_CONTENT_TYPE_ABA.format(n=n) for n in range(1, len(abas) + 1))))
+        z.writestr("_rels/.rels", _RELS)
+        z.writestr("xl/workbook.xml", _WORKBOOK.format(abas="".join(
+            f'<sheet name="{escape(nome, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+            for n, nome in enumerate(abas, start=1))))
+        z.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS.format(
+            abas="".join(_REL_ABA.format(n=n) for n in range(1, len(abas) + 1))))
+        z.writestr("xl/styles.xml", _STYLES)
+
+        for n, df in enumerate(abas.values(), start=1):
+            with z.open(f"xl/worksheets/sheet{n}.xml", "w", force_zip64=True) as f:
+                f.write(_INICIO_ABA.encode("utf-8"))
+                f.write(_xml_cabecalho(df.columns).encode("utf-8"))
+                for inicio in range(0, len(df), linhas_por_bloco):
+                    bloco = df.iloc[inicio:inicio + linhas_por_bloco]
+                    f.write(_xml_bloco(bloco, inicio + 2).encode("utf-8"))
+                f.write(_FIM_ABA.encode("utf-8"))
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def escrever_csv(df, caminho):
+    temporario = caminho + ".tmp"
+    df.to_csv(temporario, index=False, sep=";", decimal=",", encoding="utf-8-sig", date_format="%Y-%m-%d")
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def escrever_parquet(df, caminho):
+    # Colunas object com tipos mistos (ex.: matrícula numérica ou texto) viram texto
+    df = df.copy()
+    for nome in df.columns[df.dtypes == object]:
+        df[nome] = df[nome].astype("string")
+    temporario = caminho + ".tmp"
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+ESCRITORES = {"xlsx": escrever_xlsx, "csv": escrever_csv, "parquet": escrever_parquet}
+
+
+def escrever(df, caminho_base, formatos=("xlsx",)):
+    """Grava df em cada formato (caminho_base sem extensão); retorna os arquivos gerados."""
+    invalidos = [f for f in formatos if f not in ESCRITORES]
+    if invalidos:
+        raise ValueError(f"Formatos inválidos: {invalidos}. Use {list(FORMATOS)}.")
+    return [ESCRITORES[formato](df, f"{caminho_base}.{formato}") for formato in formatos]
+
+
+def executar_em_segundo_plano(funcao, *args):
+    """Executa funcao(*args) em uma thread; retorna o Future."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="escrita")
+    futuro = executor.submit(funcao, *args)
+    executor.shutdown(wait=False)
+    return futuro
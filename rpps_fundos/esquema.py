@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.classificacao import codigos
+from rpps_fundos.leitura import INTEIRO_AUSENTE
+
+# === ESQUEMA TIPADO ===
+# Durante o processamento as colunas ficam na forma compacta, pelo tipo da leitura (leitura.TIPOS):
+# codigo  -> int8 (CO_*, IN_*; já vem assim da leitura)
+# inteiro -> menor inteiro com sinal que comporta os valores (matrícula; CPF continua int64)
+# texto   -> Categorical (NO_ORGAO repete poucos nomes na base inteira)
+# valor   -> float64 mantido: as somas de VL_* do resumo precisam fechar no centavo
+# Os rótulos dos vocabulários só são aplicados na saída (decodificar), e os inteiros ausentes voltam
+# a ser vazios (restaurar_inteiros).
+
+
+def compactar(df, colunas):
+    """Converte as colunas lidas para a forma compacta do esquema (altera e retorna df)."""
+    for nome, tipo in colunas.items():
+        if nome not in df:
+            continue
+        if tipo == "codigo":
+            df[nome] = codigos(df[nome])
+        elif tipo == "inteiro":
+            df[nome] = pd.to_numeric(df[nome], downcast="integer")
+        elif tipo == "texto":
+            df[nome] = df[nome].astype("category")
+    return df
+
+
+def restaurar_inteiros(df, colunas):
+    """Colunas "inteiro" como Int64, com INTEIRO_AUSENTE de volta a nulo (célula vazia na saída); altera e retorna df."""
+    for nome, tipo in colunas.items():
+        if tipo != "inteiro" or nome not in df:
+            continue
+        valores = df[nome].to_numpy()
+        if valores.dtype.kind in "iu":
+            df[nome] = pd.arrays.IntegerArray(valores.astype(np.int64), valores == INTEIRO_AUSENTE)
+        elif valores.dtype == object:  # estado do modo incremental guarda as chaves como texto
+            df[nome] = df[nome].where(df[nome] != str(INTEIRO_AUSENTE), None)
+    return df
+
+
+def decodificar(valores, vocab):
+    """Rótulos do vocabulário como Categorical; código fora do vocabulário vira NaN, como no .map."""
+    valores = np.asarray(valores)
+    categorias = list(vocab.values())
+    if valores.dtype.kind not in "iu":
+        return pd.Categorical(pd.Series(valores).map(vocab), categories=categorias)
+
+    chaves = np.fromiter(vocab.keys(), dtype=np.int64)
+    ordem = np.argsort(chaves)
+    chaves = chaves[ordem]
+    posicoes = np.minimum(np.searchsorted(chaves, valores), len(chaves) - 1)
+    encontrado = chaves[posicoes] == valores
+    return pd.Categorical.from_codes(np.where(encontrado, ordem[posicoes], -1), categories=categorias)
+
+
+# === MEMÓRIA ===
+def medir_memoria(df):
+    """Tipo e bytes (inclusive o conteúdo dos objetos) de cada coluna."""
+    return pd.DataFrame({"TIPO": df.dtypes.astype(str), "BYTES": df.memory_usage(deep=True, index=False)})
+
+
+def relatorio_memoria(antes, depois):
+    """Linhas com a memória por coluna antes e depois (colunas novas, ex.: CALCULO_FUNDO, aparecem só depois)."""
+    linhas = ["Memória por coluna (antes -> depois):"]
+    for nome in depois.index.union(antes.index, sort=False):
+        tipo_antes, bytes_antes = antes.loc[nome] if nome in antes.index else ("-", 0)
+        tipo_depois, bytes_depois = depois.loc[nome] if nome in depois.index else ("-", 0)
+        linhas.append(f"- {nome} ({tipo_antes} -> {tipo_depois}): {bytes_antes / 1e6:.2f} MB -> {bytes_depois / 1e6:.2f} MB")
+    linhas.append(f"Total: {antes['BYTES'].sum() / 1e6:.2f} MB -> {depois['BYTES'].sum() / 1e6:.2f} MB")
+    return linhas
@@ -0,0 +1,350 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos import classificacao
+from rpps_fundos.leitura import iterar_blocos, ler_cabecalho
+from rpps_fundos.pipeline import PASTA_DADOS, PASTA_RESULTADOS, POPULACOES, selecionar_aba, selecionar_arquivo
+from rpps_fundos.validacao import Limite, valor_limite
+from rpps_fundos.vocabularios import (
+    vocab_cargo, vocab_estado_civil, vocab_fundo, vocab_sexo, vocab_situacao_funcional, vocab_tipo_aposentadoria,
+)
+
+# === CONFIGURAÇÕES ===
+DATA_REFERENCIA = datetime(2025, 9, 1)  # data de cálculo da idade atual
+TAMANHO_BLOCO = 200_000  # linhas por bloco na leitura em streaming
+NS_POR_DIA = 86_400 * 10**9
+SALARIO_MINIMO_VIGENTE = Limite("SALARIO_MINIMO")  # valor de validacao.LIMITES (--salario-minimo)
+
+# === ITENS DA ANÁLISE ===
+# Cada item é uma tupla (tipo, título, ...), na ordem do relatório:
+#   ("total", título)
+#   ("contagem", título, coluna, vocabulário ou None, rótulo do eixo)   -> value_counts
+#   ("duplicados", título, coluna)                                       -> duplicated().sum()
+#   ("descricao", título, idade)                                         -> describe()
+#   ("limite", título, coluna ou idade, "<" | ">", número, Limite ou coluna) -> linhas que atendem
+#   ("igual", título, coluna, código)                                    -> linhas com o código
+# As idades ({nome: (data final ou None = DATA_REFERENCIA, data de nascimento)}) são calculadas
+# uma vez por bloco, em anos completos como (fim - início).days // 365.
+PERFIS = {
+    "servidor": {
+        "colunas": {
+            'CO_TIPO_FUNDO': 'codigo', 'NO_ORGAO': 'texto', 'CO_TIPO_CARGO': 'codigo', 'ID_SERVIDOR_CPF': 'inteiro',
+            'CO_SEXO_SERVIDOR': 'codigo', 'CO_EST_CIVIL_SERVIDOR': 'codigo', 'CO_SITUACAO_FUNCIONAL': 'codigo',
+            'DT_NASC_SERVIDOR': 'data', 'DT_ING_SERV_PUB': 'data', 'DT_ING_ENTE': 'data',
+            'VL_BASE_CALCULO': 'valor', 'VL_REMUNERACAO': 'valor', 'VL_TETO_ESPECIFICO': 'valor',
+            'IN_ABONO_PERMANENCIA': 'codigo', 'IN_PREV_COMP': 'codigo',
+        },
+        "idades": {
+            'IDADE': (None, 'DT_NASC_SERVIDOR'),
+            'IDADE_ING_SERV_PUB': ('DT_ING_SERV_PUB', 'DT_NASC_SERVIDOR'),
+            'IDADE_ING_ENTE': ('DT_ING_ENTE', 'DT_NASC_SERVIDOR'),
+        },
+        "itens": [
+            ("total", "Total de linhas"),
+            ("contagem", "Servidores por fundo", 'CO_TIPO_FUNDO', vocab_fundo, "Fundo"),
+            ("contagem", "Servidores por órgão", 'NO_ORGAO', None, "Órgão"),
+            ("contagem", "Servidores por tipo de cargo", 'CO_TIPO_CARGO', vocab_cargo, "Cargo"),
+            ("duplicados", "CPFs duplicados", 'ID_SERVIDOR_CPF'),
+            ("contagem", "Servidores por sexo", 'CO_SEXO_SERVIDOR', vocab_sexo, "Sexo"),
+            ("contagem", "Servidores por estado civil", 'CO_EST_CIVIL_SERVIDOR', vocab_estado_civil, "Estado Civil"),
+            ("contagem", "Servidores por situação funcional", 'CO_SITUACAO_FUNCIONAL', vocab_situacao_funcional,
+             "Situação"),
+            ("descricao", "Faixas de idade", 'IDADE'),
+            ("descricao", "Faixas de idade de ingresso no serviço público", 'IDADE_ING_SERV_PUB'),
+            ("limite", "Ingressos no serviço público com menos de 18 anos", 'IDADE_ING_SERV_PUB', "<", 18),
+            ("descricao", "Faixas de idade de ingresso no ente", 'IDADE_ING_ENTE'),
+            ("limite", "Ingressos no ente com menos de 18 anos", 'IDADE_ING_ENTE', "<", 18),
+            ("limite", "Base de cálculo abaixo do mínimo", 'VL_BASE_CALCULO', "<", SALARIO_MINIMO_VIGENTE),
+            ("limite", "Base de cálculo acima do teto", 'VL_BASE_CALCULO', ">", 'VL_TETO_ESPECIFICO'),
+            ("limite", "Remuneração abaixo do mínimo", 'VL_REMUNERACAO', "<", SALARIO_MINIMO_VIGENTE),
+            ("limite", "Remuneração acima do teto", 'VL_REMUNERACAO', ">", 'VL_TETO_ESPECIFICO'),
+            ("igual", "Abono de permanência (Sim)", 'IN_ABONO_PERMANENCIA', 1),
+            ("igual", "Abono de permanência (Não)", 'IN_ABONO_PERMANENCIA', 2),
+            ("igual", "Previdência complementar (Sim)", 'IN_PREV_COMP', 1),
+            ("igual", "Previdência complementar (Não)", 'IN_PREV_COMP', 2),
+        ],
+    },
+    "aposentado": {
+        "colunas": {
+            'CO_TIPO_FUNDO': 'codigo', 'NO_ORGAO': 'texto', 'CO_TIPO_APOSENTADORIA': 'codigo',
+            'ID_APOSENTADO_CPF': 'inteiro', 'CO_SEXO_APOSENTADO': 'codigo', 'CO_EST_CIVIL_APOSENTADO': 'codigo',
+            'DT_NASC_APOSENTADO': 'data', 'DT_ING_ENTE': 'data', 'DT_INICIO_APOSENTADORIA': 'data',
+            'VL_APOSENTADORIA': 'valor', 'VL_TETO_ESPECIFICO': 'valor', 'IN_PARID_SERV': 'codigo',
+            'IN_PREV_COMP': 'codigo',
+        },
+        "idades": {
+            'IDADE': (None, 'DT_NASC_APOSENTADO'),
+            'IDADE_ING_ENTE': ('DT_ING_ENTE', 'DT_NASC_APOSENTADO'),
+            'IDADE_INICIO_APOSENTADORIA': ('DT_INICIO_APOSENTADORIA', 'DT_NASC_APOSENTADO'),
+        },
+        "itens": [
+            ("total", "Total de linhas"),
+            ("contagem", "Aposentados por fundo", 'CO_TIPO_FUNDO', vocab_fundo, "Fundo"),
+            ("contagem", "Aposentados por órgão", 'NO_ORGAO', None, "Órgão"),
+            ("contagem", "Aposentados por tipo de aposentadoria", 'CO_TIPO_APOSENTADORIA', vocab_tipo_aposentadoria,
+             "Tipo de Aposentadoria"),
+            ("duplicados", "CPFs duplicados", 'ID_APOSENTADO_CPF'),
+            ("contagem", "Aposentados por sexo", 'CO_SEXO_APOSENTADO', vocab_sexo, "Sexo"),
+            ("contagem", "Aposentados por estado civil", 'CO_EST_CIVIL_APOSENTADO', vocab_estado_civil, "Estado Civil"),
+            ("descricao", "Faixas de idade", 'IDADE'),
+            ("descricao", "Faixas de idade de ingresso no ente", 'IDADE_ING_ENTE'),
+            ("limite", "Ingressos no ente com menos de 18 anos", 'IDADE_ING_ENTE', "<", 18),
+            ("descricao", "Faixas de idade no início da aposentadoria", 'IDADE_INICIO_APOSENTADORIA'),
+            ("limite", "Aposentadoria abaixo do mínimo", 'VL_APOSENTADORIA', "<", SALARIO_MINIMO_VIGENTE),
+            ("limite", "Aposentadoria acima do teto", 'VL_APOSENTADORIA', ">", 'VL_TETO_ESPECIFICO'),
+            ("igual", "Paridade com servidores (Sim)", 'IN_PARID_SERV', 1),
+            ("igual", "Paridade com servidores (Não)", 'IN_PARID_SERV', 2),
+            ("igual", "Previdência complementar (Sim)", 'IN_PREV_COMP', 1),
+            ("igual", "Previdência complementar (Não)", 'IN_PREV_COMP', 2),
+        ],
+    },
+    "pensionista": {
+        "colunas": {
+            'CO_TIPO_FUNDO': 'objeto', 'NO_ORGAO': 'texto', 'ID_INSTITUIDOR_CPF': 'inteiro',
+            'ID_PENSIONISTA_CPF': 'inteiro', 'CO_SEXO_PENSIONISTA': 'codigo', 'CO_TIPO_RELACAO': 'codigo',
+            'DT_NASC_INSTITUIDOR': 'data', 'DT_OBITO_INSTITUIDOR': 'data', 'DT_NASC_PENSIONISTA': 'data',
+            'VL_BENEF_PENSAO': 'valor', 'VL_TETO_ESPECIFICO': 'valor', 'IN_PREV_COMP': 'codigo',
+        },
+        "idades": {
+            'IDADE_PENSIONISTA': (None, 'DT_NASC_PENSIONISTA'),
+            'IDADE_INSTITUIDOR': (None, 'DT_NASC_INSTITUIDOR'),
+            'IDADE_OBITO_INSTITUIDOR': ('DT_OBITO_INSTITUIDOR', 'DT_NASC_INSTITUIDOR'),
+        },
+        "itens": [
+            ("total", "Total de linhas"),
+            ("contagem", "Pensionistas por fundo", 'CO_TIPO_FUNDO', vocab_fundo, "Fundo"),
+            ("contagem", "Pensionistas por órgão", 'NO_ORGAO', None, "Órgão"),
+            ("duplicados", "CPFs de instituidor repetidos", 'ID_INSTITUIDOR_CPF'),
+            ("duplicados", "CPFs de pensionista duplicados", 'ID_PENSIONISTA_CPF'),
+            ("contagem", "Pensionistas por sexo", 'CO_SEXO_PENSIONISTA', vocab_sexo, "Sexo"),
+            ("contagem", "Pensionistas por tipo de relação", 'CO_TIPO_RELACAO', None, "Relação"),
+            ("descricao", "Faixas de idade do pensionista", 'IDADE_PENSIONISTA'),
+            ("limite", "Pensionistas com menos de 18 anos", 'IDADE_PENSIONISTA', "<", 18),
+            ("descricao", "Faixas de idade do instituidor", 'IDADE_INSTITUIDOR'),
+            ("descricao", "Faixas de idade do instituidor no óbito", 'IDADE_OBITO_INSTITUIDOR'),
+            ("limite", "Benefício abaixo do mínimo", 'VL_BENEF_PENSAO', "<", SALARIO_MINIMO_VIGENTE),
+            ("limite", "Benefício acima do teto", 'VL_BENEF_PENSAO', ">", 'VL_TETO_ESPECIFICO'),
+            ("igual", "Previdência complementar (Sim)", 'IN_PREV_COMP', 1),
+            ("igual", "Previdência complementar (Não)", 'IN_PREV_COMP', 2),
+        ],
+    },
+}
+
+
+def _preparar_bloco(bloco, colunas):
+    # Tipos da análise, uma vez por bloco: datas em datetime64, códigos em int8
+    for nome, tipo in colunas.items():
+        if nome not in bloco:
+            continue
+        if tipo == "data":
+            bloco[nome] = classificacao.datas(bloco[nome])
+        elif tipo == "codigo" or nome == 'CO_TIPO_FUNDO':
+            # CO_TIPO_FUNDO do pensionista pode vir como código ou texto
+            valores = bloco[nome]
+            if valores.dtype == object:
+                valores = valores.replace({"FUNPREV": 1, "FUNFIN": 2})
+            bloco[nome] = classificacao.codigos(valores)
+    return bloco
+
+
+def _idade(fim, inicio):
+    """Anos completos como (fim - inicio).days // 365; NaN se alguma data for inválida."""
+    validos = ~(np.isnat(fim) | np.isnat(inicio))
+    dias = (fim.astype("datetime64[ns]").view(np.int64) - inicio.astype("datetime64[ns]").view(np.int64)) // NS_POR_DIA
+    return np.where(validos, dias // 365, np.nan)
+
+
+def _quantil(valores, acumulado, posicao):
+    # Interpolação linear do pandas (posição q * (n - 1)) sobre o histograma de valores inteiros
+    inferior = int(np.floor(posicao))
+    superior = int(np.ceil(posicao))
+    v_inf = valores[np.searchsorted(acumulado, inferior)]
+    v_sup = valores[np.searchsorted(acumulado, superior)]
+    return v_inf + (v_sup - v_inf) * (posicao - inferior)
+
+
+# === ANÁLISE EM UMA PASSADA ===
+class AnaliseExploratoria:
+    """Acumula contagens, histogramas e limites bloco a bloco, sem quadros intermediários.
+
+    As idades são inteiras, então o histograma de cada uma basta para o describe exato (média,
+    desvio, quartis por interpolação linear). A duplicidade guarda só os CPFs distintos de cada bloco.
+    """
+
+    def __init__(self, populacao, colunas_disponiveis=None, data_referencia=DATA_REFERENCIA):
+        perfil = PERFIS[populacao]
+        disponiveis = set(perfil["colunas"] if colunas_disponiveis is None else colunas_disponiveis)
+        self.populacao = populacao
+        self.referencia = np.datetime64(data_referencia, "ns")
+        self.idades = {
+            nome: datas for nome, datas in perfil["idades"].items()
+            if all(c in disponiveis for c in datas if c is not None)
+        }
+        presentes = disponiveis | set(self.idades)
+        self.itens = [item for item in perfil["itens"] if all(c in presentes for c in _colunas_do_item(item))]
+        self.ausentes = [item[1] for item in perfil["itens"] if item not in self.itens]
+        self.colunas = {nome: tipo for nome, tipo in perfil["colunas"].items() if nome in disponiveis}
+
+        self.total = 0
+        self.contagens = {}
+        self.cpfs = {}
+        self.histogramas = {}
+        self.limites = {}
+
+    def acumular(self, bloco):
+        bloco = _preparar_bloco(bloco, self.colunas)
+        n = len(bloco)
+        idades = {}
+        for nome, (fim, inicio) in self.idades.items():
+            fim = np.full(n, self.referencia) if fim is None else bloco[fim].to_numpy()
+            idades[nome] = _idade(fim, bloco[inicio].to_numpy())
+
+        def valores(nome):
+            return idades[nome] if nome in idades else bloco[nome].to_numpy()
+
+        for item in self.itens:
+            tipo, titulo = item[0], item[1]
+            if tipo == "contagem":
+                coluna = bloco[item[2]]
+                codigos, unicos = pd.factorize(coluna)
+                contagem = np.bincount(codigos[codigos >= 0], minlength=len(unicos))
+                ausente = classificacao.CODIGO_AUSENTE if coluna.dtype == np.int8 else None
+                acumulado = self.contagens.setdefault(titulo, {})
+                for valor, quantidade in zip(unicos.tolist(), contagem.tolist()):
+                    if valor != ausente:
+                        acumulado[valor] = acumulado.get(valor, 0) + quantidade
+            elif tipo == "duplicados":
+                self.cpfs.setdefault(titulo, []).append(np.unique(bloco[item[2]].to_numpy()))
+                if len(self.cpfs[titulo]) >= 16:
+                    self.cpfs[titulo] = [np.unique(np.concatenate(self.cpfs[titulo]))]
+            elif tipo == "descricao":
+                idade = idades[item[2]]
+                distintos, quantidades = np.unique(idade[~np.isnan(idade)], return_counts=True)
+                histograma = self.histogramas.setdefault(item[2], {})
+                for valor, quantidade in zip(distintos.tolist(), quantidades.tolist()):
+                    histograma[valor] = histograma.get(valor, 0) + quantidade
+            elif tipo == "limite":
+                _, _, coluna, operador, referencia = item
+                referencia = valores(referencia) if isinstance(referencia, str) else valor_limite(referencia)
+                atende = valores(coluna) < referencia if operador == "<" else valores(coluna) > referencia
+                self.limites[titulo] = self.limites.get(titulo, 0) + int(np.count_nonzero(atende))
+            elif tipo == "igual":
+                iguais = int(np.count_nonzero(bloco[item[2]].to_numpy() == item[3]))
+                self.limites[titulo] = self.limites.get(titulo, 0) + iguais
+        self.total += n
+        return self
+
+    # === RESULTADO ===
+    def _contagem(self, titulo, vocab, rotulo):
+        # value_counts: ausentes e códigos fora do vocabulário ficam de fora; empates na ordem de aparição
+        acumulado = self.contagens.get(titulo, {})
+        if vocab is not None:
+            acumulado = {vocab[v]: q for v, q in acumulado.items() if v in vocab}
+        serie = pd.Series(acumulado, dtype=np.int64)
+        serie = serie[serie > 0].sort_values(ascending=False, kind="stable")
+        return serie.rename_axis(rotulo).reset_index(name='Contagem')
+
+    def _descricao(self, nome):
+        histograma = self.histogramas.get(nome, {})
+        valores = np.array(sorted(histograma), dtype=np.float64)
+        quantidades = np.array([histograma[v] for v in sorted(histograma)], dtype=np.int64)
+        n = int(quantidades.sum())
+        estatisticas = dict.fromkeys(["count", "mean", "std", "min", "25%", "50%", "75%", "max"], np.nan)
+        estatisticas["count"] = float(n)
+        if n:
+            media = float((valores * quantidades).sum() / n)
+            acumulado = np.cumsum(quantidades) - 1  # posição (base 0) do último registro de cada valor
+            estatisticas.update({
+                "mean": media,
+                "std": float(np.sqrt((quantidades * (valores - media) ** 2).sum() / (n - 1))) if n > 1 else np.nan,
+                "min": valores[0], "max": valores[-1],
+                **{f"{q:.0%}": _quantil(valores, acumulado, q * (n - 1)) for q in (0.25, 0.5, 0.75)},
+            })
+        return pd.Series(estatisticas, name=nome, dtype=np.float64)
+
+    def resultado(self):
+        """Dicionário título -> valor (int, DataFrame de contagens ou Series do describe), na ordem dos itens."""
+        resultado = {}
+        for item in self.itens:
+            tipo, titulo = item[0], item[1]
+            if tipo == "total":
+                resultado[titulo] = self.total
+            elif tipo == "contagem":
+                resultado[titulo] = self._contagem(titulo, item[3], item[4])
+            elif tipo == "duplicados":
+                cpfs = self.cpfs.get(titulo, [])
+                distintos = len(np.unique(np.concatenate(cpfs))) if cpfs else 0
+                resultado[titulo] = self.total - distintos
+            elif tipo == "descricao":
+                resultado[titulo] = self._descricao(item[2])
+            else:
+                resultado[titulo] = self.limites.get(titulo, 0)
+        return resultado
+
+
+def _colunas_do_item(item):
+    tipo = item[0]
+    if tipo in ("contagem", "duplicados", "descricao", "igual"):
+        return [item[2]]
+    if tipo == "limite":
+        return [item[2]] + ([item[4]] if isinstance(item[4], str) else [])
+    return []
+
+
+# === LEITURA EM BLOCOS ===
+def blocos_xlsx(populacao, arquivo, aba=None, tamanho_bloco=TAMANHO_BLOCO):
+    """(colunas disponíveis, iterador de blocos) da aba, lendo só as colunas da análise."""
+    config = POPULACOES[populacao]
+    aba = aba or selecionar_aba(arquivo, config["termo"])
+    cabecalho = set(ler_cabecalho(arquivo, aba, config["aliases"]))
+    colunas = {nome: tipo for nome, tipo in PERFIS[populacao]["colunas"].items() if nome in cabecalho}
+    return list(colunas), iterar_blocos(arquivo, aba, colunas, tamanho_bloco, config["aliases"])
+
+
+def blocos_parquet(populacao, arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    import pyarrow.parquet as pq
+
+    config = POPULACOES[populacao]
+    origem = pq.ParquetFile(arquivo)
+    renomear = {antigo: novo for antigo, novo in config["aliases"].items() if antigo in origem.schema_arrow.names}
+    nomes = {renomear.get(nome, nome): nome for nome in origem.schema_arrow.names}
+    colunas = [nome for nome in PERFIS[populacao]["colunas"] if nome in nomes]
+    lotes = origem.iter_batches(batch_size=tamanho_bloco, columns=[nomes[c] for c in colunas])
+    return colunas, (lote.to_pandas().rename(columns=renomear) for lote in lotes)
+
+
+def analisar(populacao, arquivo=None, pasta_dados=PASTA_DADOS, mes=None, tamanho_bloco=TAMANHO_BLOCO,
+             data_referencia=DATA_REFERENCIA):
+    """Análise exploratória de uma população, em blocos de tamanho_bloco linhas (.xlsx ou .parquet).
+
+    Retorna (resultado, arquivo, itens sem as colunas necessárias na base).
+    """
+    if arquivo is None:
+        arquivo = selecionar_arquivo(POPULACOES[populacao]["termo"], pasta_dados, mes)
+    if arquivo.lower().endswith(".parquet"):
+        colunas, blocos = blocos_parquet(populacao, arquivo, tamanho_bloco)
+    else:
+        colunas, blocos = blocos_xlsx(populacao, arquivo, tamanho_bloco=tamanho_bloco)
+    analise = AnaliseExploratoria(populacao, colunas, data_referencia)
+    for bloco in blocos:
+        analise.acumular(bloco)
+    return analise.resultado(), arquivo, analise.ausentes
+
+
+# === RELATÓRIO ===
+def escrever_relatorio(resultado, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        for chave, valor in resultado.items():
+            f.write(f"{chave}:\n")
+            if isinstance(valor, (pd.DataFrame, pd.Series)):
+                f.write(valor.to_string())
+            else:
+                f.write(str(valor))
+            f.write("\n" + "-"*60 + "\n")
+
+
+def arquivo_relatorio(populacao, pasta_resultados=PASTA_RESULTADOS):
+    return os.path.join(pasta_resultados, f"{POPULACOES[populacao]['prefixo']}_analise_exploratoria.txt")
@@ -0,0 +1,225 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.classificacao import INCOMPATIVEL, SEM_CENARIO
+from rpps_fundos.cpf import CPF_AUSENTE, normalizar as normalizar_cpf
+from rpps_fundos.cubo import normalizar_mes, rotular
+from rpps_fundos.indice_cpf import CHAVES_POPULACAO
+
+# === CONFIGURAÇÕES ===
+ARQUIVO_HISTORICO = "historico.sqlite"  # resultados/historico.sqlite: registros classificados de todos os meses
+ESPERA_TRAVA = 60  # segundos aguardando outra carga (run --all grava as três populações em paralelo)
+CACHE_MB = 128  # cache de páginas da conexão: os índices da carga de um mês cabem em memória
+
+# Uma linha por registro classificado. Pensionistas: CPF/MATRICULA são do instituidor (dono do
+# fundo) e CPF_PENSIONISTA/MATRICULA_PENSIONISTA do pensionista; nas demais populações ficam nulos.
+# Os incompatíveis têm índice parcial próprio (poucas linhas, carga mais leve que um índice da coluna inteira).
+COLUNAS = ['POPULACAO', 'MES', 'CPF', 'MATRICULA', 'CPF_PENSIONISTA', 'MATRICULA_PENSIONISTA', 'NO_ORGAO',
+           'CO_TIPO_FUNDO', 'CALCULO_FUNDO', 'COMPATIBILIDADE_FUNDO', 'CENARIO_FUNDO', 'CPF_DUPLICADO',
+           'CPF_INVALIDO', 'VALIDACAO', 'VL_CONTRIBUICAO']
+# Tabela agregados: registros e soma de VL_CONTRIBUICAO por estas colunas (algumas centenas de
+# linhas por mês), para o histórico por órgão não varrer os registros
+AGRUPAVEIS = ['POPULACAO', 'NO_ORGAO', 'CO_TIPO_FUNDO', 'CALCULO_FUNDO', 'COMPATIBILIDADE_FUNDO', 'CENARIO_FUNDO',
+              'CPF_DUPLICADO', 'CPF_INVALIDO']
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS registros (
+    POPULACAO TEXT NOT NULL, MES TEXT NOT NULL,
+    CPF INTEGER, MATRICULA TEXT, CPF_PENSIONISTA INTEGER, MATRICULA_PENSIONISTA TEXT, NO_ORGAO TEXT,
+    CO_TIPO_FUNDO INTEGER, CALCULO_FUNDO INTEGER, COMPATIBILIDADE_FUNDO INTEGER, CENARIO_FUNDO INTEGER,
+    CPF_DUPLICADO INTEGER, CPF_INVALIDO INTEGER, VALIDACAO INTEGER, VL_CONTRIBUICAO REAL
+);
+CREATE TABLE IF NOT EXISTS agregados (
+    POPULACAO TEXT NOT NULL, MES TEXT NOT NULL, NO_ORGAO TEXT, CO_TIPO_FUNDO INTEGER, CALCULO_FUNDO INTEGER,
+    COMPATIBILIDADE_FUNDO INTEGER, CENARIO_FUNDO INTEGER, CPF_DUPLICADO INTEGER, CPF_INVALIDO INTEGER,
+    REGISTROS INTEGER, VL_CONTRIBUICAO REAL
+);
+CREATE TABLE IF NOT EXISTS cargas (
+    POPULACAO TEXT NOT NULL, MES TEXT NOT NULL, LINHAS INTEGER, DATA TEXT, PRIMARY KEY (POPULACAO, MES)
+);
+CREATE INDEX IF NOT EXISTS registros_particao ON registros (POPULACAO, MES);
+CREATE INDEX IF NOT EXISTS registros_cpf ON registros (CPF, MES);
+CREATE INDEX IF NOT EXISTS registros_cpf_pensionista ON registros (CPF_PENSIONISTA) WHERE CPF_PENSIONISTA IS NOT NULL;
+CREATE INDEX IF NOT EXISTS registros_matricula ON registros (MATRICULA, MES);
+CREATE INDEX IF NOT EXISTS registros_matricula_pensionista ON registros (MATRICULA_PENSIONISTA)
+    WHERE MATRICULA_PENSIONISTA IS NOT NULL;
+CREATE INDEX IF NOT EXISTS registros_orgao ON registros (NO_ORGAO, MES);
+CREATE INDEX IF NOT EXISTS registros_incompativeis ON registros (MES, POPULACAO)
+    WHERE COMPATIBILIDADE_FUNDO = {INCOMPATIVEL};
+CREATE INDEX IF NOT EXISTS agregados_particao ON agregados (POPULACAO, MES);
+CREATE INDEX IF NOT EXISTS agregados_orgao ON agregados (NO_ORGAO, MES);
+"""
+
+
+def caminho_historico(pasta_resultados):
+    return os.path.join(pasta_resultados, ARQUIVO_HISTORICO)
+
+
+def conectar(pasta_resultados):
+    """Conexão com o histórico (cria o arquivo, as tabelas e os índices na primeira vez)."""
+    os.makedirs(pasta_resultados, exist_ok=True)
+    conexao = sqlite3.connect(caminho_historico(pasta_resultados), timeout=ESPERA_TRAVA)
+    conexao.execute("PRAGMA journal_mode=WAL")  # consultas não bloqueiam durante uma carga
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.execute(f"PRAGMA cache_size=-{CACHE_MB * 1024}")
+    conexao.executescript(ESQUEMA)
+    return conexao
+
+
+# === CARGA ===
+def _cpfs(valores):
+    cpfs = normalizar_cpf(valores)
+    return [None if cpf == CPF_AUSENTE else cpf for cpf in cpfs.tolist()]
+
+
+def _matriculas(valores):
+    serie = pd.Series(valores)
+    if pd.api.types.is_float_dtype(serie):  # matrícula inteira lida como float por causa de vazios
+        serie = serie.astype("Int64")
+    return serie.astype("string").astype(object).where(serie.notna(), None).tolist()
+
+
+def _colunas_da_carga(populacao, df, mes):
+    n = len(df)
+    titular, *pensionista = CHAVES_POPULACAO[populacao]
+    nulos = [None] * n
+    cenario = df['CENARIO_FUNDO'] if 'CENARIO_FUNDO' in df else np.full(n, SEM_CENARIO, dtype=np.int8)
+    validacao = df['VALIDACAO'] if 'VALIDACAO' in df else np.zeros(n, dtype=np.int64)
+    orgaos = df['NO_ORGAO'].astype(object)
+    return [
+        [populacao] * n, [mes] * n,
+        _cpfs(df[titular[1]]), _matriculas(df[titular[2]]),
+        _cpfs(df[pensionista[0][1]]) if pensionista else nulos,
+        _matriculas(df[pensionista[0][2]]) if pensionista else nulos,
+        orgaos.where(orgaos.notna(), None).tolist(),
+        np.asarray(df['CO_TIPO_FUNDO'], dtype=np.int64).tolist(),
+        np.asarray(df['CALCULO_FUNDO'], dtype=np.int64).tolist(),
+        np.asarray(df['COMPATIBILIDADE_FUNDO'], dtype=np.int64).tolist(),
+        np.asarray(cenario, dtype=np.int64).tolist(),
+        np.asarray(df['CPF_DUPLICADO'], dtype=np.int64).tolist(),
+        np.asarray(df['CPF_INVALIDO'], dtype=np.int64).tolist() if 'CPF_INVALIDO' in df else nulos,
+        np.asarray(validacao, dtype=np.int64).tolist(),
+        df['VL_CONTRIBUICAO'].to_numpy(dtype=np.float64).tolist(),  # NaN vira NULL no SQLite
+    ]
+
+
+def _agregar(colunas):
+    registros = pd.DataFrame(dict(zip(COLUNAS, colunas)))
+    agregados = registros.groupby(['MES'] + AGRUPAVEIS, sort=False, dropna=False)['VL_CONTRIBUICAO']
+    agregados = agregados.agg(REGISTROS='size', VL_CONTRIBUICAO='sum').reset_index()
+    return agregados.astype(object).where(agregados.notna(), None)
+
+
+def _inserir(conexao, tabela, colunas, linhas):
+    conexao.executemany(f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+                        linhas)
+
+
+def gravar_historico(populacao, df, mes, pasta_resultados):
+    """Carrega os registros classificados da população no mês (substitui a carga anterior do mesmo mês).
+
+    A troca é feita em uma transação: apaga a partição (população, mês) e insere as linhas com
+    executemany, junto com os agregados do mês. Retorna o caminho do banco.
+    """
+    mes = normalizar_mes(mes)
+    colunas = _colunas_da_carga(populacao, df, mes)
+    agregados = _agregar(colunas)
+    conexao = conectar(pasta_resultados)
+    try:
+        with conexao:
+            for tabela in ("registros", "agregados"):
+                conexao.execute(f"DELETE FROM {tabela} WHERE POPULACAO = ? AND MES = ?", (populacao, mes))
+            _inserir(conexao, "registros", COLUNAS, zip(*colunas))
+            _inserir(conexao, "agregados", list(agregados), agregados.itertuples(index=False, name=None))
+            conexao.execute("INSERT OR REPLACE INTO cargas VALUES (?, ?, ?, ?)",
+                            (populacao, mes, len(df), datetime.now().isoformat(timespec="seconds")))
+    finally:
+        conexao.close()
+    return caminho_historico(pasta_resultados)
+
+
+# === CONSULTA ===
+def _consultar(pasta_resultados, sql, parametros=()):
+    conexao = conectar(pasta_resultados)
+    try:
+        return pd.read_sql_query(sql, conexao, params=parametros)
+    finally:
+        conexao.close()
+
+
+def _desde(pasta_resultados, ultimos):
+    # Primeiro dos `ultimos` meses carregados (None: todos)
+    if not ultimos:
+        return None
+    meses = _consultar(pasta_resultados, "SELECT DISTINCT MES FROM cargas ORDER BY MES DESC LIMIT ?", (ultimos,))
+    return meses['MES'].iloc[-1] if len(meses) else None
+
+
+def _registros(pasta_resultados, condicoes, parametros, ultimos):
+    desde = _desde(pasta_resultados, ultimos)
+    periodo = " AND MES >= ?" if desde else ""
+    partes = [f"SELECT {', '.join(COLUNAS)} FROM registros WHERE {condicao}{periodo}" for condicao in condicoes]
+    parametros = [valor for parametro in parametros for valor in ((parametro, desde) if desde else (parametro,))]
+    sql = " UNION ALL ".join(partes) + " ORDER BY MES, POPULACAO"
+    tabela = _consultar(pasta_resultados, sql, parametros)
+    tabela['CENARIO_FUNDO'] = tabela['CENARIO_FUNDO'].fillna(SEM_CENARIO)
+    return rotular(tabela)
+
+
+def meses_carregados(pasta_resultados):
+    """Cargas no histórico: população, mês, linhas e data da carga."""
+    return _consultar(pasta_resultados, "SELECT * FROM cargas ORDER BY MES, POPULACAO")
+
+
+def historico_cpf(pasta_resultados, cpf, ultimos=None):
+    """Registros do CPF (com ou sem pontuação) mês a mês, como titular ou como pensionista."""
+    cpf = int(normalizar_cpf([cpf])[0])
+    return _registros(pasta_resultados, ["CPF = ?", "CPF_PENSIONISTA = ?"], [cpf, cpf], ultimos)
+
+
+def historico_matricula(pasta_resultados, matricula, populacao=None, ultimos=None):
+    """Registros da matrícula mês a mês (do servidor, aposentado, instituidor ou pensionista)."""
+    matricula = _matriculas([matricula])[0]
+    tabela = _registros(pasta_resultados, ["MATRICULA = ?", "MATRICULA_PENSIONISTA = ?"], [matricula, matricula],
+                        ultimos)
+    return tabela[tabela['POPULACAO'] == populacao].reset_index(drop=True) if populacao else tabela
+
+
+def historico_orgao(pasta_resultados, orgao, por=('COMPATIBILIDADE_FUNDO',), populacao=None, ultimos=None):
+    """Registros e soma de VL_CONTRIBUICAO do órgão por mês, população e as colunas de `por`."""
+    por = list(por)
+    invalidas = [coluna for coluna in por if coluna not in AGRUPAVEIS]
+    if invalidas:
+        raise ValueError(f"Colunas inválidas: {invalidas}. Use {AGRUPAVEIS}.")
+    grupos = ", ".join(dict.fromkeys(['MES', 'POPULACAO'] + por))
+    condicoes, parametros = ["NO_ORGAO = ?"], [orgao]
+    if populacao:
+        condicoes.append("POPULACAO = ?")
+        parametros.append(populacao)
+    desde = _desde(pasta_resultados, ultimos)
+    if desde:
+        condicoes.append("MES >= ?")
+        parametros.append(desde)
+    tabela = _consultar(
+        pasta_resultados,
+        f"SELECT {grupos}, SUM(REGISTROS) AS REGISTROS, SUM(VL_CONTRIBUICAO) AS VL_CONTRIBUICAO FROM agregados "
+        f"WHERE {' AND '.join(condicoes)} GROUP BY {grupos} ORDER BY {grupos}",
+        parametros,
+    )
+    return rotular(tabela)
+
+
+def incompativeis(pasta_resultados, mes=None, populacao=None):
+    """Registros incompatíveis do mês (padrão: o mais recente carregado), opcionalmente de uma população."""
+    mes = normalizar_mes(mes) if mes else _desde(pasta_resultados, 1)
+    # A condição literal sobre COMPATIBILIDADE_FUNDO é a do índice parcial registros_incompativeis
+    condicao = f"COMPATIBILIDADE_FUNDO = {INCOMPATIVEL} AND MES = ?" + (" AND POPULACAO = ?" if populacao else "")
+    parametros = [mes, populacao] if populacao else [mes]
+    tabela = _consultar(pasta_resultados, f"SELECT {', '.join(COLUNAS)} FROM registros WHERE {condicao} "
+                                          "ORDER BY POPULACAO, NO_ORGAO", parametros)
+    tabela['CENARIO_FUNDO'] = tabela['CENARIO_FUNDO'].fillna(SEM_CENARIO)
+    return rotular(tabela)
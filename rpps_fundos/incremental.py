@@ -0,0 +1,232 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos import pipeline
+from rpps_fundos.classificacao import COMPATIVEL, FORA_DA_ANALISE, INCOMPATIVEL, ROTULOS_COMPATIBILIDADE
+from rpps_fundos.cubo import mes_do_arquivo
+from rpps_fundos.escrita import escrever_xlsx
+from rpps_fundos.esquema import compactar, decodificar, medir_memoria, relatorio_memoria, restaurar_inteiros
+from rpps_fundos.indice_cpf import CHAVES_POPULACAO, extrair_chaves
+from rpps_fundos.instrumentacao import Instrumentacao
+from rpps_fundos.pipeline import (
+    PASTA_DADOS, PASTA_RESULTADOS, POPULACOES,
+    escrever_resumo, gravar_execucao, gravar_resultados, ler, validar,
+)
+from rpps_fundos.vocabularios import vocab_fundo
+
+# === CONFIGURAÇÕES ===
+NOME_PASTA_ESTADO = "estado"  # resultados/estado: classificação do último mês processado
+
+
+# === HASH DAS CHAVES E DOS CAMPOS ===
+def hash_colunas(df, colunas):
+    """Hash uint64 por linha das colunas informadas (independe do índice)."""
+    return pd.util.hash_pandas_object(df[colunas], index=False).to_numpy()
+
+
+def situacao(df):
+    """COMPATIVEL / INCOMPATIVEL / FORA_DA_ANALISE por linha (o próprio COMPATIBILIDADE_FUNDO)."""
+    return df['COMPATIBILIDADE_FUNDO'].to_numpy(dtype=np.int8).copy()
+
+
+# === ESTADO DO MÊS ANTERIOR ===
+def _caminhos_estado(populacao, pasta_resultados):
+    pasta = os.path.join(pasta_resultados, NOME_PASTA_ESTADO)
+    base = os.path.join(pasta, f"{POPULACOES[populacao]['prefixo']}_estado")
+    return pasta, base + ".arrow", base + ".json"
+
+
+def _cortes():
+    # Lidas do pipeline a cada chamada: são as mesmas usadas pelas regras nesta execução
+    return {"DATA_CORTE_ENTE": pipeline.DATA_CORTE_ENTE.isoformat(), "DATA_CORTE_NASC": pipeline.DATA_CORTE_NASC.isoformat()}
+
+
+def carregar_estado(populacao, pasta_resultados=PASTA_RESULTADOS):
+    """Estado salvo (quadro, metadados) ou (None, None) se não houver ou as datas de corte mudaram."""
+    _, arquivo_estado, arquivo_meta = _caminhos_estado(populacao, pasta_resultados)
+    if not (os.path.exists(arquivo_estado) and os.path.exists(arquivo_meta)):
+        return None, None
+    try:
+        with open(arquivo_meta, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        estado = pd.read_feather(arquivo_estado)
+    except (OSError, ValueError):
+        return None, None
+    # Classificação feita com outras datas de corte não pode ser reaproveitada
+    if meta.get("cortes") != _cortes():
+        return None, None
+    return estado, meta
+
+
+def salvar_estado(populacao, df, chave, conteudo, arquivo, pasta_resultados=PASTA_RESULTADOS):
+    config = POPULACOES[populacao]
+    pasta, arquivo_estado, arquivo_meta = _caminhos_estado(populacao, pasta_resultados)
+    os.makedirs(pasta, exist_ok=True)
+
+    coluna_cpf = CHAVES_POPULACAO[populacao][0][1]
+    estado = pd.DataFrame({
+        "CHAVE": chave, "HASH": conteudo,
+        **{coluna: df[coluna].astype(str).to_numpy() for coluna in config["chave"]},
+        coluna_cpf: df[coluna_cpf].to_numpy(),
+        "NO_ORGAO": df['NO_ORGAO'].astype(str).to_numpy(),
+        "CALCULO_FUNDO": df['CALCULO_FUNDO'].to_numpy(dtype=np.int8),
+        "COMPATIBILIDADE_FUNDO": df['COMPATIBILIDADE_FUNDO'].to_numpy(dtype=np.int8),
+        "SITUACAO": situacao(df),
+    })
+    temporario = arquivo_estado + ".tmp"
+    estado.to_feather(temporario)
+    os.replace(temporario, arquivo_estado)
+    with open(arquivo_meta, "w", encoding="utf-8") as f:
+        json.dump({"arquivo": arquivo, "linhas": len(estado), "cortes": _cortes()}, f, ensure_ascii=False, indent=2)
+
+
+# === CLASSIFICAÇÃO INCREMENTAL ===
+def _unicas(chaves):
+    return ~pd.Series(chaves).duplicated(keep=False).to_numpy()
+
+
+def classificar_incremental(populacao, df, estado, instrumentacao=None):
+    """Classifica reaproveitando CALCULO_FUNDO/COMPATIBILIDADE_FUNDO das linhas sem alteração.
+
+    Linhas novas, alteradas ou com chave repetida passam pelas regras; duplicidade de CPF,
+    cenários e regras de qualidade são sempre recalculados sobre a base inteira. Retorna
+    (df, chave, conteudo, posicao de cada linha no estado anterior ou -1).
+    """
+    config = POPULACOES[populacao]
+    instrumentacao = instrumentacao or Instrumentacao(populacao)
+    with instrumentacao.etapa("datas", len(df)):
+        df = config["preparar"](df)
+    with instrumentacao.etapa("classificacao") as etapa:
+        df, chave, conteudo, posicao, etapa.linhas = _reaproveitar(config, df, estado)
+    with instrumentacao.etapa("duplicidade_cenarios", len(df)):
+        df = config["completar"](df)
+    return validar(populacao, df, instrumentacao), chave, conteudo, posicao
+
+
+def reaproveitaveis(estado, posicao, conteudo):
+    """Linhas localizadas no estado anterior (chave única nos dois meses) com os mesmos campos."""
+    reaproveitar = posicao >= 0
+    if estado is not None:
+        reaproveitar[reaproveitar] = estado["HASH"].to_numpy()[posicao[reaproveitar]] == conteudo[reaproveitar]
+    return reaproveitar
+
+
+def _reaproveitar(config, df, estado):
+    # Retorna também quantas linhas passaram pelas regras
+    chave = hash_colunas(df, config["chave"])
+    conteudo = hash_colunas(df, config["campos"])
+
+    posicao = np.full(len(df), -1, dtype=np.int64)
+    if estado is not None:
+        anteriores = estado["CHAVE"].to_numpy()
+        unicas_anteriores = np.flatnonzero(_unicas(anteriores))
+        indice = pd.Index(anteriores[unicas_anteriores])
+        encontrados = indice.get_indexer(chave)
+        validos = (encontrados >= 0) & _unicas(chave)
+        posicao[validos] = unicas_anteriores[encontrados[validos]]
+
+    reaproveitar = reaproveitaveis(estado, posicao, conteudo)
+    calculo = np.zeros(len(df), dtype=np.int8)
+    compatibilidade = np.zeros(len(df), dtype=np.int8)
+    if reaproveitar.any():
+        calculo[reaproveitar] = estado["CALCULO_FUNDO"].to_numpy()[posicao[reaproveitar]]
+        compatibilidade[reaproveitar] = estado["COMPATIBILIDADE_FUNDO"].to_numpy()[posicao[reaproveitar]]
+    if (~reaproveitar).any():
+        calculo[~reaproveitar], compatibilidade[~reaproveitar] = config["regras"](df[~reaproveitar])
+
+    df['CALCULO_FUNDO'] = calculo
+    df['COMPATIBILIDADE_FUNDO'] = compatibilidade
+    return df, chave, conteudo, posicao, int((~reaproveitar).sum())
+
+
+# === RELATÓRIO DE VARIAÇÕES ===
+def variacoes(populacao, df, conteudo, posicao, estado):
+    """Quadros do relatório: inseridos, alterados, novos incompatíveis, novos compatíveis e removidos."""
+    config = POPULACOES[populacao]
+    rotular = config["rotular"]
+    atual = situacao(df)
+    existente = posicao >= 0
+    anterior = np.full(len(df), FORA_DA_ANALISE, dtype=np.int8)
+    anterior[existente] = estado["SITUACAO"].to_numpy()[posicao[existente]]
+    alterado = existente.copy()
+    alterado[existente] = estado["HASH"].to_numpy()[posicao[existente]] != conteudo[existente]
+
+    presentes = np.zeros(len(estado), dtype=bool)
+    presentes[posicao[existente]] = True
+    removidos = restaurar_inteiros(estado.loc[~presentes].drop(columns=["CHAVE", "HASH", "SITUACAO"]), config["colunas"])
+    removidos['CALCULO_FUNDO'] = decodificar(removidos['CALCULO_FUNDO'], vocab_fundo)
+    removidos['COMPATIBILIDADE_FUNDO'] = decodificar(removidos['COMPATIBILIDADE_FUNDO'], ROTULOS_COMPATIBILIDADE)
+
+    return {
+        "novos_incompativeis": rotular(df[existente & (anterior != INCOMPATIVEL) & (atual == INCOMPATIVEL)]),
+        "novos_compativeis": rotular(df[existente & (anterior != COMPATIVEL) & (atual == COMPATIVEL)]),
+        "inseridos": rotular(df[~existente]),
+        "alterados": rotular(df[alterado]),
+        "removidos": removidos,
+    }
+
+
+def resumo_variacoes(quadros, meta, reclassificados, total):
+    rotulos = {
+        "novos_incompativeis": "Novos incompatíveis", "novos_compativeis": "Novos compatíveis",
+        "inseridos": "Matrículas inseridas", "alterados": "Registros alterados", "removidos": "Matrículas removidas",
+    }
+    resumo = [
+        f"Variações em relação a: {os.path.basename(meta['arquivo'])}",
+        f"Reclassificados: {reclassificados} de {total} ({reclassificados/total:.2%})" if total else "Reclassificados: 0",
+    ]
+    for i, (nome, rotulo) in enumerate(rotulos.items(), start=1):
+        resumo.append(f"{i}. {rotulo}: {len(quadros[nome])}")
+    return resumo
+
+
+# === EXECUÇÃO INCREMENTAL DE UMA POPULAÇÃO ===
+def processar_incremental(populacao, arquivo=None, pasta_dados=PASTA_DADOS, pasta_resultados=PASTA_RESULTADOS, mes=None,
+                          formatos=("xlsx",), apenas_incompativeis=False, rastrear_alocacoes=False, perfil=False):
+    """Como pipeline.processar, reclassificando só o que mudou desde o último mês processado.
+
+    Sem estado anterior (primeira execução ou datas de corte alteradas) classifica a base inteira.
+    Grava o resultado completo, o relatório de variações, o novo estado e o relatório de execução.
+    """
+    config = POPULACOES[populacao]
+    with Instrumentacao(populacao, rastrear_alocacoes, perfil) as instrumentacao:
+        with instrumentacao.etapa("leitura") as etapa:
+            df, arquivo, aba = ler(populacao, arquivo, pasta_dados, mes)
+            etapa.linhas = len(df)
+        antes = medir_memoria(df)
+        with instrumentacao.etapa("compactacao", len(df)):
+            df = compactar(df, config["colunas"])
+
+        with instrumentacao.etapa("estado_anterior"):
+            estado, meta = carregar_estado(populacao, pasta_resultados)
+        df, chave, conteudo, posicao = classificar_incremental(populacao, df, estado, instrumentacao)
+        resumo, saidas = gravar_resultados(populacao, df, pasta_resultados, formatos, apenas_incompativeis,
+                                           instrumentacao, mes_do_arquivo(arquivo, mes))
+
+        delta = []
+        if estado is not None:
+            with instrumentacao.etapa("variacoes", len(df)):
+                quadros = variacoes(populacao, df, conteudo, posicao, estado)
+                # Linhas que passaram pelas regras: chaves repetidas contam uma vez por linha
+                reclassificados = int(np.count_nonzero(~reaproveitaveis(estado, posicao, conteudo)))
+                delta = resumo_variacoes(quadros, meta, reclassificados, len(df))
+
+                arquivo_delta = os.path.join(pasta_resultados, f"{config['prefixo']}_variacoes.xlsx")
+                arquivo_delta_txt = os.path.join(pasta_resultados, f"{config['prefixo']}_variacoes_resumo.txt")
+                escrever_xlsx(quadros, arquivo_delta)
+                escrever_resumo(delta, arquivo_delta_txt)
+                saidas += [arquivo_delta, arquivo_delta_txt]
+
+        with instrumentacao.etapa("estado_novo", len(df)):
+            salvar_estado(populacao, df, chave, conteudo, arquivo, pasta_resultados)
+    execucao, arquivos = gravar_execucao(populacao, instrumentacao, pasta_resultados, arquivo=arquivo, aba=aba,
+                                         linhas=len(df), modo="incremental")
+    return {
+        "populacao": populacao, "arquivo": arquivo, "aba": aba,
+        "resumo": resumo, "saidas": saidas + arquivos, "delta": delta,
+        "memoria": relatorio_memoria(antes, medir_memoria(df)), "execucao": execucao,
+        "chaves": extrair_chaves(populacao, df),
+    }
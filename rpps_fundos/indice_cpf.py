@@ -0,0 +1,213 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.cpf import CPF_AUSENTE, normalizar as normalizar_cpf
+from rpps_fundos.escrita import escrever_xlsx
+from rpps_fundos.esquema import decodificar
+from rpps_fundos.vocabularios import vocab_fundo
+
+# === PAPÉIS (BITS DA MÁSCARA BASES_CPF) ===
+SERVIDOR = 1
+APOSENTADO = 2
+INSTITUIDOR = 4
+PENSIONISTA = 8
+
+ROTULOS_PAPEL = {SERVIDOR: "servidor", APOSENTADO: "aposentado", INSTITUIDOR: "instituidor", PENSIONISTA: "pensionista"}
+
+# Colunas de CPF e matrícula de cada papel, por população (pensionistas trazem o instituidor e o pensionista)
+CHAVES_POPULACAO = {
+    "servidor": [(SERVIDOR, "ID_SERVIDOR_CPF", "ID_SERVIDOR_MATRICULA")],
+    "aposentado": [(APOSENTADO, "ID_APOSENTADO_CPF", "ID_APOSENTADO_MATRICULA")],
+    "pensionista": [
+        (INSTITUIDOR, "ID_INSTITUIDOR_CPF", "ID_INSTITUIDOR_MATRICULA"),
+        (PENSIONISTA, "ID_PENSIONISTA_CPF", "ID_PENSIONISTA_MATRICULA"),
+    ],
+}
+
+# O fundo pertence ao vínculo do servidor/aposentado/instituidor; o pensionista é outra pessoa
+PAPEIS_COM_FUNDO = SERVIDOR | APOSENTADO | INSTITUIDOR
+
+# === CENÁRIOS ENTRE BASES ===
+SEM_CRUZAMENTO = 0
+ATIVO_E_APOSENTADO = 1      # CPF como servidor ativo e como aposentado
+INSTITUIDOR_APOSENTADO = 2  # CPF instituidor de pensão ainda na base de aposentados
+INSTITUIDOR_ATIVO = 3       # CPF instituidor de pensão ainda na base de servidores ativos
+
+ROTULOS_CENARIO_CRUZADO = {
+    ATIVO_E_APOSENTADO: "Servidor ativo e aposentado",
+    INSTITUIDOR_APOSENTADO: "Instituidor de pensão ainda aposentado",
+    INSTITUIDOR_ATIVO: "Instituidor de pensão ainda ativo",
+}
+
+CODIGOS_FUNDO = list(vocab_fundo)
+
+IndiceCPF = namedtuple("IndiceCPF", ["cpfs", "papeis", "ocorrencias", "fundos_informados", "fundos_calculados"])
+
+
+def extrair_chaves(populacao, df):
+    """Quadro compacto (PAPEL, CPF, MATRICULA, fundos informado/calculado) de uma população classificada."""
+    partes = []
+    for papel, coluna_cpf, coluna_matricula in CHAVES_POPULACAO[populacao]:
+        tem_fundo = bool(papel & PAPEIS_COM_FUNDO)
+        partes.append(pd.DataFrame({
+            "PAPEL": np.full(len(df), papel, dtype=np.int8),
+            "CPF": normalizar_cpf(df[coluna_cpf]),
+            "MATRICULA": df[coluna_matricula].astype(str).to_numpy(),
+            "CO_TIPO_FUNDO": df["CO_TIPO_FUNDO"].to_numpy(dtype=np.int8) if tem_fundo else np.int8(0),
+            "CALCULO_FUNDO": df["CALCULO_FUNDO"].to_numpy(dtype=np.int8) if tem_fundo else np.int8(0),
+        }))
+    return pd.concat(partes, ignore_index=True)
+
+
+# === ÍNDICE ===
+def _mascara_fundos(fundos):
+    # Um bit por código de fundo válido (1, 2, 3, 9); ausente/indefinido não entra
+    fundos = np.asarray(fundos, dtype=np.int32)
+    validos = np.isin(fundos, CODIGOS_FUNDO)
+    return np.where(validos, np.left_shift(1, np.where(validos, fundos, 0)), 0).astype(np.int32)
+
+
+def _quantidade_fundos(mascaras):
+    return sum((mascaras >> codigo) & 1 for codigo in CODIGOS_FUNDO)
+
+
+def construir_indice(chaves):
+    """Índice ordenado por CPF: papéis (máscara), ocorrências e máscaras dos fundos informados e calculados.
+
+    chaves é o quadro de extrair_chaves (ou a concatenação de vários); CPFs ausentes ficam de fora.
+    """
+    cpf = chaves["CPF"].to_numpy(dtype=np.int64)
+    validos = cpf != CPF_AUSENTE
+    ordem = np.flatnonzero(validos)[np.argsort(cpf[validos], kind="stable")]
+    cpf_ordenado = cpf[ordem]
+    if len(cpf_ordenado) == 0:
+        vazio = np.zeros(0, dtype=np.int64)
+        return IndiceCPF(vazio, vazio.astype(np.int8), vazio, vazio.astype(np.int32), vazio.astype(np.int32))
+
+    inicios = np.flatnonzero(np.r_[True, cpf_ordenado[1:] != cpf_ordenado[:-1]])
+    papel = chaves["PAPEL"].to_numpy(dtype=np.int8)[ordem]
+    com_fundo = (papel & PAPEIS_COM_FUNDO) != 0
+    informados = np.where(com_fundo, _mascara_fundos(chaves["CO_TIPO_FUNDO"].to_numpy()[ordem]), 0)
+    calculados = np.where(com_fundo, _mascara_fundos(chaves["CALCULO_FUNDO"].to_numpy()[ordem]), 0)
+
+    return IndiceCPF(
+        cpfs=cpf_ordenado[inicios],
+        papeis=np.bitwise_or.reduceat(papel, inicios),
+        ocorrencias=np.diff(np.r_[inicios, len(cpf_ordenado)]),
+        fundos_informados=np.bitwise_or.reduceat(informados, inicios),
+        fundos_calculados=np.bitwise_or.reduceat(calculados, inicios),
+    )
+
+
+def posicoes(indice, cpfs):
+    """Posição de cada CPF no índice (-1 se ausente), por busca binária."""
+    cpfs = np.asarray(cpfs, dtype=np.int64)
+    pos = np.searchsorted(indice.cpfs, cpfs)
+    pos = np.minimum(pos, max(len(indice.cpfs) - 1, 0))
+    encontrado = (len(indice.cpfs) > 0) & (indice.cpfs[pos] == cpfs) & (cpfs != CPF_AUSENTE)
+    return np.where(encontrado, pos, -1)
+
+
+def cenario_cruzado(papeis):
+    """Cenário entre bases a partir da máscara de papéis (o instituidor ainda ativo prevalece)."""
+    papeis = np.asarray(papeis)
+    cenario = np.zeros(len(papeis), dtype=np.int8)
+    cenario[((papeis & SERVIDOR) != 0) & ((papeis & APOSENTADO) != 0)] = ATIVO_E_APOSENTADO
+    cenario[((papeis & INSTITUIDOR) != 0) & ((papeis & APOSENTADO) != 0)] = INSTITUIDOR_APOSENTADO
+    cenario[((papeis & INSTITUIDOR) != 0) & ((papeis & SERVIDOR) != 0)] = INSTITUIDOR_ATIVO
+    return cenario
+
+
+# === CRUZAMENTO ===
+def marcar_registros(chaves, indice):
+    """Acrescenta a cada registro BASES_CPF, CPF_OUTRAS_BASES, CENARIO_CRUZADO e FUNDO_CONSISTENTE."""
+    pos = posicoes(indice, chaves["CPF"].to_numpy())
+    encontrado = pos >= 0
+    papeis = np.where(encontrado, indice.papeis[pos], 0).astype(np.int8)
+    calculados = np.where(encontrado, indice.fundos_calculados[pos], 0)
+    informados = np.where(encontrado, indice.fundos_informados[pos], 0)
+
+    marcados = chaves.copy()
+    marcados["BASES_CPF"] = papeis
+    marcados["CPF_OUTRAS_BASES"] = (papeis & ~chaves["PAPEL"].to_numpy(dtype=np.int8)) != 0
+    marcados["CENARIO_CRUZADO"] = cenario_cruzado(papeis)
+    marcados["FUNDO_CONSISTENTE"] = (_quantidade_fundos(calculados) <= 1) & (_quantidade_fundos(informados) <= 1)
+    return marcados
+
+
+def _rotulos_mascara(mascaras, rotulos):
+    return ["/".join(rotulo for bit, rotulo in rotulos.items() if mascara & bit) for mascara in mascaras]
+
+
+def relatorio_cpf(indice):
+    """Uma linha por CPF presente em mais de uma base ou com fundos divergentes entre seus registros."""
+    n_papeis = sum((indice.papeis & papel) != 0 for papel in ROTULOS_PAPEL)
+    qtd_informados = _quantidade_fundos(indice.fundos_informados)
+    qtd_calculados = _quantidade_fundos(indice.fundos_calculados)
+    selecao = (n_papeis > 1) | (qtd_informados > 1) | (qtd_calculados > 1)
+
+    rotulos_fundo = {1 << codigo: rotulo for codigo, rotulo in vocab_fundo.items()}
+    papeis = indice.papeis[selecao]
+    relatorio = pd.DataFrame({
+        "CPF": indice.cpfs[selecao],
+        "BASES": _rotulos_mascara(papeis, ROTULOS_PAPEL),
+        "OCORRENCIAS": indice.ocorrencias[selecao],
+        "FUNDOS_INFORMADOS": _rotulos_mascara(indice.fundos_informados[selecao], rotulos_fundo),
+        "FUNDOS_CALCULADOS": _rotulos_mascara(indice.fundos_calculados[selecao], rotulos_fundo),
+        "FUNDO_INFORMADO_CONSISTENTE": qtd_informados[selecao] <= 1,
+        "FUNDO_CALCULADO_CONSISTENTE": qtd_calculados[selecao] <= 1,
+        "CENARIO_CRUZADO": cenario_cruzado(papeis),
+    })
+    relatorio["CENARIO_CRUZADO"] = decodificar(relatorio["CENARIO_CRUZADO"], ROTULOS_CENARIO_CRUZADO)
+    return relatorio
+
+
+def resumo_cruzamento(indice, marcados):
+    cenarios = pd.Series(cenario_cruzado(indice.papeis)).value_counts()
+    n_papeis = sum((indice.papeis & papel) != 0 for papel in ROTULOS_PAPEL)
+    divergentes = (_quantidade_fundos(indice.fundos_calculados) > 1) | (_quantidade_fundos(indice.fundos_informados) > 1)
+
+    resumo = [
+        f"1. CPFs distintos: {len(indice.cpfs)}",
+        f"2. CPFs em mais de uma base: {(n_papeis > 1).sum()}",
+        f"3. Registros com o CPF em outra base: {marcados['CPF_OUTRAS_BASES'].sum()}",
+        "\n4. Cenários entre bases (CPFs):",
+    ]
+    for i, (codigo, rotulo) in enumerate(ROTULOS_CENARIO_CRUZADO.items(), start=1):
+        resumo.append(f"4.{i} - {rotulo}: {cenarios.get(codigo, 0)}")
+    resumo.append(f"\n5. CPFs com fundo divergente entre registros: {divergentes.sum()}")
+    return resumo
+
+
+def cruzar_bases(chaves_por_populacao, pasta_resultados):
+    """Constrói o índice do mês e grava o relatório por CPF e os registros com CPF em outra base."""
+    chaves = pd.concat(
+        [c.assign(POPULACAO=populacao) for populacao, c in chaves_por_populacao.items()], ignore_index=True
+    )
+    indice = construir_indice(chaves)
+    marcados = marcar_registros(chaves, indice)
+    relatorio = relatorio_cpf(indice)
+    resumo = resumo_cruzamento(indice, marcados)
+
+    # === SAÍDAS ===
+    os.makedirs(pasta_resultados, exist_ok=True)
+    arquivo_cpf = os.path.join(pasta_resultados, "CPF_cruzamento_bases.xlsx")
+    arquivo_registros = os.path.join(pasta_resultados, "CPF_cruzamento_registros.xlsx")
+    arquivo_txt = os.path.join(pasta_resultados, "CPF_cruzamento_resumo.txt")
+
+    escrever_xlsx(relatorio, arquivo_cpf)
+    registros = marcados[marcados["CPF_OUTRAS_BASES"] | ~marcados["FUNDO_CONSISTENTE"]].copy()
+    registros["PAPEL"] = decodificar(registros["PAPEL"], ROTULOS_PAPEL)
+    registros["BASES_CPF"] = _rotulos_mascara(registros["BASES_CPF"], ROTULOS_PAPEL)
+    registros["CO_TIPO_FUNDO"] = decodificar(registros["CO_TIPO_FUNDO"], vocab_fundo)
+    registros["CALCULO_FUNDO"] = decodificar(registros["CALCULO_FUNDO"], vocab_fundo)
+    registros["CENARIO_CRUZADO"] = decodificar(registros["CENARIO_CRUZADO"], ROTULOS_CENARIO_CRUZADO)
+    escrever_xlsx(registros, arquivo_registros)
+    with open(arquivo_txt, "w", encoding="utf-8") as f:
+        for linha in resumo:
+            f.write(linha + "\n")
+
+    return {"resumo": resumo, "saidas": [arquivo_cpf, arquivo_registros, arquivo_txt]}
@@ -0,0 +1,183 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource  # indisponível no Windows: o pico de RSS fica sem medida
+except ImportError:
+    resource = None
+
+# === ETAPAS ===
+# Nomes usados pelo pipeline e pelo benchmark, na ordem de execução
+ETAPAS = {
+    "descoberta": "Seleção do arquivo e da aba",
+    "leitura": "Leitura",
+    "compactacao": "Compactação das colunas",
+    "datas": "Conversão de datas",
+    "classificacao": "Cálculo do fundo e compatibilidade",
+    "duplicidade_cenarios": "Duplicidade de CPF e cenários",
+    "validacao": "Regras de qualidade",
+    "rotulos": "Mapeamento para rótulos",
+    "escrita": "Gravação da saída",
+    "resumo": "Resumo",
+    "cubo": "Cubo de agregados",
+    "historico": "Carga no histórico (SQLite)",
+    # Modo incremental
+    "estado_anterior": "Leitura do estado do mês anterior",
+    "variacoes": "Relatório de variações",
+    "estado_novo": "Gravação do estado",
+}
+
+
+def rss_pico_mb():
+    """Maior RSS do processo até agora, em MB (None sem o módulo resource)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1e6 if sys.platform == "darwin" else pico / 1e3  # bytes no macOS, KB no Linux
+
+
+class Etapa:
+    """Medidas de uma etapa; `linhas` pode ser informado dentro do bloco (ex.: após a leitura)."""
+
+    __slots__ = ("nome", "linhas", "inicio", "segundos", "cpu", "rss_pico_mb", "tracemalloc_pico_mb")
+
+    def __init__(self, nome, linhas=None):
+        self.nome = nome
+        self.linhas = linhas
+        self.inicio = self.segundos = self.cpu = self.rss_pico_mb = self.tracemalloc_pico_mb = None
+
+    def como_dict(self):
+        por_segundo = self.linhas / self.segundos if self.linhas and self.segundos else None
+        return {
+            "etapa": self.nome, "inicio_s": _arredondar(self.inicio), "segundos": _arredondar(self.segundos),
+            "cpu_s": _arredondar(self.cpu), "linhas": self.linhas,
+            "linhas_por_s": None if por_segundo is None else round(por_segundo),
+            "rss_pico_mb": _arredondar(self.rss_pico_mb, 1),
+            "tracemalloc_pico_mb": _arredondar(self.tracemalloc_pico_mb, 1),
+        }
+
+
+def _arredondar(valor, casas=4):
+    return None if valor is None else round(valor, casas)
+
+
+# === INSTRUMENTAÇÃO DE UMA EXECUÇÃO ===
+class Instrumentacao:
+    """Tempo de parede, tempo de CPU, linhas e pico de memória de cada etapa de uma execução.
+
+        instrumentacao = Instrumentacao("servidor")
+        with instrumentacao.etapa("leitura") as etapa:
+            df = ...
+            etapa.linhas = len(df)
+
+    etapa() também serve como decorador. O tempo de CPU é o do processo inteiro, então etapas
+    simultâneas (a gravação em segundo plano) dividem a mesma CPU. Com rastrear_alocacoes, cada
+    etapa registra o pico de alocações do Python/NumPy no tracemalloc (mais lento); com perfil,
+    a execução inteira roda sob o cProfile.
+    """
+
+    def __init__(self, populacao=None, rastrear_alocacoes=False, perfil=False):
+        self.populacao = populacao
+        self.etapas = []
+        self.rastrear_alocacoes = rastrear_alocacoes
+        self.perfil = cProfile.Profile() if perfil else None
+        self.data = datetime.now().isoformat(timespec="seconds")
+        self._inicio = time.perf_counter()
+        self._cpu = time.process_time()
+        self._trava = threading.Lock()
+        self._iniciou_tracemalloc = False
+
+    def __enter__(self):
+        if self.rastrear_alocacoes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+        if self.perfil is not None:
+            self.perfil.enable()
+        self._inicio = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *_):
+        if self.perfil is not None:
+            self.perfil.disable()
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+        self.total = time.perf_counter() - self._inicio
+        self.cpu_total = time.process_time() - self._cpu
+        return False
+
+    @contextmanager
+    def etapa(self, nome, linhas=None):
+        registro = Etapa(nome, linhas)
+        rastreando = tracemalloc.is_tracing()
+        if rastreando:
+            # O pico do tracemalloc é global: etapas simultâneas compartilham a mesma medida
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield registro
+        finally:
+            registro.segundos = time.perf_counter() - inicio
+            registro.cpu = time.process_time() - cpu
+            registro.inicio = inicio - self._inicio
+            registro.rss_pico_mb = rss_pico_mb()
+            if rastreando and tracemalloc.is_tracing():
+                registro.tracemalloc_pico_mb = (tracemalloc.get_traced_memory()[1] - base) / 1e6
+            with self._trava:
+                self.etapas.append(registro)
+
+    def medidas(self):
+        """{etapa: Etapa}, na ordem de término."""
+        return {registro.nome: registro for registro in self.etapas}
+
+    # === RELATÓRIO ===
+    def relatorio(self, **contexto):
+        """Dicionário serializável em JSON com o contexto informado (arquivo, aba...) e as etapas."""
+        total = getattr(self, "total", time.perf_counter() - self._inicio)
+        cpu_total = getattr(self, "cpu_total", time.process_time() - self._cpu)
+        return {
+            "populacao": self.populacao, "data": self.data, **contexto,
+            "segundos": round(total, 4), "cpu_s": round(cpu_total, 4),
+            "rss_pico_mb": _arredondar(rss_pico_mb(), 1),
+            "etapas": [registro.como_dict() for registro in sorted(self.etapas, key=lambda r: r.inicio)],
+        }
+
+    def gravar(self, caminho, **contexto):
+        """Grava o relatório em JSON (e o perfil em <caminho sem extensão>.prof, se ativo); retorna os arquivos."""
+        arquivos = []
+        if self.perfil is not None:
+            arquivo_perfil = os.path.splitext(caminho)[0] + ".prof"
+            self.perfil.dump_stats(arquivo_perfil)
+            contexto["perfil"] = arquivo_perfil
+            arquivos.append(arquivo_perfil)
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.relatorio(**contexto), f, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+        return [caminho] + arquivos
+
+
+def linhas_tempos(relatorio):
+    """Linhas de texto com o tempo de cada etapa de um relatório."""
+    linhas = ["Tempo por etapa:"]
+    for registro in relatorio["etapas"]:
+        texto = f"- {ETAPAS.get(registro['etapa'], registro['etapa'])}: {registro['segundos']:.3f}s"
+        texto += f" (CPU {registro['cpu_s']:.3f}s)"
+        if registro["linhas_por_s"]:
+            texto += f" | {registro['linhas_por_s']} linhas/s"
+        if registro["tracemalloc_pico_mb"] is not None:
+            texto += f" | pico {registro['tracemalloc_pico_mb']:.1f} MB"
+        linhas.append(texto)
+    pico = f" | pico de RSS {relatorio['rss_pico_mb']:.0f} MB" if relatorio["rss_pico_mb"] is not None else ""
+    linhas.append(f"Total: {relatorio['segundos']:.2f}s (CPU {relatorio['cpu_s']:.2f}s){pico}")
+    return linhas
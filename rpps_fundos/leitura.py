@@ -0,0 +1,459 @@
+import html
+import posixpath
+import re
+import zipfile
+from datetime import date
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+# === TIPOS SUPORTADOS ===
+# data    -> datetime64[ns] (NaT quando vazio ou inválido)
+# codigo  -> int8 (CODIGO_AUSENTE quando vazio, não numérico ou fora da faixa do int8)
+# valor   -> float64 (NaN quando vazio)
+# inteiro -> int64 (INTEIRO_AUSENTE quando vazio; CPF/matrícula formatados viram dígitos)
+# texto   -> object com str (None quando vazio)
+# objeto  -> object com o valor bruto da célula, como no pd.read_excel (NaN quando vazio)
+CODIGO_AUSENTE = -1
+INTEIRO_AUSENTE = -1
+TIPOS = ("data", "codigo", "valor", "inteiro", "texto", "objeto")
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PACOTE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+TAMANHO_LEITURA = 1 << 22  # bytes descomprimidos por bloco de XML
+CAPACIDADE_INICIAL = 1 << 16
+
+# r= é opcional nas linhas e células (ECMA-376): sem ele, a posição segue a da anterior + 1
+RE_LINHA = re.compile(rb'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+RE_CELULA = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+RE_REF_LINHA = re.compile(rb'\br="(\d+)"')
+RE_REF_CELULA = re.compile(rb'\br="([A-Z]+)(\d+)"')
+RE_SEM_REF = re.compile(rb'<(?:row|c)[ >/](?!r=")')  # r= fora da primeira posição também cai na leitura posicional
+RE_DADO = re.compile(rb"<(?:v|is)>")
+RE_TIPO = re.compile(rb'\bt="(\w+)"')
+RE_VALOR = re.compile(rb"<v>(.*?)</v>", re.S)
+RE_TEXTO = re.compile(rb"<t\b[^>]*>(.*?)</t>", re.S)
+RE_DIMENSAO = re.compile(rb'<dimension\s+ref="[A-Z]*\d*:?[A-Z]*(\d+)"')
+RE_DATA_BR = re.compile(r"^\s*(\d{1,2})/(\d{1,2})/(\d{4})")
+RE_DATA_ISO = re.compile(r"^\s*(\d{4})-(\d{1,2})-(\d{1,2})")
+RE_NAO_DIGITO = re.compile(r"\D")
+
+MS_POR_DIA = 86_400_000
+DIAS_1900_1904 = 1462  # diferença entre as origens 30/12/1899 e 01/01/1904
+LIMITE_MS_NS = np.iinfo(np.int64).max // 1_000_000  # faixa representável em datetime64[ns]
+
+
+# === ESTRUTURA DO ARQUIVO .XLSX ===
+def listar_abas(caminho):
+    with zipfile.ZipFile(caminho) as z:
+        raiz = ET.fromstring(z.read("xl/workbook.xml"))
+    return [aba.get("name") for aba in raiz.iter(f"{NS}sheet")]
+
+
+def _membro_da_aba(z, aba):
+    raiz = ET.fromstring(z.read("xl/workbook.xml"))
+    id_rel = next((s.get(f"{NS_REL}id") for s in raiz.iter(f"{NS}sheet") if s.get("name") == aba), None)
+    if id_rel is None:
+        raise ValueError(f"Aba '{aba}' não encontrada no arquivo.")
+
+    pr = raiz.find(f"{NS}workbookPr")
+    data_1904 = pr is not None and pr.get("date1904") in ("1", "true")
+
+    rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+    alvo = next(r.get("Target") for r in rels.iter(f"{NS_PACOTE}Relationship") if r.get("Id") == id_rel)
+    membro = alvo.lstrip("/") if alvo.startswith("/") else posixpath.normpath(posixpath.join("xl", alvo))
+    return membro, data_1904
+
+
+def _textos_compartilhados(z):
+    if "xl/sharedStrings.xml" not in z.namelist():
+        return []
+    textos = []
+    with z.open("xl/sharedStrings.xml") as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag != f"{NS}si":
+                continue
+            # Ignora textos fonéticos (rPh); concatena trechos formatados (r/t)
+            partes = [elem.find(f"{NS}t")] + [r.find(f"{NS}t") for r in elem.iterfind(f"{NS}r")]
+            textos.append("".join(p.text or "" for p in partes if p is not None))
+            elem.clear()
+    return textos
+
+
+def _blocos_xml(z, membro):
+    # Entrega o XML da aba em blocos que terminam sempre em </row>
+    with z.open(membro) as f:
+        resto = b""
+        while True:
+            dados = f.read(TAMANHO_LEITURA)
+            if not dados:
+                if resto:
+                    yield resto
+                return
+            dados = resto + dados
+            corte = dados.rfind(b"</row>")
+            if corte < 0:
+                resto = dados
+                continue
+            corte += len(b"</row>")
+            yield dados[:corte]
+            resto = dados[corte:]
+
+
+# === CONVERSÃO DE CÉLULAS ===
+def _valor_celula(atributos, conteudo, textos):
+    """Retorna o valor Python da célula (float, str, bool) ou None."""
+    if not conteudo:
+        return None
+    m = RE_TIPO.search(atributos)
+    tipo = m.group(1) if m else b"n"
+
+    if tipo == b"inlineStr":
+        return html.unescape(b"".join(RE_TEXTO.findall(conteudo)).decode("utf-8"))
+    v = RE_VALOR.search(conteudo)
+    if v is None:
+        return None
+    bruto = v.group(1)
+    if tipo == b"s":
+        return textos[int(bruto)]
+    if tipo in (b"str", b"d"):
+        return html.unescape(bruto.decode("utf-8"))
+    if tipo == b"b":
+        return bruto == b"1"
+    if tipo == b"e":
+        return None
+    return float(bruto)
+
+
+def _serial_de_texto(texto):
+    m = RE_DATA_BR.match(texto)
+    if m:
+        dia, mes, ano = (int(g) for g in m.groups())
+    else:
+        m = RE_DATA_ISO.match(texto)
+        if not m:
+            return np.nan
+        ano, mes, dia = (int(g) for g in m.groups())
+    try:
+        return float(date(ano, mes, dia).toordinal() - date(1899, 12, 30).toordinal())
+    except ValueError:
+        return np.nan
+
+
+def _para_numero(valor):
+    if isinstance(valor, str):
+        try:
+            return float(valor.strip().replace(",", "."))
+        except ValueError:
+            return None
+    if isinstance(valor, bool):
+        return float(valor)
+    return valor
+
+
+def _gravar_data(buffer, i, valor):
+    # Buffer guarda o serial no sistema 1900 (dias desde 30/12/1899)
+    if isinstance(valor, float):
+        # Excel considera 1900 bissexto: seriais antes de 01/03/1900 estão adiantados um dia
+        buffer[i] = valor + 1 if 0 < valor < 60 else valor
+    elif isinstance(valor, str):
+        buffer[i] = _serial_de_texto(valor)
+
+
+def _gravar_data_1904(buffer, i, valor):
+    if isinstance(valor, float):
+        buffer[i] = valor + DIAS_1900_1904
+    elif isinstance(valor, str):
+        buffer[i] = _serial_de_texto(valor)
+
+
+def _gravar_codigo(buffer, i, valor):
+    numero = _para_numero(valor)
+    if numero is not None and numero == numero and -128 <= numero <= 127:
+        buffer[i] = int(numero)
+
+
+def _gravar_valor(buffer, i, valor):
+    numero = _para_numero(valor)
+    if numero is not None:
+        buffer[i] = numero
+
+
+def _gravar_inteiro(buffer, i, valor):
+    if isinstance(valor, float):
+        if valor == valor:
+            buffer[i] = int(valor)
+    elif isinstance(valor, str):
+        digitos = RE_NAO_DIGITO.sub("", valor)
+        if digitos and len(digitos) < 19:
+            buffer[i] = int(digitos)
+
+
+def _valor_pandas(valor):
+    # Mesmo tratamento do openpyxl: números inteiros viram int
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _gravar_texto(buffer, i, valor):
+    if valor is not None:
+        buffer[i] = valor if isinstance(valor, str) else str(_valor_pandas(valor))
+
+
+def _gravar_objeto(buffer, i, valor):
+    if valor is not None:
+        buffer[i] = _valor_pandas(valor)
+
+
+GRAVADORES = {
+    "data": _gravar_data, "codigo": _gravar_codigo, "valor": _gravar_valor,
+    "inteiro": _gravar_inteiro, "texto": _gravar_texto, "objeto": _gravar_objeto,
+}
+
+
+def _novo_buffer(tipo, n):
+    if tipo in ("data", "valor"):
+        return np.full(n, np.nan, dtype=np.float64)
+    if tipo == "codigo":
+        return np.full(n, CODIGO_AUSENTE, dtype=np.int8)
+    if tipo == "inteiro":
+        return np.full(n, INTEIRO_AUSENTE, dtype=np.int64)
+    if tipo == "texto":
+        return np.full(n, None, dtype=object)
+    return np.full(n, np.nan, dtype=object)
+
+
+def _seriais_para_datas(seriais):
+    base = np.datetime64("1899-12-30", "ms").astype(np.int64)
+    validos = np.isfinite(seriais)
+    ms = np.zeros(len(seriais), dtype=np.int64)
+    ms[validos] = base + np.round(seriais[validos] * MS_POR_DIA).astype(np.int64)
+    validos &= np.abs(ms) < LIMITE_MS_NS
+
+    ns = np.full(len(seriais), np.iinfo(np.int64).min, dtype=np.int64)  # NaT
+    ns[validos] = ms[validos] * 1_000_000
+    return ns.view("datetime64[ns]")
+
+
+def _montar_quadro(buffers, colunas, n):
+    dados = {}
+    for nome, tipo in colunas.items():
+        buffer = buffers[nome][:n]
+        dados[nome] = _seriais_para_datas(buffer) if tipo == "data" else buffer
+    return pd.DataFrame(dados)
+
+
+# === POSIÇÃO DAS LINHAS E CÉLULAS ===
+def _indice_coluna(letra):
+    indice = 0
+    for caractere in letra:
+        indice = indice * 26 + caractere - 64
+    return indice
+
+
+def _letra_coluna(indice):
+    letra = b""
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letra = bytes((65 + resto,)) + letra
+    return letra
+
+
+def _numero_linha(atributos, anterior):
+    ref = RE_REF_LINHA.search(atributos)
+    return int(ref.group(1)) if ref else anterior + 1
+
+
+def _celulas_da_linha(conteudo):
+    """(atributos, letra, conteudo) de cada célula da linha; sem r=, a coluna é a da anterior + 1."""
+    celulas = []
+    coluna = 0
+    for atributos, valor in RE_CELULA.findall(conteudo or b""):
+        ref = RE_REF_CELULA.search(atributos)
+        coluna = _indice_coluna(ref.group(1)) if ref else coluna + 1
+        celulas.append((atributos, ref.group(1) if ref else _letra_coluna(coluna), valor))
+    return celulas
+
+
+def _celulas_posicionais(bloco, linha, letras):
+    """Células das colunas pedidas num bloco com linhas ou células sem r= (numeradas pela posição).
+
+    Retorna (células no formato de re_celulas.findall, última linha do bloco, última linha com valor).
+    """
+    celulas = []
+    com_valor = None
+    for atributos, conteudo in RE_LINHA.findall(bloco):
+        linha = _numero_linha(atributos, linha)
+        if conteudo and RE_DADO.search(conteudo):
+            com_valor = linha
+        for atributos_celula, letra, valor in _celulas_da_linha(conteudo):
+            if letra in letras:
+                celulas.append((atributos_celula, letra, linha, b"", valor))
+    return celulas, linha, com_valor
+
+
+def _ultimas_linhas(bloco):
+    """(última linha do bloco, última linha com algum valor em qualquer coluna), pelos r= das linhas."""
+    ultima = com_valor = None
+    fim = len(bloco)
+    while com_valor is None:
+        inicio = bloco.rfind(b"<row", 0, fim)
+        if inicio < 0:
+            break
+        m = RE_LINHA.match(bloco, inicio)
+        if m is not None and m.end() <= fim:
+            linha = _numero_linha(m.group(1), 0)
+            ultima = linha if ultima is None else ultima
+            if m.group(2) and RE_DADO.search(m.group(2)):
+                com_valor = linha
+        fim = inicio
+    return ultima, com_valor
+
+
+# === LEITURA EM STREAMING ===
+def _localizar_colunas(cabecalho, colunas, aliases, opcionais=()):
+    por_nome = {}
+    for letra, nome in cabecalho.items():
+        por_nome.setdefault(aliases.get(nome, nome), letra)
+    faltantes = [c for c in colunas if c not in por_nome and c not in opcionais]
+    if faltantes:
+        raise ValueError(f"Colunas não encontradas na aba: {faltantes}")
+    return {por_nome[nome]: nome for nome in colunas if nome in por_nome}
+
+
+def _ler_primeira_linha(bloco, textos):
+    """(número da linha, {letra: nome}, fim no bloco) da primeira linha da aba, ou None se o bloco não tiver linhas."""
+    primeira = RE_LINHA.search(bloco)
+    if primeira is None:
+        return None
+    cabecalho = {}
+    for atributos, letra, conteudo in _celulas_da_linha(primeira.group(2)):
+        valor = _valor_celula(atributos, conteudo, textos)
+        if valor is not None:
+            cabecalho[letra.decode()] = str(_valor_pandas(valor))
+    return _numero_linha(primeira.group(1), 0), cabecalho, primeira.end()
+
+
+def ler_cabecalho(caminho, aba, aliases=None):
+    """Nomes das colunas (primeira linha da aba), já com os aliases aplicados."""
+    aliases = aliases or {}
+    with zipfile.ZipFile(caminho) as z:
+        membro, _ = _membro_da_aba(z, aba)
+        textos = _textos_compartilhados(z)
+        for bloco in _blocos_xml(z, membro):
+            primeira = _ler_primeira_linha(bloco, textos)
+            if primeira is not None:
+                return [aliases.get(nome, nome) for nome in primeira[1].values()]
+    return []
+
+
+def _ampliar(buffers, colunas, capacidade):
+    for nome in buffers:
+        novo = _novo_buffer(colunas[nome], capacidade)
+        novo[:len(buffers[nome])] = buffers[nome]
+        buffers[nome] = novo
+
+
+def iterar_blocos(caminho, aba, colunas, tamanho_bloco=None, aliases=None, opcionais=()):
+    """Lê apenas as colunas pedidas ({nome: tipo}), entregando DataFrames de até tamanho_bloco linhas.
+
+    Como no pd.read_excel, a aba vai até a última linha com algum valor em qualquer coluna (mesmo
+    que as colunas pedidas estejam vazias nela); linhas vazias no meio são mantidas. Colunas em
+    opcionais que não existirem na aba ficam fora dos blocos, em vez de gerar erro.
+    """
+    for nome, tipo in colunas.items():
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo '{tipo}' inválido para a coluna {nome}. Use um de {TIPOS}.")
+    aliases = aliases or {}
+
+    with zipfile.ZipFile(caminho) as z:
+        membro, data_1904 = _membro_da_aba(z, aba)
+        textos = _textos_compartilhados(z)
+
+        letras = None
+        inicio = 0  # número da primeira linha de dados (base 1, como no Excel)
+        linha = 0  # última linha lida (numera as linhas sem r=)
+        ultima_com_valor = 0
+        capacidade = tamanho_bloco or CAPACIDADE_INICIAL
+        buffers = {}
+        gravadores = {}
+        deslocamento = 0  # linha de dados correspondente à posição 0 dos buffers
+
+        for bloco in _blocos_xml(z, membro):
+            if letras is None:
+                m_dim = RE_DIMENSAO.search(bloco)
+                primeira = _ler_primeira_linha(bloco, textos)
+                if primeira is None:
+                    continue
+                linha, cabecalho, fim_cabecalho = primeira
+                letras = _localizar_colunas(cabecalho, colunas, aliases, opcionais)
+                colunas = {nome: tipo for nome, tipo in colunas.items() if nome in letras.values()}
+                inicio, ultima_com_valor = linha + 1, linha
+                if tamanho_bloco is None and m_dim:
+                    capacidade = max(int(m_dim.group(1)) - inicio + 1, 1)
+                buffers = {nome: _novo_buffer(colunas[nome], capacidade) for nome in colunas}
+                por_tipo = dict(GRAVADORES, data=_gravar_data_1904) if data_1904 else GRAVADORES
+                gravadores = {letra.encode(): (por_tipo[colunas[nome]], nome) for letra, nome in letras.items()}
+                re_celulas = re.compile(
+                    rb'<c\b([^>]*?)\br="(' + b"|".join(gravadores) + rb')(\d+)"([^>]*?)(?:/>|>(.*?)</c>)', re.S
+                )
+                bloco = bloco[fim_cabecalho:]
+
+            if RE_SEM_REF.search(bloco):
+                celulas, linha, com_valor = _celulas_posicionais(bloco, linha, gravadores)
+            else:
+                celulas = re_celulas.findall(bloco)
+                ultima, com_valor = _ultimas_linhas(bloco)
+                linha = linha if ultima is None else ultima
+            if com_valor is not None:
+                ultima_com_valor = max(ultima_com_valor, com_valor)
+
+            for atr_a, letra, numero, atr_b, conteudo in celulas:
+                i = int(numero) - inicio - deslocamento
+                if i < 0:
+                    continue
+                if i >= capacidade:
+                    if tamanho_bloco:
+                        # Bloco completo: entrega e recomeça com buffers novos
+                        while i >= capacidade:
+                            yield _montar_quadro(buffers, colunas, capacidade).set_axis(
+                                pd.RangeIndex(deslocamento, deslocamento + capacidade))
+                            deslocamento += capacidade
+                            i -= capacidade
+                            buffers = {nome: _novo_buffer(colunas[nome], capacidade) for nome in colunas}
+                    else:
+                        while i >= capacidade:
+                            capacidade *= 2
+                        _ampliar(buffers, colunas, capacidade)
+                valor = _valor_celula(atr_a + atr_b, conteudo, textos)
+                if valor is None:
+                    continue
+                gravar, nome = gravadores[letra]
+                gravar(buffers[nome], i, valor)
+
+        if letras is None:
+            yield pd.DataFrame({nome: _novo_buffer(tipo, 0) for nome, tipo in colunas.items()})
+            return
+        # Linhas finais sem valor nas colunas pedidas (mas com valor em outras) também entram
+        restantes = ultima_com_valor - inicio + 1 - deslocamento
+        while tamanho_bloco and restantes > capacidade:
+            yield _montar_quadro(buffers, colunas, capacidade).set_axis(
+                pd.RangeIndex(deslocamento, deslocamento + capacidade))
+            deslocamento += capacidade
+            restantes -= capacidade
+            buffers = {nome: _novo_buffer(colunas[nome], capacidade) for nome in colunas}
+        if restantes > capacidade:
+            _ampliar(buffers, colunas, restantes)
+        if restantes > 0 or deslocamento == 0:
+            n = max(restantes, 0)
+            yield _montar_quadro(buffers, colunas, n).set_axis(
+                pd.RangeIndex(deslocamento, deslocamento + n))
+
+
+def ler_colunas(caminho, aba, colunas, aliases=None, opcionais=()):
+    """Lê a aba inteira, restrita às colunas pedidas, em buffers NumPy tipados."""
+    return next(iterar_blocos(caminho, aba, colunas, aliases=aliases, opcionais=opcionais))
@@ -0,0 +1,154 @@
+import json
+import os
+import queue
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+from rpps_fundos.incremental import processar_incremental
+from rpps_fundos.indice_cpf import cruzar_bases
+from rpps_fundos.pipeline import PASTA_DADOS, PASTA_RESULTADOS, POPULACOES, processar
+
+# === CONFIGURAÇÕES ===
+INTERVALO = 1.0  # segundos entre varreduras de dados/
+ESPERA = 2.0  # segundos com tamanho e mtime estáveis antes de processar (arquivo ainda sendo copiado)
+TENTATIVAS_ZIP = 5  # zip ainda incompleto após 5 esperas: arquivo corrompido, não cópia em andamento
+ARQUIVO_HISTORICO = "monitor.jsonl"  # resultados/monitor.jsonl: uma linha por execução concluída
+
+
+def populacao_do_arquivo(nome):
+    """População cujo termo aparece no nome do .xlsx (como selecionar_arquivo), ou None."""
+    nome = nome.lower()
+    if not nome.endswith(".xlsx") or nome.startswith(("~$", ".")):  # ~$: arquivo de trava do Excel
+        return None
+    return next((populacao for populacao, config in POPULACOES.items() if config["termo"] in nome), None)
+
+
+def _xlsx_completo(caminho):
+    # Cópia parcial não tem o diretório central do zip no final
+    try:
+        with zipfile.ZipFile(caminho) as z:
+            return "xl/workbook.xml" in z.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+# === MONITOR ===
+class Monitor:
+    """Vigia dados/ por varredura periódica e processa cada extrato novo ou alterado no próprio processo.
+
+        monitor = Monitor()
+        threading.Thread(target=monitor.executar, daemon=True).start()
+        execucao = monitor.concluidas.get()  # {"populacao", "arquivo", "segundos", "saidas", "erro", ...}
+
+    Um arquivo só é processado depois de ficar `espera` segundos com o mesmo tamanho e mtime e
+    com o zip completo. Cada execução concluída entra na fila `concluidas` e em
+    resultados/monitor.jsonl; ao reiniciar, os arquivos já registrados ali (mesmo tamanho e
+    mtime) não são reprocessados. Com as três populações processadas, refaz o cruzamento de CPF.
+    """
+
+    def __init__(self, pasta_dados=PASTA_DADOS, pasta_resultados=PASTA_RESULTADOS, intervalo=INTERVALO,
+                 espera=ESPERA, formatos=("xlsx",), apenas_incompativeis=False, incremental=False,
+                 cruzamento=True):
+        self.pasta_dados = pasta_dados
+        self.pasta_resultados = pasta_resultados
+        self.intervalo = intervalo
+        self.espera = espera
+        self.formatos = formatos
+        self.apenas_incompativeis = apenas_incompativeis
+        self.incremental = incremental
+        self.cruzamento = cruzamento
+        self.concluidas = queue.Queue()
+        self.historico = os.path.join(pasta_resultados, ARQUIVO_HISTORICO)
+        self._parar = threading.Event()
+        self._observados = {}  # caminho -> (assinatura, desde quando está estável)
+        self._processados = self._carregar_processados()
+        self._chaves = {}  # população -> chaves de CPF da última execução (cruzamento)
+
+    def _carregar_processados(self):
+        processados = {}
+        if os.path.exists(self.historico):
+            with open(self.historico, encoding="utf-8") as f:
+                for linha in f:
+                    registro = json.loads(linha)
+                    processados[registro["arquivo"]] = (registro["tamanho"], registro["mtime_ns"])
+        return processados
+
+    # === VARREDURA ===
+    def pendentes(self, agora=None):
+        """Arquivos (caminho, população, assinatura) novos ou alterados e já estáveis, do mais antigo ao mais novo."""
+        agora = time.monotonic() if agora is None else agora
+        if not os.path.isdir(self.pasta_dados):
+            return []
+        prontos = []
+        vistos = set()
+        with os.scandir(self.pasta_dados) as entradas:
+            for entrada in entradas:
+                populacao = populacao_do_arquivo(entrada.name)
+                if populacao is None or not entrada.is_file():
+                    continue
+                caminho = os.path.abspath(entrada.path)
+                info = entrada.stat()
+                assinatura = (info.st_size, info.st_mtime_ns)
+                vistos.add(caminho)
+                if self._processados.get(caminho) == assinatura:
+                    continue
+                anterior = self._observados.get(caminho)
+                if anterior is None or anterior[0] != assinatura:
+                    self._observados[caminho] = (assinatura, agora)
+                elif agora - anterior[1] >= self.espera and (
+                        _xlsx_completo(caminho) or agora - anterior[1] >= self.espera * TENTATIVAS_ZIP):
+                    # Zip incompleto e parado há muito tempo: processa e registra o erro de leitura
+                    prontos.append((caminho, populacao, assinatura))
+        for caminho in set(self._observados) - vistos:  # arquivo removido ou renomeado
+            del self._observados[caminho]
+        return sorted(prontos, key=lambda pronto: pronto[2][1])
+
+    # === PROCESSAMENTO ===
+    def processar(self, caminho, populacao, assinatura):
+        """Roda o pipeline da população sobre o arquivo; registra e devolve a execução."""
+        executar_populacao = processar_incremental if self.incremental else processar
+        inicio = time.perf_counter()
+        registro = {"data": datetime.now().isoformat(timespec="seconds"), "populacao": populacao,
+                    "arquivo": caminho, "tamanho": assinatura[0], "mtime_ns": assinatura[1]}
+        try:
+            resultado = executar_populacao(populacao, caminho, pasta_resultados=self.pasta_resultados,
+                                           formatos=self.formatos, apenas_incompativeis=self.apenas_incompativeis)
+        except Exception as erro:  # noqa: BLE001 - o monitor segue vigiando; o erro vai para o registro
+            registro.update(segundos=round(time.perf_counter() - inicio, 3), saidas=[], erro=str(erro))
+        else:
+            self._chaves[populacao] = resultado.pop("chaves")
+            saidas = resultado["saidas"]
+            if self.cruzamento and len(self._chaves) == len(POPULACOES):
+                saidas = saidas + cruzar_bases(self._chaves, self.pasta_resultados)["saidas"]
+            registro.update(segundos=round(time.perf_counter() - inicio, 3), saidas=saidas, erro=None,
+                            resumo=resultado["resumo"])
+
+        self._processados[caminho] = assinatura
+        self._observados.pop(caminho, None)
+        self._registrar(registro)
+        self.concluidas.put(registro)
+        return registro
+
+    def _registrar(self, registro):
+        os.makedirs(self.pasta_resultados, exist_ok=True)
+        linha = {chave: valor for chave, valor in registro.items() if chave != "resumo"}
+        with open(self.historico, "a", encoding="utf-8") as f:
+            f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+
+    def varrer(self):
+        """Uma varredura: processa o que estiver pronto; retorna as execuções concluídas."""
+        return [self.processar(*pronto) for pronto in self.pendentes()]
+
+    def executar(self, ate_vazio=False):
+        """Varre dados/ a cada `intervalo` segundos até parar(); com ate_vazio, para quando nada estiver pendente."""
+        self._parar.clear()
+        while not self._parar.is_set():
+            self.varrer()
+            if ate_vazio and not self._observados:
+                break
+            self._parar.wait(self.intervalo)
+
+    def parar(self):
+        self._parar.set()
@@ -0,0 +1,561 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from rpps_fundos import classificacao, cpf, validacao
+from rpps_fundos.cache import ler_aba, listar_abas
+from rpps_fundos.classificacao import (
+    COMPATIVEL, FUNDO_INDEFINIDO, INCOMPATIVEL, ROTULOS_CENARIO, ROTULOS_COMPATIBILIDADE,
+)
+from rpps_fundos.cubo import gravar_cubo, mes_do_arquivo
+from rpps_fundos.escrita import escrever, executar_em_segundo_plano
+from rpps_fundos.historico import gravar_historico
+from rpps_fundos.esquema import compactar, decodificar, medir_memoria, relatorio_memoria, restaurar_inteiros
+from rpps_fundos.indice_cpf import extrair_chaves
+from rpps_fundos.instrumentacao import Instrumentacao, linhas_tempos
+from rpps_fundos.validacao import CONTRIBUICAO_MAXIMA, CONTRIBUICAO_MINIMA, resumo_validacao
+from rpps_fundos.vocabularios import (
+    vocab_fundo, vocab_fundo_pensionista, vocab_prev_comp, vocab_situacao_funcional, vocab_tipo_aposentadoria,
+)
+
+# === CONFIGURAÇÕES DINÂMICAS ===
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_DADOS = os.path.join(RAIZ, "dados")
+PASTA_RESULTADOS = os.path.join(RAIZ, "resultados")
+
+# === DATAS DE CORTE ===
+DATA_CORTE_ENTE = datetime(2018, 12, 27)
+DATA_CORTE_NASC = datetime(1957, 2, 28)
+
+# === SELEÇÃO DE ARQUIVO E ABA ===
+def selecionar_arquivo(termo, pasta_dados=PASTA_DADOS, mes=None):
+    """Arquivo .xlsx mais recente (mtime) com o termo no nome; com mes (ex.: 2025_10), só desse mês."""
+    if not os.path.exists(pasta_dados):
+        raise FileNotFoundError(f"Pasta de dados não encontrada: {pasta_dados}")
+
+    arquivos = [f for f in os.listdir(pasta_dados) if termo in f.lower() and f.lower().endswith(".xlsx")]
+    if mes:
+        variantes = {mes, mes.replace("-", "_"), mes.replace("_", "-")}
+        arquivos = [f for f in arquivos if any(v in f for v in variantes)]
+    if not arquivos:
+        complemento = f" do mês {mes}" if mes else ""
+        raise FileNotFoundError(f"Nenhum arquivo contendo '{termo}'{complemento} encontrado na pasta de dados.")
+
+    # Ordenar por data de modificação e pegar o mais recente
+    arquivos.sort(key=lambda f: os.path.getmtime(os.path.join(pasta_dados, f)), reverse=True)
+    return os.path.join(pasta_dados, arquivos[0])
+
+
+def selecionar_aba(arquivo, termo):
+    abas = listar_abas(arquivo)
+    return next((aba for aba in abas if termo in aba.lower()), abas[0])
+
+
+def escrever_resumo(resumo, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        for linha in resumo:
+            f.write(linha + "\n")
+
+
+# === SERVIDORES ===
+COLUNAS_SERVIDOR = {
+    'ID_SERVIDOR_MATRICULA': 'inteiro', 'ID_SERVIDOR_CPF': 'inteiro', 'CO_TIPO_FUNDO': 'codigo',
+    'NO_ORGAO': 'texto', 'CO_SITUACAO_FUNCIONAL': 'codigo', 'VL_CONTRIBUICAO': 'valor',
+    'DT_ING_ENTE': 'data', 'DT_NASC_SERVIDOR': 'data', 'IN_PREV_COMP': 'codigo',
+    'VL_BASE_CALCULO': 'valor', 'VL_TETO_ESPECIFICO': 'valor'
+}
+SAIDA_SERVIDOR = [
+    'ID_SERVIDOR_MATRICULA', 'ID_SERVIDOR_CPF', 'CO_TIPO_FUNDO', 'NO_ORGAO',
+    'CO_SITUACAO_FUNCIONAL', 'VL_CONTRIBUICAO', 'DT_ING_ENTE', 'DT_NASC_SERVIDOR',
+    'IN_PREV_COMP', 'CPF_DUPLICADO', 'CPF_INVALIDO', 'CALCULO_FUNDO', 'COMPATIBILIDADE_FUNDO', 'CENARIO_FUNDO',
+    'VALIDACAO'
+]
+
+
+# A classificação tem três etapas: preparar (base inteira), regras (linha a linha, gera
+# CALCULO_FUNDO e COMPATIBILIDADE_FUNDO) e completar (base inteira: duplicidade e cenários).
+# O modo incremental aplica as regras apenas às linhas novas ou alteradas.
+def _preparar_ativos(df, coluna_nasc):
+    # === CONVERSÃO DE DATAS ===
+    df['DT_ING_ENTE'] = pd.to_datetime(df['DT_ING_ENTE'], errors='coerce')
+    df[coluna_nasc] = pd.to_datetime(df[coluna_nasc], errors='coerce')
+    return df
+
+
+def _regras_ativos(df, coluna_nasc):
+    # === CLASSIFICAÇÃO DO FUNDO E COMPATIBILIDADE (CÓDIGOS INT8) ===
+    calculo = classificacao.calcular_fundo(
+        df['DT_ING_ENTE'], df[coluna_nasc], df['IN_PREV_COMP'], DATA_CORTE_ENTE, DATA_CORTE_NASC
+    )
+    return calculo, classificacao.calcular_compatibilidade(df['CO_TIPO_FUNDO'], calculo)
+
+
+def _completar_ativos(df, coluna_cpf, coluna_situacao):
+    # === CPF INVÁLIDO, DUPLICIDADE DE CPF (SOBRE O CPF NORMALIZADO EM INT64) E CENÁRIOS ===
+    cpfs = cpf.normalizar(df[coluna_cpf])
+    df['CPF_INVALIDO'] = ~cpf.validar(cpfs)
+    df['CPF_DUPLICADO'] = cpf.duplicados(cpfs)
+    df['CENARIO_FUNDO'] = classificacao.calcular_cenario(
+        df['COMPATIBILIDADE_FUNDO'].to_numpy(), df['CPF_DUPLICADO'], df[coluna_situacao]
+    )
+    return df
+
+
+def _validacao_ativos(coluna_nasc, coluna_codigo, vocab_codigo):
+    # === REGRAS DE QUALIDADE (UM BIT POR REGRA NA COLUNA VALIDACAO, VER validacao.py) ===
+    return [
+        validacao.data_invalida('DT_ING_ENTE'),
+        validacao.data_invalida(coluna_nasc),
+        validacao.data_posterior(coluna_nasc, 'DT_ING_ENTE', "nascimento_apos_ingresso",
+                                 "Nascimento posterior ao ingresso no ente"),
+        validacao.idade_menor('DT_ING_ENTE', coluna_nasc, 18, "ingresso_menor_18",
+                              "Ingresso no ente com menos de 18 anos"),
+        validacao.acima('VL_CONTRIBUICAO', CONTRIBUICAO_MAXIMA, "contribuicao_acima_teto",
+                        "VL_CONTRIBUICAO acima de 14% do teto remuneratório"),
+        validacao.fora_do_vocabulario('CO_TIPO_FUNDO', vocab_fundo),
+        validacao.fora_do_vocabulario(coluna_codigo, vocab_codigo),
+        validacao.fora_do_vocabulario('IN_PREV_COMP', vocab_prev_comp),
+    ]
+
+
+def _classificar(df, preparar, regras, completar):
+    df = preparar(df)
+    df['CALCULO_FUNDO'], df['COMPATIBILIDADE_FUNDO'] = regras(df)
+    return completar(df)
+
+
+# Servidores ativos contribuem sobre a remuneração inteira: contribuição abaixo de 14% do mínimo é suspeita
+VALIDACAO_SERVIDOR = _validacao_ativos('DT_NASC_SERVIDOR', 'CO_SITUACAO_FUNCIONAL', vocab_situacao_funcional) + [
+    validacao.abaixo('VL_CONTRIBUICAO', CONTRIBUICAO_MINIMA, "contribuicao_abaixo_minimo",
+                     "VL_CONTRIBUICAO abaixo de 14% do salário mínimo"),
+    validacao.acima('VL_BASE_CALCULO', 'VL_TETO_ESPECIFICO', "base_calculo_acima_teto_especifico",
+                    "VL_BASE_CALCULO acima do VL_TETO_ESPECIFICO"),
+]
+
+
+def preparar_servidores(df):
+    return _preparar_ativos(df, 'DT_NASC_SERVIDOR')
+
+
+def regras_servidores(df):
+    return _regras_ativos(df, 'DT_NASC_SERVIDOR')
+
+
+def completar_servidores(df):
+    return _completar_ativos(df, 'ID_SERVIDOR_CPF', 'CO_SITUACAO_FUNCIONAL')
+
+
+def classificar_servidores(df):
+    return _classificar(df, preparar_servidores, regras_servidores, completar_servidores)
+
+
+def saida_servidores(df):
+    # === MAPEAR PARA DESCRIÇÕES ===
+    saida = restaurar_inteiros(df[SAIDA_SERVIDOR].copy(), COLUNAS_SERVIDOR)
+    saida['CO_TIPO_FUNDO'] = decodificar(saida['CO_TIPO_FUNDO'], vocab_fundo)
+    saida['CO_SITUACAO_FUNCIONAL'] = decodificar(saida['CO_SITUACAO_FUNCIONAL'], vocab_situacao_funcional)
+    saida['IN_PREV_COMP'] = decodificar(saida['IN_PREV_COMP'], vocab_prev_comp)
+    saida['CALCULO_FUNDO'] = decodificar(saida['CALCULO_FUNDO'], vocab_fundo)
+    saida['COMPATIBILIDADE_FUNDO'] = decodificar(saida['COMPATIBILIDADE_FUNDO'], ROTULOS_COMPATIBILIDADE)
+    saida['CENARIO_FUNDO'] = decodificar(saida['CENARIO_FUNDO'], ROTULOS_CENARIO)
+    return saida
+
+
+def resumo_servidores(df):
+    total = len(df)
+    compat = (df['COMPATIBILIDADE_FUNDO'] == COMPATIVEL).sum()
+    incompat = (df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL).sum()
+    cpf_duplicados = df['CPF_DUPLICADO'].sum()
+    incomp_df = df[df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL]
+    cenarios = incomp_df['CENARIO_FUNDO'].value_counts()
+    vl_total_incomp = incomp_df['VL_CONTRIBUICAO'].sum()
+    nulos_contrib = df['VL_CONTRIBUICAO'].isna().sum()
+
+    resumo = [
+        f"1. Total de linhas: {total}\n",
+        f"2. CPF_DUPLICADO \n2.1 - verdadeiro: {cpf_duplicados}\n",
+        f"3. Fundos Compatíveis: {compat} ({compat/total:.2%})\n",
+        f"4. Fundos Incompatíveis: {incompat} ({incompat/total:.2%})"
+    ]
+
+    for i, (fundo, count) in enumerate(incomp_df['CO_TIPO_FUNDO'].map(vocab_fundo).value_counts().items(), start=1):
+        resumo.append(f"4.1.{i} - Incompatíveis no fundo {fundo}: {count}")
+
+    resumo.append("\n5. Incompatíveis por NO_ORGAO:")
+    # NO_ORGAO é categórico; como object, os empates seguem a ordem de aparição na base
+    for i, (orgao, count) in enumerate(incomp_df['NO_ORGAO'].astype(object).value_counts().head(3).items(), start=1):
+        resumo.append(f"5.{i} - {orgao}: {count}")
+
+    resumo.append("\n6 - Cenarios de incompatibilidade:")
+    for i, (codigo, cenario) in enumerate(ROTULOS_CENARIO.items(), start=1):
+        resumo.append(f"6.{i} - {cenario}: {cenarios.get(codigo, 0)}")
+
+    resumo.append(f"\n7. VL_CONTRIBUICAO \n7.1 - nulo ou vazio: {nulos_contrib}")
+    resumo.append(f"\n8. Valor total VL_CONTRIBUICAO \n8.1 - incompatível: {vl_total_incomp:.2f}")
+    return resumo
+
+
+# === APOSENTADOS ===
+COLUNAS_APOSENTADO = {
+    'ID_APOSENTADO_MATRICULA': 'inteiro', 'ID_APOSENTADO_CPF': 'inteiro', 'CO_TIPO_FUNDO': 'codigo',
+    'NO_ORGAO': 'texto', 'CO_TIPO_APOSENTADORIA': 'codigo', 'VL_APOSENTADORIA': 'valor',
+    'VL_CONTRIBUICAO': 'valor', 'DT_ING_ENTE': 'data', 'DT_NASC_APOSENTADO': 'data', 'IN_PREV_COMP': 'codigo',
+    'VL_TETO_ESPECIFICO': 'valor'
+}
+SAIDA_APOSENTADO = [
+    'ID_APOSENTADO_MATRICULA', 'ID_APOSENTADO_CPF', 'CO_TIPO_FUNDO', 'NO_ORGAO',
+    'CO_TIPO_APOSENTADORIA', 'VL_APOSENTADORIA', 'VL_CONTRIBUICAO', 'DT_ING_ENTE',
+    'DT_NASC_APOSENTADO', 'IN_PREV_COMP', 'CPF_DUPLICADO', 'CPF_INVALIDO', 'CALCULO_FUNDO',
+    'COMPATIBILIDADE_FUNDO', 'CENARIO_FUNDO', 'VALIDACAO'
+]
+
+
+# Aposentados contribuem só sobre o que excede o teto do RGPS: sem limite mínimo
+VALIDACAO_APOSENTADO = _validacao_ativos('DT_NASC_APOSENTADO', 'CO_TIPO_APOSENTADORIA', vocab_tipo_aposentadoria) + [
+    validacao.acima('VL_APOSENTADORIA', 'VL_TETO_ESPECIFICO', "aposentadoria_acima_teto_especifico",
+                    "VL_APOSENTADORIA acima do VL_TETO_ESPECIFICO"),
+]
+
+
+def preparar_aposentados(df):
+    return _preparar_ativos(df, 'DT_NASC_APOSENTADO')
+
+
+def regras_aposentados(df):
+    return _regras_ativos(df, 'DT_NASC_APOSENTADO')
+
+
+def completar_aposentados(df):
+    return _completar_ativos(df, 'ID_APOSENTADO_CPF', 'CO_TIPO_APOSENTADORIA')
+
+
+def classificar_aposentados(df):
+    return _classificar(df, preparar_aposentados, regras_aposentados, completar_aposentados)
+
+
+def saida_aposentados(df):
+    # === MAPEAR PARA DESCRIÇÕES ===
+    saida = restaurar_inteiros(df[SAIDA_APOSENTADO].copy(), COLUNAS_APOSENTADO)
+    saida['CO_TIPO_FUNDO'] = decodificar(saida['CO_TIPO_FUNDO'], vocab_fundo)
+    saida['IN_PREV_COMP'] = decodificar(saida['IN_PREV_COMP'], vocab_prev_comp)
+    saida['CALCULO_FUNDO'] = decodificar(saida['CALCULO_FUNDO'], vocab_fundo)
+    saida['COMPATIBILIDADE_FUNDO'] = decodificar(saida['COMPATIBILIDADE_FUNDO'], ROTULOS_COMPATIBILIDADE)
+    saida['CENARIO_FUNDO'] = decodificar(saida['CENARIO_FUNDO'], ROTULOS_CENARIO)
+    saida['CO_TIPO_APOSENTADORIA'] = decodificar(saida['CO_TIPO_APOSENTADORIA'], vocab_tipo_aposentadoria)
+    return saida
+
+
+def resumo_aposentados(df):
+    total = len(df)
+    compat = (df['COMPATIBILIDADE_FUNDO'] == COMPATIVEL).sum()
+    incompat = (df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL).sum()
+    cpf_duplicados = df['CPF_DUPLICADO'].sum()
+    incomp_df = df[df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL]
+    cenarios = incomp_df['CENARIO_FUNDO'].value_counts()
+    vl_total_incomp = incomp_df['VL_CONTRIBUICAO'].sum()
+
+    resumo = [
+        f"1. Total de linhas: {total}\n",
+        f"2. Fundos Compatíveis: {compat} ({compat/total:.2%})\n",
+        f"3. Fundos Incompatíveis: {incompat} ({incompat/total:.2%})"
+    ]
+
+    for i, (fundo, count) in enumerate(incomp_df['CO_TIPO_FUNDO'].map(vocab_fundo).value_counts().items(), start=1):
+        resumo.append(f"3.1.{i} - Incompatíveis no fundo {fundo}: {count}")
+
+    resumo.append("\n4. Incompatíveis por NO_ORGAO:")
+    for i, (orgao, count) in enumerate(incomp_df['NO_ORGAO'].astype(object).value_counts().head(3).items(), start=1):
+        resumo.append(f"4.{i} - {orgao}: {count}")
+
+    resumo.append("\n5 - Cenários de incompatibilidade:")
+    for i, (codigo, cenario) in enumerate(ROTULOS_CENARIO.items(), start=1):
+        resumo.append(f"5.{i} - {cenario}: {cenarios.get(codigo, 0)}")
+
+    resumo.append(f"\n6. Valor total VL_CONTRIBUICAO incompatível: {vl_total_incomp:.2f}")
+    resumo.append(f"\n7. CPF_DUPLICADO verdadeiro: {cpf_duplicados}")
+    return resumo
+
+
+# === PENSIONISTAS ===
+# CO_TIPO_FUNDO pode vir como código (1/2) ou texto (FUNPREV/FUNFIN): mantido como objeto
+COLUNAS_PENSIONISTA = {
+    'ID_INSTITUIDOR_MATRICULA': 'inteiro', 'ID_INSTITUIDOR_CPF': 'inteiro', 'NO_ORGAO': 'texto',
+    'CO_TIPO_FUNDO': 'objeto', 'DT_NASC_INSTITUIDOR': 'data', 'ID_PENSIONISTA_MATRICULA': 'objeto',
+    'ID_PENSIONISTA_CPF': 'inteiro', 'VL_CONTRIBUICAO': 'valor', 'VL_BENEF_PENSAO': 'valor',
+    'VL_TETO_ESPECIFICO': 'valor'
+}
+SAIDA_PENSIONISTA = [
+    'ID_INSTITUIDOR_MATRICULA', 'ID_INSTITUIDOR_CPF', 'NO_ORGAO', 'CO_TIPO_FUNDO',
+    'DT_NASC_INSTITUIDOR', 'ID_PENSIONISTA_MATRICULA', 'ID_PENSIONISTA_CPF',
+    'VL_CONTRIBUICAO', 'CPF_DUPLICADO', 'CPF_INVALIDO', 'CALCULO_FUNDO', 'COMPATIBILIDADE_FUNDO', 'VALIDACAO'
+]
+
+
+VALIDACAO_PENSIONISTA = [
+    validacao.data_invalida('DT_NASC_INSTITUIDOR'),
+    validacao.acima('VL_CONTRIBUICAO', CONTRIBUICAO_MAXIMA, "contribuicao_acima_teto",
+                    "VL_CONTRIBUICAO acima de 14% do teto remuneratório"),
+    validacao.fora_do_vocabulario('CO_TIPO_FUNDO', vocab_fundo_pensionista),
+    validacao.acima('VL_BENEF_PENSAO', 'VL_TETO_ESPECIFICO', "beneficio_acima_teto_especifico",
+                    "VL_BENEF_PENSAO acima do VL_TETO_ESPECIFICO"),
+]
+
+
+def preparar_pensionistas(df):
+    # === CONVERSÃO DE DATAS ===
+    df['DT_NASC_INSTITUIDOR'] = pd.to_datetime(df['DT_NASC_INSTITUIDOR'], errors='coerce')
+
+    # === PADRONIZAR CO_TIPO_FUNDO ===
+    df['CO_TIPO_FUNDO'] = classificacao.codigos(df['CO_TIPO_FUNDO'].replace({"FUNPREV": 1, "FUNFIN": 2}))
+    return df
+
+
+def regras_pensionistas(df):
+    # === CALCULO_FUNDO E COMPATIBILIDADE (CÓDIGOS INT8) ===
+    # FUNPREV se DT_NASC_INSTITUIDOR <= corte ou data nula/erro; compatível se informado FUNPREV
+    resultado = classificacao.classificar_pensionistas(df['DT_NASC_INSTITUIDOR'], df['CO_TIPO_FUNDO'], DATA_CORTE_NASC)
+    return resultado.calculo, resultado.compatibilidade
+
+
+def completar_pensionistas(df):
+    # === CPF INVÁLIDO (INSTITUIDOR OU PENSIONISTA) ===
+    validos = cpf.validar(cpf.normalizar(df['ID_INSTITUIDOR_CPF'])) & cpf.validar(cpf.normalizar(df['ID_PENSIONISTA_CPF']))
+    df['CPF_INVALIDO'] = ~validos
+
+    # === DUPLICIDADE DE CPF DO INSTITUIDOR (APENAS ENTRE OS REGISTROS ANALISADOS) ===
+    # Registros com CALCULO_FUNDO = Null ficam no quadro (índice de CPF entre bases), fora da análise
+    analisados = analisados_pensionistas(df)
+    df['CPF_DUPLICADO'] = False
+    df.loc[analisados.index, 'CPF_DUPLICADO'] = cpf.duplicados(cpf.normalizar(analisados['ID_INSTITUIDOR_CPF']))
+    return df
+
+
+def classificar_pensionistas(df):
+    return _classificar(df, preparar_pensionistas, regras_pensionistas, completar_pensionistas)
+
+
+def analisados_pensionistas(df):
+    # === EXCLUIR REGISTROS COM CALCULO_FUNDO = Null ===
+    return df[df['CALCULO_FUNDO'] != FUNDO_INDEFINIDO]
+
+
+def rotular_pensionistas(df):
+    # === MAPEAR CÓDIGOS PARA TEXTO ===
+    saida = restaurar_inteiros(df[SAIDA_PENSIONISTA].copy(), COLUNAS_PENSIONISTA)
+    saida['CO_TIPO_FUNDO'] = decodificar(saida['CO_TIPO_FUNDO'], vocab_fundo_pensionista)
+    saida['CALCULO_FUNDO'] = decodificar(saida['CALCULO_FUNDO'], vocab_fundo_pensionista)
+    saida['COMPATIBILIDADE_FUNDO'] = decodificar(saida['COMPATIBILIDADE_FUNDO'], ROTULOS_COMPATIBILIDADE)
+    return saida
+
+
+def saida_pensionistas(df):
+    # === FILTRAR INCOMPATÍVEIS ===
+    df = analisados_pensionistas(df)
+    return rotular_pensionistas(df[df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL])
+
+
+def resumo_pensionistas(df):
+    df = analisados_pensionistas(df)
+    df_incomp = df[df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL]
+    total = len(df)
+    incompat = len(df_incomp)
+    compat = total - incompat
+    cpf_duplicados = df['CPF_DUPLICADO'].sum()
+
+    resumo = [
+        f"1. Total analisados (FUNPREV): {total}",
+        f"2. Compatíveis: {compat} ({compat/total:.2%})",
+        f"3. Incompatíveis: {incompat} ({incompat/total:.2%})",
+        f"4. CPF duplicados: {cpf_duplicados}",
+        "\n5. Top 5 órgãos com incompatíveis:"
+    ]
+
+    for i, (orgao, count) in enumerate(df_incomp['NO_ORGAO'].astype(object).value_counts().head(5).items(), start=1):
+        resumo.append(f"5.{i} - {orgao}: {count}")
+    return resumo
+
+
+# === REGISTRO DAS POPULAÇÕES ===
+# chave: colunas que identificam o registro entre meses; campos: entradas das regras (modo incremental)
+# arquivo_saida / arquivo_incompativeis: nome das saídas sem extensão (uma por formato, ver escrita.py)
+# arquivo_execucao: relatório de tempo e memória por etapa (ver instrumentacao.py)
+# validacao: regras de qualidade avaliadas após a classificação (coluna VALIDACAO e arquivo_validacao)
+# opcionais: colunas usadas só pela validação; ausentes na aba, as regras delas ficam como não avaliadas
+POPULACOES = {
+    "servidor": {
+        "termo": "servidor", "prefixo": "SERVIDOR", "colunas": COLUNAS_SERVIDOR, "aliases": {},
+        "classificar": classificar_servidores, "saida": saida_servidores, "resumo": resumo_servidores,
+        "preparar": preparar_servidores, "regras": regras_servidores, "completar": completar_servidores,
+        "rotular": saida_servidores, "analisados": None,
+        "chave": ['ID_SERVIDOR_MATRICULA'],
+        "campos": ['DT_ING_ENTE', 'DT_NASC_SERVIDOR', 'IN_PREV_COMP', 'CO_TIPO_FUNDO'],
+        "arquivo_saida": "SERVIDOR_resultado", "arquivo_incompativeis": "SERVIDOR_incompativeis",
+        "arquivo_txt": "SERVIDOR_resumo_analise.txt", "arquivo_execucao": "SERVIDOR_execucao.json",
+        "validacao": VALIDACAO_SERVIDOR, "opcionais": ['VL_BASE_CALCULO', 'VL_TETO_ESPECIFICO'], "arquivo_validacao": "SERVIDOR_validacao.txt",
+    },
+    "aposentado": {
+        "termo": "aposentado", "prefixo": "APOSENTADOS", "colunas": COLUNAS_APOSENTADO,
+        "aliases": {"DATA DE INGRESSO NO ENTE": "DT_ING_ENTE"},
+        "classificar": classificar_aposentados, "saida": saida_aposentados, "resumo": resumo_aposentados,
+        "preparar": preparar_aposentados, "regras": regras_aposentados, "completar": completar_aposentados,
+        "rotular": saida_aposentados, "analisados": None,
+        "chave": ['ID_APOSENTADO_MATRICULA'],
+        "campos": ['DT_ING_ENTE', 'DT_NASC_APOSENTADO', 'IN_PREV_COMP', 'CO_TIPO_FUNDO'],
+        "arquivo_saida": "APOSENTADOS_resultado", "arquivo_incompativeis": "APOSENTADOS_incompativeis",
+        "arquivo_txt": "APOSENTADOS_resumo_analise.txt", "arquivo_execucao": "APOSENTADOS_execucao.json",
+        "validacao": VALIDACAO_APOSENTADO, "opcionais": ['VL_TETO_ESPECIFICO'], "arquivo_validacao": "APOSENTADOS_validacao.txt",
+    },
+    "pensionista": {
+        "termo": "pensionista", "prefixo": "PENSIONISTAS", "colunas": COLUNAS_PENSIONISTA, "aliases": {},
+        "classificar": classificar_pensionistas, "saida": saida_pensionistas, "resumo": resumo_pensionistas,
+        "preparar": preparar_pensionistas, "regras": regras_pensionistas, "completar": completar_pensionistas,
+        "rotular": rotular_pensionistas, "analisados": analisados_pensionistas,
+        "chave": ['ID_INSTITUIDOR_MATRICULA', 'ID_PENSIONISTA_MATRICULA'],
+        "campos": ['DT_NASC_INSTITUIDOR', 'CO_TIPO_FUNDO'],
+        "arquivo_saida": "PENSIONISTAS_incompativeis", "arquivo_incompativeis": "PENSIONISTAS_incompativeis",
+        "arquivo_txt": "PENSIONISTAS_resumo_analise.txt", "arquivo_execucao": "PENSIONISTAS_execucao.json",
+        "validacao": VALIDACAO_PENSIONISTA, "opcionais": ['VL_BENEF_PENSAO', 'VL_TETO_ESPECIFICO'], "arquivo_validacao": "PENSIONISTAS_validacao.txt",
+    },
+}
+
+
+# === EXECUÇÃO DE UMA POPULAÇÃO ===
+def ler(populacao, arquivo=None, pasta_dados=PASTA_DADOS, mes=None):
+    """Seleciona o arquivo e lê as colunas usadas por uma população; retorna (df, arquivo, aba)."""
+    config = POPULACOES[populacao]
+    if arquivo is None:
+        arquivo = selecionar_arquivo(config["termo"], pasta_dados, mes)
+    aba = selecionar_aba(arquivo, config["termo"])
+    df = ler_aba(arquivo, aba, colunas=config["colunas"], aliases=config["aliases"], opcionais=config["opcionais"])
+    return df, arquivo, aba
+
+
+def carregar(populacao, arquivo=None, pasta_dados=PASTA_DADOS, mes=None):
+    """Seleciona, lê e classifica uma população; retorna (df classificado, arquivo, aba)."""
+    config = POPULACOES[populacao]
+    df, arquivo, aba = ler(populacao, arquivo, pasta_dados, mes)
+    return config["classificar"](compactar(df, config["colunas"])), arquivo, aba
+
+
+def classificar(populacao, df, instrumentacao=None):
+    """Como config["classificar"], medindo preparar, regras e completar como etapas separadas.
+
+    Ao final, avalia as regras de qualidade da população (coluna VALIDACAO).
+    """
+    config = POPULACOES[populacao]
+    instrumentacao = instrumentacao or Instrumentacao(populacao)
+    with instrumentacao.etapa("datas", len(df)):
+        df = config["preparar"](df)
+    with instrumentacao.etapa("classificacao", len(df)):
+        df['CALCULO_FUNDO'], df['COMPATIBILIDADE_FUNDO'] = config["regras"](df)
+    with instrumentacao.etapa("duplicidade_cenarios", len(df)):
+        df = config["completar"](df)
+    return validar(populacao, df, instrumentacao)
+
+
+def validar(populacao, df, instrumentacao=None):
+    """Grava em VALIDACAO a máscara das regras de qualidade violadas por linha (ver validacao.py)."""
+    instrumentacao = instrumentacao or Instrumentacao(populacao)
+    with instrumentacao.etapa("validacao", len(df)):
+        df['VALIDACAO'] = validacao.validar(df, POPULACOES[populacao]["validacao"]).mascara
+    return df
+
+
+def _escrever_medindo(instrumentacao, saida, caminho_base, formatos):
+    with instrumentacao.etapa("escrita", len(saida)):
+        return escrever(saida, caminho_base, formatos)
+
+
+def gravar_resultados(populacao, df, pasta_resultados=PASTA_RESULTADOS, formatos=("xlsx",), apenas_incompativeis=False,
+                      instrumentacao=None, mes=None):
+    """Grava as saídas (um arquivo por formato) e o resumo de uma população classificada.
+
+    Com apenas_incompativeis, só os registros incompatíveis são rotulados e gravados. Com mes
+    (AAAA_MM), grava também o cubo de agregados do mês (ver cubo.py) e carrega os registros no
+    histórico SQLite (ver historico.py), sempre da base inteira. A gravação roda em segundo plano
+    enquanto o resumo, o cubo e o histórico são calculados. Retorna (resumo, arquivos).
+    """
+    config = POPULACOES[populacao]
+    instrumentacao = instrumentacao or Instrumentacao(populacao)
+    os.makedirs(pasta_resultados, exist_ok=True)
+
+    with instrumentacao.etapa("rotulos") as etapa:
+        if apenas_incompativeis:
+            saida = config["saida"](df[df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL])
+            nome = config["arquivo_incompativeis"]
+        else:
+            saida = config["saida"](df)
+            nome = config["arquivo_saida"]
+        etapa.linhas = len(saida)
+    gravacao = executar_em_segundo_plano(
+        _escrever_medindo, instrumentacao, saida, os.path.join(pasta_resultados, nome), formatos
+    )
+
+    arquivo_txt = os.path.join(pasta_resultados, config["arquivo_txt"])
+    with instrumentacao.etapa("resumo", len(df)):
+        resumo = config["resumo"](df)
+        escrever_resumo(resumo, arquivo_txt)
+    arquivos = [arquivo_txt]
+    if 'VALIDACAO' in df:
+        arquivo_validacao = os.path.join(pasta_resultados, config["arquivo_validacao"])
+        escrever_resumo(resumo_validacao(df, config["validacao"]), arquivo_validacao)
+        arquivos.append(arquivo_validacao)
+    if mes is not None:
+        with instrumentacao.etapa("cubo", len(df)):
+            arquivos.append(gravar_cubo(populacao, df, mes, pasta_resultados))
+        with instrumentacao.etapa("historico", len(df)):
+            arquivos.append(gravar_historico(populacao, df, mes, pasta_resultados))
+    return resumo, gravacao.result() + arquivos
+
+
+def gravar_execucao(populacao, instrumentacao, pasta_resultados=PASTA_RESULTADOS, **contexto):
+    """Grava o relatório de execução ({PREFIXO}_execucao.json, e o .prof com perfil); retorna (relatório, arquivos)."""
+    caminho = os.path.join(pasta_resultados, POPULACOES[populacao]["arquivo_execucao"])
+    arquivos = instrumentacao.gravar(caminho, **contexto)
+    return instrumentacao.relatorio(**contexto), arquivos
+
+
+def processar(populacao, arquivo=None, pasta_dados=PASTA_DADOS, pasta_resultados=PASTA_RESULTADOS, mes=None,
+              formatos=("xlsx",), apenas_incompativeis=False, rastrear_alocacoes=False, perfil=False):
+    """Lê, classifica e grava os resultados de uma população; retorna o resumo e os arquivos gerados.
+
+    O tempo, a CPU, as linhas e a memória de cada etapa vão para {PREFIXO}_execucao.json, ao lado
+    do resumo (ver instrumentacao.py); com perfil, o cProfile da execução vai para {PREFIXO}_execucao.prof.
+    O cubo de agregados vai para cubo/{populacao}_{AAAA_MM}.arrow e os registros para historico.sqlite,
+    com o mês informado ou o do arquivo.
+    """
+    config = POPULACOES[populacao]
+    with Instrumentacao(populacao, rastrear_alocacoes, perfil) as instrumentacao:
+        with instrumentacao.etapa("leitura") as etapa:
+            df, arquivo, aba = ler(populacao, arquivo, pasta_dados, mes)
+            etapa.linhas = len(df)
+        antes = medir_memoria(df)
+        with instrumentacao.etapa("compactacao", len(df)):
+            df = compactar(df, config["colunas"])
+        df = classificar(populacao, df, instrumentacao)
+        resumo, saidas = gravar_resultados(populacao, df, pasta_resultados, formatos, apenas_incompativeis,
+                                           instrumentacao, mes_do_arquivo(arquivo, mes))
+    execucao, arquivos = gravar_execucao(populacao, instrumentacao, pasta_resultados, arquivo=arquivo, aba=aba,
+                                         linhas=len(df), modo="completo")
+
+    return {
+        "populacao": populacao, "arquivo": arquivo, "aba": aba,
+        "resumo": resumo, "saidas": saidas + arquivos, "memoria": relatorio_memoria(antes, medir_memoria(df)),
+        "execucao": execucao,
+        "chaves": extrair_chaves(populacao, df),  # CPFs e fundos para o cruzamento entre bases
+    }
+
+
+def imprimir_resultado(resultado, memoria=False, tempos=False):
+    print(f"Arquivo selecionado: {resultado['arquivo']}")
+    print(f"Aba selecionada: {resultado['aba']}")
+    if memoria and resultado.get("memoria"):
+        print("\n".join(resultado["memoria"]) + "\n")
+    if tempos and resultado.get("execucao"):
+        print("\n".join(linhas_tempos(resultado["execucao"])) + "\n")
+    print("\n".join(resultado["resumo"]))
+    if resultado.get("delta"):
+        print("\n" + "\n".join(resultado["delta"]))
+    saidas = "\n".join(f"- {caminho}" for caminho in resultado["saidas"])
+    print(f"\nAnálise concluída. Arquivos salvos em:\n{saidas}")
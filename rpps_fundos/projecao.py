@@ -0,0 +1,258 @@
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.classificacao import FUNFIN, INCOMPATIVEL
+from rpps_fundos.cubo import mes_do_arquivo, normalizar_mes
+from rpps_fundos.escrita import escrever_xlsx
+from rpps_fundos.esquema import decodificar, restaurar_inteiros
+from rpps_fundos.indice_cpf import CHAVES_POPULACAO
+from rpps_fundos.pipeline import PASTA_DADOS, PASTA_RESULTADOS, carregar, escrever_resumo
+from rpps_fundos.validacao import ALIQUOTA_CONTRIBUICAO
+from rpps_fundos.vocabularios import vocab_fundo
+
+# === CONFIGURAÇÕES ===
+FIM_HORIZONTE = "2029_04"  # última competência das contribuições extraordinárias (Decreto 64.144/2025)
+POPULACOES_PROJECAO = ("servidor", "aposentado")  # pensões não geram contribuição patronal
+ARQUIVO_PROJECAO = "FUNFIN_projecao.xlsx"
+ARQUIVO_PROJECAO_TXT = "FUNFIN_projecao_resumo.txt"
+
+# Base sobre a qual a alíquota extraordinária incide, a partir de VL_CONTRIBUICAO:
+#   remuneracao  -> base de contribuição estimada (VL_CONTRIBUICAO / 14%)
+#   contribuicao -> a própria contribuição do segurado
+BASES = {"remuneracao": 1 / ALIQUOTA_CONTRIBUICAO, "contribuicao": 1.0}
+# Aposentados contribuem só sobre o que excede o teto do RGPS: VL_CONTRIBUICAO / 14% não é o provento
+BASES_POPULACAO = {"servidor": ("remuneracao", "contribuicao"), "aposentado": ("contribuicao",)}
+BASE_PADRAO = {"servidor": "remuneracao", "aposentado": "contribuicao"}
+
+# Medidas projetadas (soma dos fluxos dos registros de cada grupo):
+#   FUNFIN_CALCULADO -> registros com CALCULO_FUNDO = FUNFIN (o que o decreto manda recolher)
+#   FUNFIN_INFORMADO -> registros com CO_TIPO_FUNDO = FUNFIN (o que a folha recolheria hoje)
+#   RISCO_A_MENOR    -> incompatíveis calculados FUNFIN e informados em outro fundo
+#   RISCO_A_MAIOR    -> incompatíveis informados FUNFIN e calculados em outro fundo (ou indefinidos)
+#   EM_RISCO         -> RISCO_A_MENOR + RISCO_A_MAIOR
+MEDIDAS = ['FUNFIN_CALCULADO', 'FUNFIN_INFORMADO', 'RISCO_A_MENOR', 'RISCO_A_MAIOR', 'EM_RISCO']
+
+# linhas: posições no quadro classificado dos registros projetados (calculados ou informados FUNFIN)
+# fluxos: matriz registros × meses com a contribuição extraordinária de cada registro em cada mês
+# pesos: matriz registros × MEDIDAS (1.0 se o registro entra na medida)
+Projecao = namedtuple("Projecao", ["populacao", "meses", "aliquotas", "linhas", "fluxos", "pesos"])
+
+
+# === HORIZONTE E CRONOGRAMAS ===
+def _mes(mes):
+    return np.datetime64(normalizar_mes(mes).replace("_", "-"), "M")
+
+
+def rotulos_meses(meses):
+    return [str(mes).replace("-", "_") for mes in meses]
+
+
+def horizonte(inicio, fim=FIM_HORIZONTE):
+    """Meses (datetime64[M]) de inicio a fim, inclusive."""
+    meses = np.arange(_mes(inicio), _mes(fim) + 1)
+    if not len(meses):
+        raise ValueError(f"Horizonte vazio: {inicio} a {fim}.")
+    return meses
+
+
+def mes_seguinte(mes):
+    return rotulos_meses([_mes(mes) + 1])[0]
+
+
+def escalonar(cronograma, meses):
+    """Valor vigente em cada mês de um cronograma em degraus {mes_inicial: valor}; 0 antes do primeiro."""
+    if not cronograma:
+        return np.zeros(len(meses))
+    inicios = np.array([_mes(mes) for mes in cronograma], dtype="datetime64[M]")
+    valores = np.fromiter(cronograma.values(), dtype=np.float64)
+    ordem = np.argsort(inicios)
+    degrau = np.searchsorted(inicios[ordem], meses, side="right") - 1
+    return np.where(degrau >= 0, valores[ordem][np.maximum(degrau, 0)], 0.0)
+
+
+def fator_reajuste(reajustes, meses):
+    """Fator acumulado da base em cada mês: produto de (1 + percentual) dos reajustes já vigentes."""
+    if not reajustes:
+        return np.ones(len(meses))
+    inicios = np.array([_mes(mes) for mes in reajustes], dtype="datetime64[M]")
+    ordem = np.argsort(inicios)
+    acumulado = np.concatenate([[1.0], np.cumprod(1 + np.fromiter(reajustes.values(), dtype=np.float64)[ordem])])
+    return acumulado[np.searchsorted(inicios[ordem], meses, side="right")]
+
+
+# === PROJEÇÃO ===
+def base_da_populacao(populacao, base=None):
+    """Base usada para a população: a informada, se permitida, ou a padrão (BASE_PADRAO)."""
+    base = base or BASE_PADRAO[populacao]
+    if base not in BASES:
+        raise ValueError(f"Base inválida: {base}. Use {list(BASES)}.")
+    if base not in BASES_POPULACAO[populacao]:
+        raise ValueError(f"Base {base} não se aplica a {populacao}. Use {list(BASES_POPULACAO[populacao])}.")
+    return base
+
+
+def projetar(populacao, df, cronograma, meses, base=None, reajustes=None):
+    """Fluxo mês a mês da contribuição extraordinária de cada registro calculado ou informado FUNFIN.
+
+    O fluxo de um registro em um mês é base × alíquota vigente × reajuste acumulado, em uma
+    única multiplicação (registros × meses) sobre os vetores do quadro classificado.
+    Sem base, usa a padrão da população (remuneracao para servidores, contribuicao para aposentados).
+    """
+    base = base_da_populacao(populacao, base)
+    calculado = df['CALCULO_FUNDO'].to_numpy() == FUNFIN
+    informado = np.asarray(df['CO_TIPO_FUNDO']) == FUNFIN
+    linhas = np.flatnonzero(calculado | informado)
+    calculado, informado = calculado[linhas], informado[linhas]
+    incompativel = df['COMPATIBILIDADE_FUNDO'].to_numpy()[linhas] == INCOMPATIVEL
+
+    aliquotas = escalonar(cronograma, meses)
+    bases = np.nan_to_num(df['VL_CONTRIBUICAO'].to_numpy(dtype=np.float64)[linhas]) * BASES[base]
+    fluxos = np.multiply.outer(bases, aliquotas * fator_reajuste(reajustes, meses))
+
+    a_menor = incompativel & calculado
+    a_maior = incompativel & informado & ~calculado
+    pesos = np.column_stack([calculado, informado, a_menor, a_maior, a_menor | a_maior]).astype(np.float64)
+    return Projecao(populacao, meses, aliquotas, linhas, fluxos, pesos)
+
+
+def por_mes(projecao):
+    """Medidas por mês (meses × MEDIDAS)."""
+    tabela = pd.DataFrame(projecao.pesos.T.dot(projecao.fluxos).T, columns=MEDIDAS)
+    tabela.insert(0, 'ALIQUOTA', projecao.aliquotas)
+    tabela.insert(0, 'MES', rotulos_meses(projecao.meses))
+    tabela.insert(0, 'POPULACAO', projecao.populacao)
+    return tabela
+
+
+def por_orgao(projecao, df):
+    """Medidas por órgão: total do horizonte e a matriz órgãos × meses de cada medida (dict)."""
+    orgaos = df['NO_ORGAO'].astype(object).to_numpy()[projecao.linhas]
+    codigos, nomes = pd.factorize(orgaos, sort=True, use_na_sentinel=False)
+    ordem = np.argsort(codigos, kind="stable")
+    inicios = np.searchsorted(codigos[ordem], np.arange(len(nomes)))
+    fluxos = projecao.fluxos[ordem]
+    pesos = projecao.pesos[ordem]
+    # Soma por bloco de linhas consecutivas do mesmo órgão, para cada medida
+    mensal = {medida: np.add.reduceat(fluxos * pesos[:, [j]], inicios, axis=0) if len(fluxos) else
+              np.zeros((0, len(projecao.meses))) for j, medida in enumerate(MEDIDAS)}
+    totais = pd.DataFrame({medida: valores.sum(axis=1) for medida, valores in mensal.items()})
+    totais.insert(0, 'REGISTROS_EM_RISCO', np.bincount(codigos, weights=projecao.pesos[:, -1],
+                                                       minlength=len(nomes)).astype(np.int64))
+    totais.insert(0, 'NO_ORGAO', nomes)
+    totais.insert(0, 'POPULACAO', projecao.populacao)
+    return totais, mensal, nomes
+
+
+def orgaos_mensal(projecao, mensal, nomes, medidas=('FUNFIN_CALCULADO', 'EM_RISCO')):
+    """Formato longo (órgão, mês) das medidas escolhidas, para a aba da planilha."""
+    meses = rotulos_meses(projecao.meses)
+    tabela = pd.DataFrame({
+        'POPULACAO': projecao.populacao,
+        'NO_ORGAO': np.repeat(np.asarray(nomes, dtype=object), len(meses)),
+        'MES': np.tile(meses, len(nomes)),
+    })
+    for medida in medidas:
+        tabela[medida] = mensal[medida].ravel()
+    return tabela
+
+
+def registros_em_risco(projecao, df):
+    """Registros incompatíveis com valor em risco: identificação, fundos e total projetado no horizonte."""
+    em_risco = projecao.pesos[:, -1] > 0
+    linhas = projecao.linhas[em_risco]
+    _, coluna_cpf, coluna_matricula = CHAVES_POPULACAO[projecao.populacao][0]
+    tabela = pd.DataFrame({
+        'POPULACAO': projecao.populacao,
+        'MATRICULA': df[coluna_matricula].to_numpy()[linhas],
+        'CPF': df[coluna_cpf].to_numpy()[linhas],
+        'NO_ORGAO': df['NO_ORGAO'].astype(object).to_numpy()[linhas],
+        'CO_TIPO_FUNDO': decodificar(np.asarray(df['CO_TIPO_FUNDO'])[linhas], vocab_fundo),
+        'CALCULO_FUNDO': decodificar(df['CALCULO_FUNDO'].to_numpy()[linhas], vocab_fundo),
+        'RISCO': np.where(projecao.pesos[em_risco, MEDIDAS.index('RISCO_A_MENOR')] > 0, "a menor", "a maior"),
+        'VL_CONTRIBUICAO': df['VL_CONTRIBUICAO'].to_numpy(dtype=np.float64)[linhas],
+        'TOTAL_PROJETADO': projecao.fluxos[em_risco].sum(axis=1),
+    })
+    tabela = restaurar_inteiros(tabela, {'MATRICULA': 'inteiro', 'CPF': 'inteiro'})  # ausentes ficam vazios
+    return tabela.sort_values('TOTAL_PROJETADO', ascending=False, kind="stable").reset_index(drop=True)
+
+
+# === RELATÓRIO ===
+def _percentual(aliquota):
+    return f"{aliquota:.2%}".replace(".", ",")
+
+
+def resumo_projecao(mensal, orgaos, cronogramas, bases, reajustes):
+    """bases: {populacao: base usada} (ver base_da_populacao)."""
+    meses = mensal['MES'].unique()
+    resumo = [f"1. Horizonte: {meses[0]} a {meses[-1]} ({len(meses)} meses)"]
+    for populacao, cronograma in cronogramas.items():
+        degraus = " | ".join(f"{normalizar_mes(mes)}: {_percentual(aliquota)}"
+                             for mes, aliquota in sorted(cronograma.items(), key=lambda item: _mes(item[0])))
+        resumo.append(f"2. Alíquotas ({populacao}): {degraus}")
+    for populacao, base in bases.items():
+        resumo.append(f"3. Base ({populacao}): {base}" + (f" (VL_CONTRIBUICAO / {_percentual(ALIQUOTA_CONTRIBUICAO)})"
+                                                          if base == "remuneracao" else " (VL_CONTRIBUICAO)"))
+    if reajustes:
+        resumo.append("3.1 - Reajustes da base: " + " | ".join(
+            f"{normalizar_mes(mes)}: {_percentual(percentual)}" for mes, percentual in reajustes.items()))
+
+    for i, (populacao, tabela) in enumerate(mensal.groupby('POPULACAO', sort=False), start=4):
+        totais = tabela[MEDIDAS].sum()
+        resumo += [
+            f"\n{i}. {populacao}",
+            f"{i}.1 - FUNFIN calculado (devido): {totais['FUNFIN_CALCULADO']:.2f}",
+            f"{i}.2 - FUNFIN informado (recolhido hoje): {totais['FUNFIN_INFORMADO']:.2f}",
+            f"{i}.3 - Em risco (incompatíveis): {totais['EM_RISCO']:.2f} "
+            f"(a menor {totais['RISCO_A_MENOR']:.2f} | a maior {totais['RISCO_A_MAIOR']:.2f})",
+        ]
+        risco = orgaos[(orgaos['POPULACAO'] == populacao) & (orgaos['EM_RISCO'] > 0)]
+        for j, linha in enumerate(risco.nlargest(5, 'EM_RISCO').itertuples(index=False), start=1):
+            resumo.append(f"{i}.3.{j} - {linha.NO_ORGAO}: {linha.EM_RISCO:.2f} ({linha.REGISTROS_EM_RISCO} registros)")
+    return resumo
+
+
+# === EXECUÇÃO ===
+def projetar_bases(cronogramas, inicio=None, fim=FIM_HORIZONTE, base=None, reajustes=None,
+                   arquivos=None, pasta_dados=PASTA_DADOS, pasta_resultados=PASTA_RESULTADOS, mes=None):
+    """Classifica servidores e aposentados e projeta as contribuições extraordinárias ao FUNFIN.
+
+    cronogramas: {populacao: {mes_inicial: alíquota}}; só as populações informadas são projetadas.
+    base: a mesma para todas as populações, ou None para a padrão de cada uma (BASE_PADRAO).
+    Sem inicio, o horizonte começa no mês seguinte ao do extrato. Grava FUNFIN_projecao.xlsx
+    (abas mensal, orgaos, orgaos_mensal e em_risco) e o resumo; retorna (resumo, arquivos, tempos),
+    com tempos = {populacao: (segundos da projeção, (registros, meses))}.
+    """
+    invalidas = [populacao for populacao in cronogramas if populacao not in POPULACOES_PROJECAO]
+    if invalidas:
+        raise ValueError(f"Populações inválidas: {invalidas}. Use {list(POPULACOES_PROJECAO)}.")
+    bases = {populacao: base_da_populacao(populacao, base) for populacao in cronogramas}
+    arquivos = arquivos or {}
+    mensal, orgaos, longos, riscos, tempos = [], [], [], [], {}
+    for populacao, cronograma in cronogramas.items():
+        df, arquivo, _ = carregar(populacao, arquivos.get(populacao), pasta_dados, mes)
+        meses = horizonte(inicio or mes_seguinte(mes_do_arquivo(arquivo, mes)), fim)
+        inicio_projecao = time.perf_counter()
+        projecao = projetar(populacao, df, cronograma, meses, bases[populacao], reajustes)
+        mensal.append(por_mes(projecao))
+        totais, matrizes, nomes = por_orgao(projecao, df)
+        tempos[populacao] = (time.perf_counter() - inicio_projecao, projecao.fluxos.shape)
+        orgaos.append(totais)
+        longos.append(orgaos_mensal(projecao, matrizes, nomes))
+        riscos.append(registros_em_risco(projecao, df))
+
+    mensal, orgaos = pd.concat(mensal, ignore_index=True), pd.concat(orgaos, ignore_index=True)
+    orgaos = orgaos.sort_values(['POPULACAO', 'EM_RISCO'], ascending=[True, False], kind="stable")
+    resumo = resumo_projecao(mensal, orgaos, cronogramas, bases, reajustes)
+
+    os.makedirs(pasta_resultados, exist_ok=True)
+    caminho = os.path.join(pasta_resultados, ARQUIVO_PROJECAO)
+    caminho_txt = os.path.join(pasta_resultados, ARQUIVO_PROJECAO_TXT)
+    escrever_xlsx({"mensal": mensal, "orgaos": orgaos.reset_index(drop=True),
+                   "orgaos_mensal": pd.concat(longos, ignore_index=True),
+                   "em_risco": pd.concat(riscos, ignore_index=True)}, caminho)
+    escrever_resumo(resumo, caminho_txt)
+    return resumo, [caminho, caminho_txt], tempos
@@ -0,0 +1,99 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.classificacao import FUNDO_INDEFINIDO, FUNPREV, FUNFIN, codigos, datas
+
+
+# === GRADE DE CORTES ===
+def grade_cortes(cortes_ente, cortes_nasc):
+    """Todos os pares (corte de ingresso, corte de nascimento)."""
+    return list(itertools.product(cortes_ente, cortes_nasc))
+
+
+def _posicoes(valores, cortes, nat_no_fim):
+    # posicao = quantidade de cortes estritamente menores que o valor:
+    #   valor <= cortes[j]  <=>  posicao <= j        valor > cortes[j]  <=>  posicao > j
+    # NaT fica após todos os cortes (nat_no_fim) ou antes de todos
+    posicoes = np.searchsorted(cortes, valores, side="left")
+    posicoes[np.isnat(valores)] = len(cortes) if nat_no_fim else 0
+    return posicoes
+
+
+def _dominancia(pos_ing, pos_nasc, pesos, k, l):
+    """Matriz k x l com a soma dos pesos onde ingresso <= corte_ente[j] e nascimento > corte_nasc[m]."""
+    histograma = np.bincount(pos_ing * (l + 1) + pos_nasc, weights=pesos, minlength=(k + 1) * (l + 1))
+    acumulado = histograma.reshape(k + 1, l + 1).cumsum(axis=0)
+    acumulado = acumulado[:, ::-1].cumsum(axis=1)[:, ::-1]
+    return acumulado[:k, 1:]
+
+
+# === SIMULAÇÃO ===
+def simular_cortes(dt_ing_ente, dt_nasc, prev_comp, fundo_informado, vl_contribuicao, pares):
+    """Contagens e somas de VL_CONTRIBUICAO por par de datas de corte, sem reclassificar linha a linha.
+
+    Para cada par, equivale a rodar classificacao.classificar com esses cortes e agregar:
+    FUNFIN = ingresso <= corte_ente, nascimento > corte_nasc e IN_PREV_COMP = 2;
+    FUNPREV = ingresso > corte_ente, nascimento <= corte_nasc ou IN_PREV_COMP = 1.
+    Indefinido = "não FUNPREV" menos FUNFIN (FUNFIN está contido em "não FUNPREV").
+    """
+    dt_ing_ente = datas(dt_ing_ente).astype("datetime64[ns]")
+    dt_nasc = datas(dt_nasc).astype("datetime64[ns]")
+    prev_comp = codigos(prev_comp)
+    fundo = codigos(fundo_informado)
+    vl = np.nan_to_num(np.asarray(vl_contribuicao, dtype=np.float64))
+
+    pares = [(np.datetime64(ce, "ns"), np.datetime64(cn, "ns")) for ce, cn in pares]
+    cortes_ente = np.unique(np.array([ce for ce, _ in pares], dtype="datetime64[ns]"))
+    cortes_nasc = np.unique(np.array([cn for _, cn in pares], dtype="datetime64[ns]"))
+    k, l = len(cortes_ente), len(cortes_nasc)
+
+    # FUNFIN exige datas válidas: NaT nunca está antes do corte de ingresso nem após o de nascimento
+    ing_ff = _posicoes(dt_ing_ente, cortes_ente, nat_no_fim=True)
+    nasc_ff = _posicoes(dt_nasc, cortes_nasc, nat_no_fim=False)
+    # "Não FUNPREV" = não (ingresso > corte), não (nascimento <= corte) e sem RPC: NaT sempre atende
+    ing_nfp = _posicoes(dt_ing_ente, cortes_ente, nat_no_fim=False)
+    nasc_nfp = _posicoes(dt_nasc, cortes_nasc, nat_no_fim=True)
+
+    sem_rpc = (prev_comp == 2).astype(np.float64)
+    nao_aderiu = (prev_comp != 1).astype(np.float64)
+    informado_ff = (fundo == FUNFIN).astype(np.float64)
+    informado_fp = (fundo == FUNPREV).astype(np.float64)
+    informado_ind = (fundo == FUNDO_INDEFINIDO).astype(np.float64)  # compatível quando o cálculo fica indefinido
+
+    funfin = _dominancia(ing_ff, nasc_ff, sem_rpc, k, l)
+    funfin_compat = _dominancia(ing_ff, nasc_ff, sem_rpc * informado_ff, k, l)
+    vl_funfin = _dominancia(ing_ff, nasc_ff, sem_rpc * vl, k, l)
+    vl_funfin_compat = _dominancia(ing_ff, nasc_ff, sem_rpc * informado_ff * vl, k, l)
+
+    nao_funprev = _dominancia(ing_nfp, nasc_nfp, nao_aderiu, k, l)
+    nao_funprev_inf = _dominancia(ing_nfp, nasc_nfp, nao_aderiu * informado_fp, k, l)
+    vl_nao_funprev = _dominancia(ing_nfp, nasc_nfp, nao_aderiu * vl, k, l)
+    vl_nao_funprev_inf = _dominancia(ing_nfp, nasc_nfp, nao_aderiu * informado_fp * vl, k, l)
+    indefinido_inf = (_dominancia(ing_nfp, nasc_nfp, nao_aderiu * informado_ind, k, l)
+                      - _dominancia(ing_ff, nasc_ff, sem_rpc * informado_ind, k, l))
+    vl_indefinido_inf = (_dominancia(ing_nfp, nasc_nfp, nao_aderiu * informado_ind * vl, k, l)
+                         - _dominancia(ing_ff, nasc_ff, sem_rpc * informado_ind * vl, k, l))
+
+    total = len(fundo)
+    vl_total = vl.sum()
+    funprev = total - nao_funprev
+    vl_funprev = vl_total - vl_nao_funprev
+    compat = funfin_compat + (informado_fp.sum() - nao_funprev_inf) + indefinido_inf
+    vl_compat = vl_funfin_compat + ((informado_fp * vl).sum() - vl_nao_funprev_inf) + vl_indefinido_inf
+
+    j = np.searchsorted(cortes_ente, [ce for ce, _ in pares])
+    m = np.searchsorted(cortes_nasc, [cn for _, cn in pares])
+    return pd.DataFrame({
+        "DATA_CORTE_ENTE": cortes_ente[j],
+        "DATA_CORTE_NASC": cortes_nasc[m],
+        "FUNFIN": funfin[j, m].round().astype(np.int64),
+        "FUNPREV": funprev[j, m].round().astype(np.int64),
+        "INDEFINIDO": (total - funfin[j, m] - funprev[j, m]).round().astype(np.int64),
+        "COMPATIVEIS": compat[j, m].round().astype(np.int64),
+        "INCOMPATIVEIS": (total - compat[j, m]).round().astype(np.int64),
+        "VL_CONTRIBUICAO_FUNFIN": vl_funfin[j, m],
+        "VL_CONTRIBUICAO_FUNPREV": vl_funprev[j, m],
+        "VL_CONTRIBUICAO_INCOMPATIVEL": vl_total - vl_compat[j, m],
+    })
@@ -0,0 +1,264 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from rpps_fundos import classificacao
+from rpps_fundos.cpf import digitos_verificadores
+from rpps_fundos.escrita import escrever, escrever_xlsx
+from rpps_fundos.pipeline import DATA_CORTE_ENTE, DATA_CORTE_NASC, POPULACOES, RAIZ
+
+# === LAYOUT ===
+PADRAO_LAYOUT = os.path.join(RAIZ, "docs", "layout_dicionario_base_de_dados_2021_*.xlsx")
+ABAS_LAYOUT = {"servidor": "SERVIDORES", "aposentado": "APOSENTADOS", "pensionista": "PENSIONISTAS"}
+LIMITE_LINHAS_XLSX = 1_048_575  # linhas de dados em uma aba do Excel (além do cabeçalho)
+
+ORGAOS = {
+    "PREFEITURA DO MUNICIPIO DE SAO PAULO": 0.90,
+    "HOSP SERV PUBLICO MUNICIPAL": 0.04,
+    "TRIBUNAL DE CONTAS DO MUNICIPIO DE SAO PAULO": 0.02,
+    "SERVICO FUNERARIO DO MUNICIPIO DE SAO PAULO": 0.02,
+    "CAMARA MUNICIPAL DE SAO PAULO": 0.015,
+    "INSTITUTO DE PREVIDENCIA MUNICIPAL DE SAO PAULO": 0.005,
+}
+DATA_INVALIDA = "00/00/0000"
+
+# === PERFIS DE DATAS POR POPULAÇÃO ===
+# nascimento: (média, desvio em anos, mínimo, máximo); idade_ingresso: (média, desvio, mínimo, máximo) em anos
+PERFIS = {
+    "servidor": {"nascimento": ("1975-06-30", 10, "1955-01-01", "2006-12-31"), "idade_ingresso": (30, 7, 18, 60)},
+    "aposentado": {"nascimento": ("1955-06-30", 8, "1925-01-01", "1975-12-31"), "idade_ingresso": (28, 6, 18, 55)},
+    "pensionista": {"nascimento": ("1945-06-30", 12, "1915-01-01", "1990-12-31"), "idade_ingresso": (28, 6, 18, 55)},
+}
+
+# Colunas com gerador próprio; as demais do layout recebem valores genéricos pelo tipo
+COLUNAS_NASCIMENTO = {"servidor": "DT_NASC_SERVIDOR", "aposentado": "DT_NASC_APOSENTADO", "pensionista": "DT_NASC_INSTITUIDOR"}
+COLUNAS_INGRESSO = {"servidor": "DT_ING_ENTE", "aposentado": "DATA DE INGRESSO NO ENTE"}
+COLUNAS_SITUACAO = {
+    "servidor": ("CO_SITUACAO_FUNCIONAL", {1: 0.92, 2: 0.02, 3: 0.01, 4: 0.02, 5: 0.01, 8: 0.01, 11: 0.01}),
+    "aposentado": ("CO_TIPO_APOSENTADORIA", {1: 0.25, 2: 0.45, 3: 0.05, 4: 0.10, 5: 0.13, 6: 0.02}),
+}
+
+
+def arquivo_layout(padrao=PADRAO_LAYOUT):
+    arquivos = sorted(glob.glob(padrao))
+    if not arquivos:
+        raise FileNotFoundError(f"Layout não encontrado: {padrao}")
+    return arquivos[-1]
+
+
+def ler_layout(populacao, caminho=None):
+    """Lista (NOME DA VARIÁVEL, TIPO) da aba do dicionário de dados de uma população."""
+    bruto = pd.read_excel(caminho or arquivo_layout(), sheet_name=ABAS_LAYOUT[populacao], header=None)
+    linha, coluna = next(
+        (i, j) for i, j in zip(*np.nonzero(bruto.to_numpy() == "NOME DA VARIÁVEL"))
+    )
+    variaveis = bruto.iloc[linha + 1:, [coluna, coluna + 2]].dropna(subset=[coluna])
+    return [(str(nome).strip(), str(tipo).strip()) for nome, tipo in variaveis.itertuples(index=False)]
+
+
+# === GERADORES ===
+def gerar_cpfs(rng, n):
+    """CPFs distintos com dígitos verificadores válidos (int64)."""
+    bases = np.unique(rng.integers(1_000_000, 999_999_999, int(n * 1.02) + 16))
+    bases = rng.permutation(bases)[:n]
+    dv1, dv2 = digitos_verificadores(bases)
+    return bases * 100 + dv1 * 10 + dv2
+
+
+def duplicar_cpfs(rng, cpfs, taxa):
+    """Copia CPFs entre linhas até que cerca de `taxa` das linhas tenham CPF repetido."""
+    cpfs = cpfs.copy()
+    pares = int(round(len(cpfs) * taxa / 2))
+    if pares:
+        linhas = rng.permutation(len(cpfs))[:2 * pares]
+        cpfs[linhas[pares:]] = cpfs[linhas[:pares]]
+    return cpfs
+
+
+def _datas_normais(rng, n, media, desvio_anos, minimo, maximo):
+    dias = rng.normal(0, desvio_anos * 365.25, n).astype(np.int64)
+    datas = np.datetime64(media, "D") + dias.astype("timedelta64[D]")
+    return np.clip(datas, np.datetime64(minimo, "D"), np.datetime64(maximo, "D"))
+
+
+def _ingressos(rng, nascimentos, idade_ingresso, referencia):
+    media, desvio, minimo, maximo = idade_ingresso
+    idades = np.clip(rng.normal(media, desvio, len(nascimentos)), minimo, maximo)
+    ingressos = nascimentos + (idades * 365.25).astype(np.int64).astype("timedelta64[D]")
+    return np.minimum(ingressos, referencia)
+
+
+def _escolha(rng, n, pesos):
+    valores = np.array(list(pesos))
+    probabilidades = np.array(list(pesos.values()), dtype=np.float64)
+    return valores[rng.choice(len(valores), n, p=probabilidades / probabilidades.sum())]
+
+
+def _valores(rng, n, mediana, dispersao=0.6):
+    return np.round(rng.lognormal(np.log(mediana), dispersao, n), 2)
+
+
+def _generica(rng, nome, tipo, n, datas_padrao):
+    # Colunas do layout que a análise não usa: valores plausíveis pelo prefixo/tipo
+    if tipo == "Data":
+        return _datas_normais(rng, n, *datas_padrao)
+    if nome.startswith("VL_"):
+        return _valores(rng, n, 3000)
+    if nome.startswith(("CO_", "IN_")):
+        return rng.integers(1, 6, n).astype(np.int8)
+    if nome.startswith("NU_"):
+        return rng.integers(0, 5000, n)
+    if tipo == "Caracter" and ("CNPJ" in nome or "PIS" in nome):
+        return rng.integers(10**10, 10**11, n).astype(str).astype(object)
+    if tipo == "Caracter":
+        return np.full(n, nome.split("_")[-1].title(), dtype=object)
+    return rng.integers(0, 100, n)
+
+
+def _informar_fundo(rng, calculo, taxa_incompativel):
+    """CO_TIPO_FUNDO informado: o fundo calculado (9 = Não consta se indefinido), trocado em `taxa_incompativel`."""
+    informado = np.where(calculo == classificacao.FUNDO_INDEFINIDO, 9, calculo).astype(np.int8)
+    trocar = rng.random(len(informado)) < taxa_incompativel
+    alternativas = np.array([1, 2, 9], dtype=np.int8)
+    sorteio = alternativas[rng.integers(0, 3, len(informado))]
+    informado[trocar] = np.where(sorteio[trocar] == informado[trocar], alternativas[0], sorteio[trocar])
+    return informado
+
+
+def gerar(populacao, linhas, semente=0, taxa_cpf_duplicado=0.13, taxa_data_invalida=0.001,
+          taxa_incompativel=0.03, nascimento=None, idade_ingresso=None, referencia="2025-10-31",
+          colunas=None, cpfs=None, layout=None):
+    """Base sintética de uma população, com as colunas do layout do dicionário de dados.
+
+    Datas inválidas ficam como NaT e são listadas em df.attrs["datas_invalidas"]; salvar() grava
+    metade como texto inválido e metade vazia no .xlsx. `colunas` restringe às colunas listadas e
+    `cpfs` fornece CPFs já usados em outra base (cruzamento entre populações).
+    """
+    rng = np.random.default_rng(semente)
+    perfil = PERFIS[populacao]
+    referencia = np.datetime64(referencia, "D")
+    variaveis = [(nome, tipo) for nome, tipo in ler_layout(populacao, layout) if colunas is None or nome in colunas]
+
+    nascimentos = _datas_normais(rng, linhas, *(nascimento or perfil["nascimento"]))
+    ingressos = _ingressos(rng, nascimentos, idade_ingresso or perfil["idade_ingresso"], referencia)
+    cpf = gerar_cpfs(rng, linhas) if cpfs is None else np.asarray(cpfs, dtype=np.int64)[:linhas]
+    cpf = duplicar_cpfs(rng, cpf, taxa_cpf_duplicado)
+
+    # RPC: maioria dos ingressos após o corte adere; antes do corte, poucos
+    apos_corte = ingressos > np.datetime64(DATA_CORTE_ENTE, "D")
+    prev_comp = np.where(rng.random(linhas) < np.where(apos_corte, 0.6, 0.02), 1, 2).astype(np.int8)
+    if populacao == "pensionista":
+        calculo = classificacao.calcular_fundo_pensionista(nascimentos, DATA_CORTE_NASC)
+        calculo = np.where(calculo == classificacao.FUNPREV, classificacao.FUNPREV, classificacao.FUNFIN)
+    else:
+        calculo = classificacao.calcular_fundo(ingressos, nascimentos, prev_comp, DATA_CORTE_ENTE, DATA_CORTE_NASC)
+
+    matricula_inicial = {"servidor": 100_000, "aposentado": 500_000, "pensionista": 800_000}[populacao]
+    especificas = {
+        "NU_ANO": np.full(linhas, int(str(referencia)[:4])),
+        "NU_MES": np.full(linhas, int(str(referencia)[5:7])),
+        "CO_IBGE": np.full(linhas, 3550308),
+        "NO_ENTE": np.full(linhas, "SAO PAULO", dtype=object),
+        "SG_UF": np.full(linhas, "SP", dtype=object),
+        "CO_TIPO_FUNDO": _informar_fundo(rng, calculo, taxa_incompativel),
+        "NO_ORGAO": _escolha(rng, linhas, ORGAOS).astype(object),
+        "IN_PREV_COMP": prev_comp,
+        "VL_CONTRIBUICAO": _valores(rng, linhas, 900),
+        "VL_TETO_ESPECIFICO": np.full(linhas, 39000.0),
+        COLUNAS_NASCIMENTO[populacao]: nascimentos,
+    }
+    if populacao in COLUNAS_INGRESSO:
+        especificas[COLUNAS_INGRESSO[populacao]] = ingressos
+        especificas["DT_ING_SERV_PUB"] = ingressos - rng.integers(0, 3650, linhas).astype("timedelta64[D]")
+    if populacao in COLUNAS_SITUACAO:
+        coluna, pesos = COLUNAS_SITUACAO[populacao]
+        especificas[coluna] = _escolha(rng, linhas, pesos).astype(np.int8)
+    if populacao == "pensionista":
+        especificas["ID_INSTITUIDOR_MATRICULA"] = np.arange(matricula_inicial, matricula_inicial + linhas)
+        especificas["ID_INSTITUIDOR_CPF"] = cpf
+        especificas["ID_PENSIONISTA_MATRICULA"] = np.arange(900_000, 900_000 + linhas)
+        especificas["ID_PENSIONISTA_CPF"] = gerar_cpfs(rng, linhas)
+        especificas["VL_BENEF_PENSAO"] = _valores(rng, linhas, 3500)
+    else:
+        prefixo = "ID_SERVIDOR" if populacao == "servidor" else "ID_APOSENTADO"
+        especificas[f"{prefixo}_MATRICULA"] = np.arange(matricula_inicial, matricula_inicial + linhas)
+        especificas[f"{prefixo}_CPF"] = cpf
+        especificas["VL_APOSENTADORIA"] = _valores(rng, linhas, 5500)
+        especificas["VL_REMUNERACAO"] = _valores(rng, linhas, 7000)
+        especificas["VL_BASE_CALCULO"] = _valores(rng, linhas, 6500)
+
+    datas_padrao = ("2005-01-01", 8, "1970-01-01", str(referencia))
+    df = pd.DataFrame({
+        nome: especificas[nome] if nome in especificas else _generica(rng, nome, tipo, linhas, datas_padrao)
+        for nome, tipo in variaveis
+    })
+
+    # === DATAS INVÁLIDAS ===
+    invalidas = {}
+    for nome, tipo in variaveis:
+        if tipo == "Data":
+            mascara = rng.random(linhas) < taxa_data_invalida
+            df.loc[mascara, nome] = pd.NaT
+            invalidas[nome] = np.flatnonzero(mascara)
+    df.attrs["datas_invalidas"] = invalidas
+    return df
+
+
+# === GRAVAÇÃO ===
+def _para_planilha(df):
+    # No .xlsx, metade das datas inválidas vira texto não reconhecível e metade fica vazia
+    planilha = df.copy()
+    for nome, linhas in df.attrs.get("datas_invalidas", {}).items():
+        texto = linhas[::2]
+        if len(texto):
+            coluna = planilha[nome].astype(object)
+            coluna.iloc[texto] = DATA_INVALIDA
+            planilha[nome] = coluna
+    planilha.attrs = {}
+    return planilha
+
+
+def salvar(df, populacao, pasta, mes="2025_10", formatos=("xlsx",)):
+    """Grava {populacao}_{mes}.{formato} (aba com o nome da população, como nos extratos)."""
+    os.makedirs(pasta, exist_ok=True)
+    base = os.path.join(pasta, f"{POPULACOES[populacao]['termo']}_{mes}")
+    arquivos = []
+    for formato in formatos:
+        if formato == "xlsx":
+            if len(df) > LIMITE_LINHAS_XLSX:
+                raise ValueError(f"{len(df)} linhas excedem o limite de uma aba do Excel ({LIMITE_LINHAS_XLSX}); use parquet.")
+            arquivos.append(escrever_xlsx({POPULACOES[populacao]["prefixo"]: _para_planilha(df)}, base + ".xlsx"))
+        else:
+            sem_attrs = df.copy()
+            sem_attrs.attrs = {}
+            arquivos += escrever(sem_attrs, base, (formato,))
+    return arquivos
+
+
+def gerar_bases(pasta, linhas, mes="2025_10", formatos=("xlsx",), semente=0, taxa_cruzamento=0.005,
+                colunas=None, **parametros):
+    """Gera as três populações na pasta; `linhas` é um int ou um dict por população.
+
+    Uma fração `taxa_cruzamento` dos aposentados e instituidores reaproveita CPFs de servidores
+    (pessoas presentes em mais de uma base). Retorna {populacao: [arquivos]}.
+    """
+    if not isinstance(linhas, dict):
+        linhas = dict.fromkeys(POPULACOES, linhas)
+    rng = np.random.default_rng(semente)
+    cpfs_servidores = gerar_cpfs(rng, linhas.get("servidor", 0))
+
+    arquivos = {}
+    for i, (populacao, n) in enumerate(linhas.items()):
+        cpfs = None
+        if populacao != "servidor":
+            cpfs = gerar_cpfs(np.random.default_rng(semente + 100 + i), n)
+            cruzados = (rng.random(n) < taxa_cruzamento) & (len(cpfs_servidores) > 0)
+            cpfs[cruzados] = rng.choice(cpfs_servidores, int(cruzados.sum()))
+        else:
+            cpfs = cpfs_servidores
+        cols = None if colunas is None else colunas.get(populacao)
+        df = gerar(populacao, n, semente=semente + i, cpfs=cpfs, colunas=cols, **parametros)
+        arquivos[populacao] = salvar(df, populacao, pasta, mes, formatos)
+    return arquivos
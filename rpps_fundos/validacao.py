@@ -0,0 +1,165 @@
+from collections import namedtuple
+
+import numpy as np
+
+from rpps_fundos.classificacao import CODIGO_AUSENTE
+
+# === CONFIGURAÇÕES ===
+ALIQUOTA_CONTRIBUICAO = 0.14
+TAMANHO_BLOCO = 1_000_000  # linhas avaliadas por vez (limita os vetores temporários)
+DIAS_POR_ANO = 365  # idade em anos completos como dias // 365, igual à análise exploratória
+
+# === LIMITES DE VALOR ===
+# Mudam todo ano; os padrões são os de 2025. As regras guardam só o nome do limite (Limite), e o
+# valor é o vigente na avaliação: definir_limites (--salario-minimo e --teto na linha de comando) o troca.
+SALARIO_MINIMO = 1631
+TETO_REMUNERATORIO = 46366.19  # subsídio dos ministros do STF
+LIMITES = {"SALARIO_MINIMO": SALARIO_MINIMO, "TETO_REMUNERATORIO": TETO_REMUNERATORIO}
+
+Limite = namedtuple("Limite", ["nome", "fator"], defaults=(1.0,))
+CONTRIBUICAO_MINIMA = Limite("SALARIO_MINIMO", ALIQUOTA_CONTRIBUICAO)  # 14% sobre o salário mínimo
+CONTRIBUICAO_MAXIMA = Limite("TETO_REMUNERATORIO", ALIQUOTA_CONTRIBUICAO)  # 14% sobre o teto remuneratório
+
+
+def definir_limites(salario_minimo=None, teto_remuneratorio=None):
+    """Troca os limites vigentes (None mantém o atual); retorna uma cópia dos limites."""
+    for nome, valor in (("SALARIO_MINIMO", salario_minimo), ("TETO_REMUNERATORIO", teto_remuneratorio)):
+        if valor is not None:
+            if not valor > 0:
+                raise ValueError(f"{nome} deve ser positivo: {valor}")
+            LIMITES[nome] = float(valor)
+    return dict(LIMITES)
+
+
+def valor_limite(limite):
+    """Valor vigente de um Limite (arredondado ao centavo); números e nomes de coluna voltam inalterados."""
+    if isinstance(limite, Limite):
+        return round(LIMITES[limite.nome] * limite.fator, 2)
+    return limite
+
+
+# === REGRAS ===
+# Cada regra ocupa um bit da coluna VALIDACAO (bit i = i-ésima regra da lista da população):
+#   data_invalida(coluna)                      -> data vazia ou inválida (NaT)
+#   data_posterior(coluna, referencia)         -> coluna depois da referência
+#   idade_menor(fim, nascimento, anos)         -> menos de `anos` completos entre as datas
+#   abaixo(coluna, número, Limite ou coluna)   -> valor menor que o limite
+#   acima(coluna, número, Limite ou coluna)    -> valor maior que o limite (coluna: comparação linha a linha)
+#   fora_do_vocabulario(coluna, vocabulário)   -> código vazio ou fora do vocabulário
+# Datas e valores vazios só violam data_invalida. Regras com colunas ausentes na base não são avaliadas.
+Regra = namedtuple("Regra", ["nome", "descricao", "tipo", "colunas", "parametro"], defaults=(None,))
+Validacao = namedtuple("Validacao", ["mascara", "contagens", "ausentes"])
+
+
+def data_invalida(coluna):
+    return Regra(f"{coluna}_invalida", f"{coluna} vazia ou inválida", "data_invalida", (coluna,))
+
+
+def data_posterior(coluna, referencia, nome, descricao):
+    return Regra(nome, descricao, "data_posterior", (coluna, referencia))
+
+
+def idade_menor(fim, nascimento, anos, nome, descricao):
+    return Regra(nome, descricao, "idade_menor", (fim, nascimento), anos)
+
+
+def abaixo(coluna, limite, nome, descricao):
+    return Regra(nome, descricao, "abaixo", (coluna,), limite)
+
+
+def acima(coluna, limite, nome, descricao):
+    return Regra(nome, descricao, "acima", (coluna,), limite)
+
+
+def fora_do_vocabulario(coluna, vocab):
+    return Regra(f"{coluna}_desconhecido", f"{coluna} vazio ou fora do vocabulário", "fora_do_vocabulario",
+                 (coluna,), vocab)
+
+
+def colunas_da_regra(regra):
+    colunas = list(regra.colunas)
+    if regra.tipo in ("abaixo", "acima") and isinstance(regra.parametro, str):
+        colunas.append(regra.parametro)
+    return colunas
+
+
+# === AVALIAÇÃO ===
+def _dias(valores):
+    # datetime64 -> dias desde 1970 (int64); NaT vira o menor int64 e é tratado à parte
+    return valores.astype("datetime64[D]").view(np.int64)
+
+
+def _violacoes(regra, vetores, inicio, fim):
+    """Linhas [inicio, fim) que violam a regra (vetor booleano)."""
+    valores = [vetores[coluna][inicio:fim] for coluna in regra.colunas]
+    if regra.tipo == "data_invalida":
+        return np.isnat(valores[0])
+    if regra.tipo == "data_posterior":
+        return ~(np.isnat(valores[0]) | np.isnat(valores[1])) & (valores[0] > valores[1])
+    if regra.tipo == "idade_menor":
+        validos = ~(np.isnat(valores[0]) | np.isnat(valores[1]))
+        return validos & (_dias(valores[0]) - _dias(valores[1]) < regra.parametro * DIAS_POR_ANO)
+    if regra.tipo in ("abaixo", "acima"):
+        limite = regra.parametro
+        limite = vetores[limite][inicio:fim] if isinstance(limite, str) else valor_limite(limite)
+        # Comparações com NaN são sempre falsas: valores vazios não violam o limite
+        return np.less(valores[0], limite) if regra.tipo == "abaixo" else np.greater(valores[0], limite)
+    if regra.tipo == "fora_do_vocabulario":
+        conhecidos = np.fromiter(regra.parametro.keys(), dtype=np.int64)
+        return ~np.isin(valores[0], conhecidos) | (valores[0] == CODIGO_AUSENTE)
+    raise ValueError(f"Tipo de regra inválido: {regra.tipo}")
+
+
+def _tipo_mascara(quantidade):
+    for tipo in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if quantidade <= np.iinfo(tipo).bits:
+            return tipo
+    raise ValueError(f"No máximo 64 regras por população ({quantidade} informadas).")
+
+
+def validar(df, regras, tamanho_bloco=TAMANHO_BLOCO):
+    """Avalia todas as regras em uma passada; retorna Validacao(mascara, contagens, ausentes).
+
+    mascara tem um bit por regra (bit i = regras[i]) e uma posição por linha; contagens é
+    {nome: linhas que violam} e ausentes lista as regras não avaliadas por falta de colunas.
+    Cada coluna é lida uma vez, sem cópia do quadro, e as regras são avaliadas por blocos de
+    linhas, então os temporários ficam limitados ao tamanho do bloco.
+    """
+    tipo = _tipo_mascara(len(regras))
+    avaliadas = [(bit, regra) for bit, regra in enumerate(regras) if all(c in df for c in colunas_da_regra(regra))]
+    ausentes = [regra.nome for regra in regras if not all(c in df for c in colunas_da_regra(regra))]
+    vetores = {coluna: df[coluna].to_numpy() for _, regra in avaliadas for coluna in colunas_da_regra(regra)}
+
+    n = len(df)
+    mascara = np.zeros(n, dtype=tipo)
+    contagens = {regra.nome: 0 for _, regra in avaliadas}
+    for inicio in range(0, n, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, n)
+        bloco = mascara[inicio:fim]
+        for bit, regra in avaliadas:
+            violacoes = _violacoes(regra, vetores, inicio, fim)
+            contagens[regra.nome] += int(np.count_nonzero(violacoes))
+            bloco |= violacoes.astype(tipo) << tipo(bit)
+    return Validacao(mascara, contagens, ausentes)
+
+
+def regras_violadas(valor, regras):
+    """Nomes das regras marcadas em um valor da coluna VALIDACAO."""
+    return [regra.nome for bit, regra in enumerate(regras) if int(valor) >> bit & 1]
+
+
+def resumo_validacao(df, regras, coluna='VALIDACAO'):
+    """Linhas de texto com a legenda dos bits e as linhas que violam cada regra, a partir da coluna da máscara."""
+    mascara = df[coluna].to_numpy()
+    linhas = [f"1. Total de linhas: {len(df)}",
+              f"2. Linhas com alguma violação: {int(np.count_nonzero(mascara))}",
+              f"\n3. Violações por regra ([valor do bit em {coluna}] regra: linhas):"]
+    for bit, regra in enumerate(regras):
+        peso = 1 << bit
+        if all(c in df for c in colunas_da_regra(regra)):
+            quantidade = int(np.count_nonzero(mascara & mascara.dtype.type(peso)))
+            limite = f" ({valor_limite(regra.parametro):.2f})" if isinstance(regra.parametro, Limite) else ""
+            linhas.append(f"3.{bit + 1} - [{peso}] {regra.descricao}{limite}: {quantidade}")
+        else:
+            linhas.append(f"3.{bit + 1} - [{peso}] {regra.descricao}: não avaliada (coluna ausente)")
+    return linhas
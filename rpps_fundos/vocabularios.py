@@ -0,0 +1,35 @@
+# === DICIONÁRIOS DE VOCABULÁRIOS ===
+vocab_fundo = {1: "FUNPREV", 2: "FUNFIN", 3: "Mantidos pelo Tesouro", 9: "Não consta"}
+vocab_situacao_funcional = {
+    1: "Em Exercício", 2: "Licenciado(a) com Remuneração", 3: "Licenciado(a) sem Remuneração",
+    4: "Cedido(a) com Ônus", 5: "Cedido(a) sem Ônus", 6: "Requisitado(a) com Ônus",
+    7: "Requisitado(a) sem Ônus", 8: "Em Disponibilidade", 9: "Afastado Mandato Eletivo",
+    10: "Recluso ou Detido", 11: "Outros"
+}
+vocab_prev_comp = {1: "Sim", 2: "Não"}
+vocab_tipo_aposentadoria = {
+    1: "Aposentadoria por Idade",
+    2: "Aposentadoria por Tempo de Contribuição",
+    3: "Aposentadoria Compulsória",
+    4: "Aposentadoria por Invalidez",
+    5: "Aposentadoria como Professor",
+    6: "Aposentadoria Especial - atividade de risco (Art. 40, § 4º, inc. II, CF)",
+    7: "Aposentadoria Especial - atividade prejudiciais à saúde ou integridade física (Art. 40, § 4º, inc. III, CF)",
+    9: "Militares Inativos - Reserva Remunerada",
+    10: "Militares Inativos - Reforma"
+}
+vocab_fundo_pensionista = {1: "FUNPREV", 2: "FUNFIN"}
+vocab_cargo = {
+    1: "Magistrados, Membros do Min. Público ou de Tribunal de Contas",
+    2: "Professores da Educ. Infantil e do Ensino Fund. e Médio",
+    3: "Professores do Ensino Superior",
+    4: "Policiais Civis (Federais, Distritais ou Estaduais)",
+    5: "Agente Penitenciário",
+    6: "Guarda Municipal",
+    7: "Demais Servidores"
+}
+vocab_sexo = {1: "feminino", 2: "masculino"}
+vocab_estado_civil = {
+    1: "solteiro(a)", 2: "casado(a)", 3: "viúvo(a)", 4: "separado(a) judicialmente",
+    5: "divorciado(a)", 6: "união estável", 9: "outros"
+}
@@ -0,0 +1,67 @@
+import pandas as pd
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from rpps_fundos.cache import ler_aba
+from rpps_fundos.pipeline import (
+    DATA_CORTE_ENTE, DATA_CORTE_NASC, PASTA_DADOS, PASTA_RESULTADOS, selecionar_aba, selecionar_arquivo,
+)
+from rpps_fundos.simulacao import grade_cortes, simular_cortes
+
+# === CONFIGURAÇÕES DINÂMICAS ===
+# Uso: python scripts/simulacao_cortes.py [servidor|aposentado]
+POPULACAO = sys.argv[1].lower() if len(sys.argv) > 1 else "servidor"
+
+POPULACOES = {
+    "servidor": ("SERVIDOR", "DT_NASC_SERVIDOR"),
+    "aposentado": ("APOSENTADOS", "DT_NASC_APOSENTADO"),
+}
+if POPULACAO not in POPULACOES:
+    raise ValueError(f"População inválida: {POPULACAO}. Use 'servidor' ou 'aposentado'.")
+PREFIXO, COLUNA_NASC = POPULACOES[POPULACAO]
+ARQUIVO_SAIDA_EXCEL = os.path.join(PASTA_RESULTADOS, f"{PREFIXO}_simulacao_cortes.xlsx")
+
+# === GRADE DE DATAS DE CORTE ===
+CORTES_ENTE = pd.date_range("2015-01-31", "2022-12-31", freq="ME")
+CORTES_NASC = pd.date_range("1950-01-31", "1965-12-31", freq="ME")
+
+# === GARANTIR PASTA DE RESULTADOS ===
+os.makedirs(PASTA_RESULTADOS, exist_ok=True)
+
+# === SELECIONAR ARQUIVO DE ENTRADA ===
+ARQUIVO_ENTRADA = selecionar_arquivo(POPULACAO, PASTA_DADOS)
+print(f"Arquivo selecionado: {ARQUIVO_ENTRADA}")
+aba_selecionada = selecionar_aba(ARQUIVO_ENTRADA, POPULACAO)
+
+# === CARREGAR DADOS (APENAS AS COLUNAS DA REGRA) ===
+COLUNAS = {
+    'CO_TIPO_FUNDO': 'codigo', 'VL_CONTRIBUICAO': 'valor', 'DT_ING_ENTE': 'data',
+    COLUNA_NASC: 'data', 'IN_PREV_COMP': 'codigo'
+}
+df = ler_aba(ARQUIVO_ENTRADA, aba_selecionada, colunas=COLUNAS,
+             aliases={"DATA DE INGRESSO NO ENTE": "DT_ING_ENTE"})
+
+# === SIMULAÇÃO (INCLUI O PAR VIGENTE COMO REFERÊNCIA) ===
+pares = [(DATA_CORTE_ENTE, DATA_CORTE_NASC)] + grade_cortes(CORTES_ENTE, CORTES_NASC)
+simulacao = simular_cortes(
+    df['DT_ING_ENTE'], df[COLUNA_NASC], df['IN_PREV_COMP'], df['CO_TIPO_FUNDO'], df['VL_CONTRIBUICAO'], pares
+)
+
+vigente = simulacao.iloc[0]
+simulacao['DIF_FUNFIN'] = simulacao['FUNFIN'] - vigente['FUNFIN']
+simulacao['DIF_INCOMPATIVEIS'] = simulacao['INCOMPATIVEIS'] - vigente['INCOMPATIVEIS']
+simulacao['DIF_VL_CONTRIBUICAO_INCOMPATIVEL'] = (
+    simulacao['VL_CONTRIBUICAO_INCOMPATIVEL'] - vigente['VL_CONTRIBUICAO_INCOMPATIVEL']
+)
+simulacao['CENARIO_VIGENTE'] = False
+simulacao.loc[0, 'CENARIO_VIGENTE'] = True
+
+simulacao.to_excel(ARQUIVO_SAIDA_EXCEL, index=False)
+
+# === RESUMO ===
+print(f"1. Registros analisados: {len(df)}")
+print(f"2. Pares de datas de corte simulados: {len(simulacao) - 1}")
+print(f"3. Cenário vigente ({DATA_CORTE_ENTE:%d/%m/%Y} | {DATA_CORTE_NASC:%d/%m/%Y}): "
+      f"FUNFIN {vigente['FUNFIN']} | FUNPREV {vigente['FUNPREV']} | Incompatíveis {vigente['INCOMPATIVEIS']}")
+print(f"\nSimulação concluída. Arquivo salvo em:\n- {ARQUIVO_SAIDA_EXCEL}")
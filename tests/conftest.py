@@ -0,0 +1,36 @@
+import re
+
+import pytest
+
+from rpps_fundos import sintetico
+from rpps_fundos.pipeline import POPULACOES, processar
+
+MESES = ("2025_09", "2025_10")
+LINHAS = 3000
+
+
+@pytest.fixture(scope="session")
+def processamento(tmp_path_factory):
+    """Bases sintéticas de dois meses processadas (cubo e histórico gravados); retorna (pasta, resultados por mês)."""
+    raiz = tmp_path_factory.mktemp("rpps")
+    pasta_dados, pasta_resultados = str(raiz / "dados"), str(raiz / "resultados")
+    resultados = {}
+    for semente, mes in enumerate(MESES):
+        sintetico.gerar_bases(pasta_dados, LINHAS + 500 * semente, mes=mes, semente=semente)
+        resultados[mes] = {
+            populacao: processar(populacao, pasta_dados=pasta_dados, pasta_resultados=pasta_resultados, mes=mes)
+            for populacao in POPULACOES
+        }
+    return pasta_resultados, resultados
+
+
+def numero_do_resumo(resumo, rotulo):
+    """Primeiro número após `rotulo:` nas linhas do resumo (ex.: "Incompatíveis")."""
+    encontrado = re.search(rf"{rotulo}: (\d+)", "\n".join(resumo))
+    return int(encontrado.group(1))
+
+
+def orgaos_do_resumo(resumo):
+    """{órgão: incompatíveis} listados no resumo (os órgãos são os da base sintética)."""
+    linhas = re.findall(r"^\d\.\d - (.+): (\d+)$", "\n".join(resumo), re.M)
+    return {orgao: int(n) for orgao, n in linhas if orgao in sintetico.ORGAOS}
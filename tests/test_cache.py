@@ -0,0 +1,96 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pyarrow.ipc as ipc
+import pytest
+
+from rpps_fundos import cache
+
+ABA = "PENSIONISTAS"
+COLUNAS = {'ID_INSTITUIDOR_CPF': 'inteiro', 'CO_TIPO_FUNDO': 'objeto', 'VL_CONTRIBUICAO': 'valor'}
+LINHAS = [[12345678909, 1, 100.5], [98765432100, "FUNPREV", 200.0], [11144477735, None, None], [None, 2.5, 7.0]]
+
+
+def _salvar(caminho, linhas=LINHAS):
+    livro = openpyxl.Workbook()
+    aba = livro.active
+    aba.title = ABA
+    aba.append(list(COLUNAS))
+    for linha in linhas:
+        aba.append(linha)
+    livro.save(caminho)
+    return str(caminho)
+
+
+@pytest.fixture
+def leituras(monkeypatch):
+    """Conta as leituras da planilha (cache ausente ou inválido)."""
+    chamadas = []
+    original = cache._ler_planilha
+
+    def contar(*args):
+        chamadas.append(args[0])
+        return original(*args)
+
+    monkeypatch.setattr(cache, "_ler_planilha", contar)
+    return chamadas
+
+
+def _cacheados(tmp_path):
+    return sorted(os.listdir(tmp_path / cache.NOME_PASTA_CACHE))
+
+
+def test_coluna_mista_volta_com_os_mesmos_valores_e_tipos(tmp_path):
+    valores = [1, "FUNPREV", None, 2.5, float("nan"), True, datetime(2025, 10, 1), np.int64(7), ""]
+    destino = str(tmp_path / "mista.arrow")
+    cache._gravar_arrow(pd.DataFrame({"MISTA": pd.Series(valores, dtype=object), "N": range(len(valores))}), destino)
+
+    tabela = ipc.open_file(destino).read_all()
+    assert str(tabela.schema.field("MISTA").type) == "string"  # texto + tipo, sem objetos serializados
+    lido = cache._ler_arrow(destino)
+    assert list(lido.columns) == ["MISTA", "N"]
+    esperados = valores[:-3] + [pd.Timestamp(2025, 10, 1), 7, ""]  # numpy e datetime voltam como int e Timestamp
+    for esperado, valor in zip(esperados, lido["MISTA"]):
+        assert type(valor) is type(esperado)
+        assert valor == esperado or (valor != valor and esperado != esperado)
+
+
+def test_acerto_e_falha_do_cache(tmp_path, leituras):
+    arquivo = _salvar(tmp_path / "pensionista.xlsx")
+
+    primeira = cache.ler_aba(arquivo, ABA, COLUNAS)
+    segunda = cache.ler_aba(arquivo, ABA, COLUNAS)
+    assert leituras == [arquivo]  # a segunda leitura vem do cache
+    pd.testing.assert_frame_equal(primeira, segunda)
+    assert primeira['CO_TIPO_FUNDO'].tolist()[:2] == [1, "FUNPREV"]
+
+    cache.ler_aba(arquivo, ABA, {'ID_INSTITUIDOR_CPF': 'inteiro'})
+    assert len(leituras) == 2  # outra projeção é outra entrada
+    assert len([nome for nome in _cacheados(tmp_path) if nome.endswith(".arrow")]) == 2
+
+
+def test_arquivo_alterado_invalida_o_cache(tmp_path, leituras, monkeypatch):
+    arquivo = _salvar(tmp_path / "pensionista.xlsx")
+    cache.ler_aba(arquivo, ABA, COLUNAS)
+    antes = _cacheados(tmp_path)
+
+    # Só o mtime muda: o hash é recalculado, mas o conteúdo é o mesmo e o cache continua valendo
+    hashes = []
+    original = cache.hash_arquivo
+    monkeypatch.setattr(cache, "hash_arquivo", lambda caminho: hashes.append(caminho) or original(caminho))
+    info = os.stat(arquivo)
+    os.utime(arquivo, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    cache.ler_aba(arquivo, ABA, COLUNAS)
+    assert len(hashes) == 1 and len(leituras) == 1 and _cacheados(tmp_path) == antes
+    cache.ler_aba(arquivo, ABA, COLUNAS)
+    assert len(hashes) == 1  # tamanho e mtime guardados no índice: sem novo hash
+
+    # Conteúdo (e tamanho) diferente: nova leitura, e a versão anterior é removida
+    _salvar(arquivo, LINHAS + [[22233344405, "FUNFIN", 1.0]])
+    atualizado = cache.ler_aba(arquivo, ABA, COLUNAS)
+    assert len(leituras) == 2 and len(atualizado) == len(LINHAS) + 1
+    arrows = [nome for nome in _cacheados(tmp_path) if nome.endswith(".arrow")]
+    assert len(arrows) == 1 and arrows != [nome for nome in antes if nome.endswith(".arrow")]
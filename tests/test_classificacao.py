@@ -0,0 +1,16 @@
+import numpy as np
+
+from rpps_fundos.classificacao import (
+    COMPATIVEL, FORA_DA_ANALISE, FUNDO_INDEFINIDO, FUNFIN, FUNPREV, INCOMPATIVEL, classificar_pensionistas,
+)
+
+
+def test_pensionista_sem_fundo_calculado_fica_fora_da_analise():
+    nascimentos = np.array(["1950-01-01", "1950-01-01", "1970-01-01", "1970-01-01", "NaT"], dtype="datetime64[ns]")
+    informado = np.array([FUNPREV, FUNFIN, FUNPREV, FUNFIN, FUNPREV])
+
+    resultado = classificar_pensionistas(nascimentos, informado)
+
+    assert resultado.calculo.tolist() == [FUNPREV, FUNPREV, FUNDO_INDEFINIDO, FUNDO_INDEFINIDO, FUNPREV]
+    assert resultado.compatibilidade.tolist() == [COMPATIVEL, INCOMPATIVEL, FORA_DA_ANALISE, FORA_DA_ANALISE, COMPATIVEL]
+    assert resultado.compatibilidade.dtype == np.int8
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from rpps_fundos import sintetico, validacao
+from rpps_fundos.cli import criar_parser, main
+from rpps_fundos.pipeline import POPULACOES
+
+LINHAS = 300
+
+
+@pytest.fixture(autouse=True)
+def limites(monkeypatch):
+    # main troca os limites vigentes (--teto): restaura os padrões para os demais testes
+    monkeypatch.setattr(validacao, "LIMITES", dict(validacao.LIMITES))
+
+
+@pytest.fixture
+def pastas(tmp_path):
+    pasta_dados, pasta_resultados = str(tmp_path / "dados"), str(tmp_path / "resultados")
+    arquivos = sintetico.gerar_bases(pasta_dados, LINHAS, semente=4)
+    return pasta_dados, pasta_resultados, arquivos
+
+
+def _saidas(pasta_resultados):
+    return set(os.listdir(pasta_resultados)) if os.path.exists(pasta_resultados) else set()
+
+
+def test_argumentos():
+    args = criar_parser().parse_args(["run", "servidor", "aposentado", "--formato", "xlsx", "parquet", "--processos", "2"])
+    assert (args.comando, args.populacoes, args.formato, args.processos) == ("run", ["servidor", "aposentado"],
+                                                                             ["xlsx", "parquet"], 2)
+    assert not args.all and not args.incremental and args.mes is None
+
+    projecao = criar_parser().parse_args(["projecao", "--aliquota", "2025_11=2%"])
+    assert projecao.base is None and projecao.populacao == ["servidor", "aposentado"]
+
+    with pytest.raises(SystemExit):
+        criar_parser().parse_args(["run", "--formato", "pdf"])
+    with pytest.raises(SystemExit, match="Informe as populações"):
+        main(["run"])
+    with pytest.raises(SystemExit, match="Populações inválidas"):
+        main(["run", "servidores"])
+    with pytest.raises(SystemExit, match="--arquivo inválido"):
+        main(["run", "--arquivo", "servidor"])
+
+
+@pytest.mark.parametrize("processos", ["1", "3"])  # 3: uma população por processo (ProcessPoolExecutor)
+def test_run_das_tres_populacoes(pastas, processos, capsys):
+    pasta_dados, pasta_resultados, _ = pastas
+    codigo = main(["run", "--all", "--dados", pasta_dados, "--resultados", pasta_resultados,
+                   "--processos", processos, "--teto", "50000"])
+
+    saida = capsys.readouterr().out
+    assert codigo == 0
+    assert "(3/3 populações)" in saida and "CRUZAMENTO DE CPF ENTRE BASES" in saida
+    esperados = {config["arquivo_txt"] for config in POPULACOES.values()}
+    esperados |= {config["arquivo_validacao"] for config in POPULACOES.values()}
+    assert esperados <= _saidas(pasta_resultados)
+    # O teto informado chega aos processos filhos (initializer do pool)
+    with open(os.path.join(pasta_resultados, POPULACOES["servidor"]["arquivo_validacao"]), encoding="utf-8") as f:
+        assert "(7000.00)" in f.read()  # 14% de 50000
+
+
+@pytest.mark.parametrize("processos", ["1", "3"])
+def test_populacao_com_falha_retorna_1(pastas, processos, capsys):
+    pasta_dados, pasta_resultados, arquivos = pastas
+    (pensionistas,) = arquivos["pensionista"]
+    with open(pensionistas, "wb") as f:
+        f.write(b"nao e um xlsx")
+
+    codigo = main(["run", "--all", "--dados", pasta_dados, "--resultados", pasta_resultados, "--processos", processos])
+
+    saida = capsys.readouterr()
+    assert codigo == 1
+    assert "Falha ao processar pensionista" in saida.err and "(2/3 populações)" in saida.out
+    assert "CRUZAMENTO DE CPF ENTRE BASES" not in saida.out  # só com as três populações
+    saidas = _saidas(pasta_resultados)
+    assert {POPULACOES[p]["arquivo_txt"] for p in ("servidor", "aposentado")} <= saidas
+    assert POPULACOES["pensionista"]["arquivo_txt"] not in saidas
@@ -0,0 +1,44 @@
+import numpy as np
+
+from rpps_fundos import cpf, sintetico
+
+
+def _verificadores_escalar(base):
+    # Regra da Receita Federal, dígito a dígito
+    digitos = [int(d) for d in f"{base:09d}"]
+    dv1 = 11 - sum(d * p for d, p in zip(digitos, range(10, 1, -1))) % 11
+    dv1 = 0 if dv1 >= 10 else dv1
+    dv2 = 11 - sum(d * p for d, p in zip(digitos + [dv1], range(11, 1, -1))) % 11
+    return dv1, 0 if dv2 >= 10 else dv2
+
+
+def test_digitos_verificadores_batem_com_a_regra_escalar():
+    bases = np.random.default_rng(0).integers(0, 999_999_999, 2000)
+    dv1, dv2 = cpf.digitos_verificadores(bases)
+    assert list(zip(dv1.tolist(), dv2.tolist())) == [_verificadores_escalar(int(b)) for b in bases]
+
+
+def test_normalizar_formatos():
+    valores = np.array(["529.982.247-25", "52998224725", " 111.444.777/35 ", "12.345.678-9x", "", None,
+                        1234567890, 529982247.25, -5, 123456789012], dtype=object)
+    assert cpf.normalizar(valores).tolist() == [
+        52998224725, 52998224725, 11144477735, cpf.CPF_AUSENTE, cpf.CPF_AUSENTE, cpf.CPF_AUSENTE,
+        1234567890, cpf.CPF_AUSENTE, cpf.CPF_AUSENTE, cpf.CPF_AUSENTE,
+    ]
+    assert cpf.normalizar(np.array([52998224725.0, np.nan])).tolist() == [52998224725, cpf.CPF_AUSENTE]
+    assert cpf.normalizar(np.array(["012.345.678-90"])).tolist() == [1234567890]
+
+
+def test_validar():
+    cpfs = cpf.normalizar(np.array(["529.982.247-25", "529.982.247-24", "111.111.111-11", "000.000.000-00",
+                                    "123.456.789-09", ""], dtype=object))
+    assert cpf.validar(cpfs).tolist() == [True, False, False, False, True, False]
+
+
+def test_cpfs_sinteticos_sao_validos():
+    cpfs = sintetico.gerar_cpfs(np.random.default_rng(1), 5000)
+    assert cpf.validar(cpfs).all()
+
+
+def test_duplicados():
+    assert cpf.duplicados([1, 2, 1, 3, cpf.CPF_AUSENTE]).tolist() == [True, False, True, False, False]
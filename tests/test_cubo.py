@@ -0,0 +1,92 @@
+import pytest
+
+from conftest import MESES, numero_do_resumo, orgaos_do_resumo
+from rpps_fundos import cubo
+from rpps_fundos.pipeline import POPULACOES
+
+
+@pytest.fixture(scope="module")
+def dados_cubo(processamento):
+    pasta_resultados, resultados = processamento
+    return cubo.carregar_cubo(pasta_resultados), resultados
+
+
+@pytest.mark.parametrize("populacao", list(POPULACOES))
+def test_compatibilidade_do_cubo_bate_com_o_resumo(dados_cubo, populacao):
+    tabela, resultados = dados_cubo
+    for mes in MESES:
+        resumo = resultados[mes][populacao]["resumo"]
+        for rotulo, titulo in (("incompativel", "Incompatíveis"), ("compativel", "Compatíveis")):
+            registros = cubo.consultar(tabela, POPULACAO=populacao, MES=mes, COMPATIBILIDADE_FUNDO=rotulo)["REGISTROS"]
+            assert registros.iloc[0] == numero_do_resumo(resumo, titulo)
+
+
+@pytest.mark.parametrize("populacao", list(POPULACOES))
+def test_incompativeis_por_orgao_batem_com_o_resumo(dados_cubo, populacao):
+    tabela, resultados = dados_cubo
+    mes = MESES[-1]
+    por_orgao = cubo.consultar(tabela, por=["NO_ORGAO"], POPULACAO=populacao, MES=mes,
+                               COMPATIBILIDADE_FUNDO="incompativel")
+    contagens = dict(zip(por_orgao["NO_ORGAO"], por_orgao["REGISTROS"]))
+    esperado = orgaos_do_resumo(resultados[mes][populacao]["resumo"])
+    assert esperado
+    assert {orgao: contagens[orgao] for orgao in esperado} == esperado
+
+
+def test_pensionistas_fora_da_analise_nao_contam_como_incompativeis(dados_cubo):
+    tabela, resultados = dados_cubo
+    mes = MESES[-1]
+    fatia = cubo.fatiar(tabela, POPULACAO="pensionista", MES=mes)
+    fora = cubo.consultar(fatia, COMPATIBILIDADE_FUNDO="fora da analise")["REGISTROS"].iloc[0]
+    indefinidos = cubo.consultar(fatia, CALCULO_FUNDO="Indefinido")["REGISTROS"].iloc[0]
+    assert fora == indefinidos > 0
+    analisados = numero_do_resumo(resultados[mes]["pensionista"]["resumo"], r"Total analisados \(FUNPREV\)")
+    assert fatia["REGISTROS"].sum() - fora == analisados
+
+
+def test_filtro_aceita_codigo_ou_rotulo(dados_cubo):
+    tabela, _ = dados_cubo
+    por_rotulo = cubo.fatiar(tabela, COMPATIBILIDADE_FUNDO="Incompativel", CALCULO_FUNDO="FUNFIN")
+    por_codigo = cubo.fatiar(tabela, COMPATIBILIDADE_FUNDO=0, CALCULO_FUNDO=2)
+    assert len(por_rotulo) > 0
+    assert por_rotulo.equals(por_codigo)
+
+
+def test_filtro_com_dimensao_invalida(dados_cubo):
+    tabela, _ = dados_cubo
+    with pytest.raises(ValueError):
+        cubo.fatiar(tabela, VL_CONTRIBUICAO=0)
+
+
+def test_consultar_ordena_e_limita(dados_cubo):
+    tabela, _ = dados_cubo
+    top = cubo.consultar(tabela, por=["NO_ORGAO"], top=3, ordenar="VL_CONTRIBUICAO", POPULACAO="servidor")
+    todos = cubo.consultar(tabela, por=["NO_ORGAO"], ordenar="VL_CONTRIBUICAO", POPULACAO="servidor")
+    assert len(top) == 3
+    assert top.equals(todos.head(3))
+    assert todos["VL_CONTRIBUICAO"].is_monotonic_decreasing
+    total = cubo.consultar(tabela, POPULACAO="servidor")
+    assert total["REGISTROS"].iloc[0] == todos["REGISTROS"].sum()
+
+
+def test_comparar_meses(dados_cubo):
+    tabela, _ = dados_cubo
+    anterior, atual = MESES
+    comparacao = cubo.comparar_meses(tabela, anterior, atual, por=["POPULACAO"])
+    for _, linha in comparacao.iterrows():
+        registros = {
+            mes: cubo.consultar(tabela, POPULACAO=linha["POPULACAO"], MES=mes)["REGISTROS"].iloc[0] for mes in MESES
+        }
+        assert linha[f"REGISTROS_{anterior}"] == registros[anterior]
+        assert linha[f"REGISTROS_{atual}"] == registros[atual]
+        assert linha["REGISTROS_VARIACAO"] == registros[atual] - registros[anterior]
+
+
+@pytest.mark.parametrize("entrada, esperado", [("2025-10", "2025_10"), ("2025_1", "2025_01"), ("servidor_2025_10.xlsx", "2025_10")])
+def test_normalizar_mes(entrada, esperado):
+    assert cubo.normalizar_mes(entrada) == esperado
+
+
+def test_normalizar_mes_invalido():
+    with pytest.raises(ValueError):
+        cubo.normalizar_mes("outubro")
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.escrita import escrever
+from rpps_fundos.esquema import restaurar_inteiros
+from rpps_fundos.leitura import INTEIRO_AUSENTE
+from rpps_fundos.pipeline import COLUNAS_SERVIDOR
+
+
+def test_inteiro_ausente_sai_como_celula_vazia(tmp_path):
+    df = pd.DataFrame({
+        'ID_SERVIDOR_MATRICULA': np.array([100001, INTEIRO_AUSENTE], dtype=np.int32),
+        'ID_SERVIDOR_CPF': np.array([INTEIRO_AUSENTE, 12345678909], dtype=np.int64),
+        'VL_CONTRIBUICAO': [10.5, 20.0],
+    })
+    saida = restaurar_inteiros(df.copy(), COLUNAS_SERVIDOR)
+    xlsx, csv = escrever(saida, str(tmp_path / "saida"), ("xlsx", "csv"))
+
+    for lida in (pd.read_excel(xlsx), pd.read_csv(csv, sep=";", decimal=",", encoding="utf-8-sig")):
+        assert lida['ID_SERVIDOR_MATRICULA'].isna().tolist() == [False, True]
+        assert lida['ID_SERVIDOR_CPF'].isna().tolist() == [True, False]
+        assert lida['ID_SERVIDOR_MATRICULA'].iloc[0] == 100001
+        assert lida['ID_SERVIDOR_CPF'].iloc[1] == 12345678909
+    assert str(INTEIRO_AUSENTE) not in open(csv, encoding="utf-8-sig").read()
+
+
+def test_restaurar_inteiros_no_texto_do_estado():
+    df = pd.DataFrame({'ID_SERVIDOR_MATRICULA': ["100001", str(INTEIRO_AUSENTE)]})
+    matriculas = restaurar_inteiros(df, COLUNAS_SERVIDOR)['ID_SERVIDOR_MATRICULA']
+    assert matriculas.isna().tolist() == [False, True]
+    assert matriculas.iloc[0] == "100001"
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from rpps_fundos.esquema import compactar, decodificar, restaurar_inteiros
+from rpps_fundos.leitura import CODIGO_AUSENTE, INTEIRO_AUSENTE
+from rpps_fundos.vocabularios import vocab_fundo, vocab_situacao_funcional
+
+COLUNAS = {
+    'ID_SERVIDOR_MATRICULA': 'inteiro', 'ID_SERVIDOR_CPF': 'inteiro', 'NO_ORGAO': 'texto',
+    'CO_TIPO_FUNDO': 'codigo', 'CO_SITUACAO_FUNCIONAL': 'codigo', 'VL_CONTRIBUICAO': 'valor',
+}
+
+
+def _lida():
+    """Como a leitura entrega as colunas: inteiros int64 com INTEIRO_AUSENTE, códigos int8 com CODIGO_AUSENTE."""
+    return pd.DataFrame({
+        'ID_SERVIDOR_MATRICULA': np.array([100001, 2500000, INTEIRO_AUSENTE, 7], dtype=np.int64),
+        'ID_SERVIDOR_CPF': np.array([12345678909, INTEIRO_AUSENTE, 98765432100, 11144477735], dtype=np.int64),
+        'NO_ORGAO': ["SEFAZ", "SEDUC", "SEFAZ", "PGE"],
+        'CO_TIPO_FUNDO': np.array([1, 2, CODIGO_AUSENTE, 9], dtype=np.int8),
+        'CO_SITUACAO_FUNCIONAL': np.array([1, 11, 4, 42], dtype=np.int8),
+        'VL_CONTRIBUICAO': [1234.56, 0.01, 987654.32, 0.0],
+    })
+
+
+def test_compactar_e_restaurar_preservam_os_valores():
+    original = _lida()
+    compacto = compactar(original.copy(), COLUNAS)
+
+    assert compacto['ID_SERVIDOR_MATRICULA'].dtype == np.int32
+    assert compacto['ID_SERVIDOR_CPF'].dtype == np.int64
+    assert isinstance(compacto['NO_ORGAO'].dtype, pd.CategoricalDtype)
+    assert compacto['CO_TIPO_FUNDO'].dtype == np.int8
+    assert compacto['VL_CONTRIBUICAO'].dtype == np.float64
+    assert compacto.memory_usage(deep=True).sum() < original.memory_usage(deep=True).sum()
+
+    saida = restaurar_inteiros(compacto.copy(), COLUNAS)
+    for nome in ('ID_SERVIDOR_MATRICULA', 'ID_SERVIDOR_CPF'):
+        esperado = pd.Series(original[nome]).where(original[nome] != INTEIRO_AUSENTE).astype("Int64")
+        pd.testing.assert_series_equal(saida[nome], esperado)
+    assert saida['NO_ORGAO'].astype(str).tolist() == original['NO_ORGAO'].tolist()
+    assert saida['VL_CONTRIBUICAO'].tolist() == original['VL_CONTRIBUICAO'].tolist()
+
+
+def test_decodificar_equivale_ao_map_dos_rotulos():
+    compacto = compactar(_lida(), COLUNAS)
+    for nome, vocab in (('CO_TIPO_FUNDO', vocab_fundo), ('CO_SITUACAO_FUNCIONAL', vocab_situacao_funcional)):
+        rotulos = decodificar(compacto[nome], vocab)
+        esperado = compacto[nome].astype(np.int64).map(vocab)
+        pd.testing.assert_series_equal(pd.Series(rotulos, name=nome).astype(object), esperado.astype(object))
+        assert list(rotulos.categories) == list(vocab.values())
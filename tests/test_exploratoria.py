@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rpps_fundos import exploratoria, sintetico
+from rpps_fundos.pipeline import POPULACOES
+
+LINHAS = 1500
+
+
+@pytest.fixture(scope="module")
+def bases(tmp_path_factory):
+    """Bases sintéticas em .xlsx e .parquet, com CPFs duplicados e datas inválidas."""
+    pasta = str(tmp_path_factory.mktemp("exploratoria"))
+    return sintetico.gerar_bases(pasta, LINHAS, formatos=("xlsx", "parquet"), semente=7, taxa_data_invalida=0.02)
+
+
+def _comparar(resultado, esperado):
+    assert list(resultado) == list(esperado)
+    for titulo, valor in esperado.items():
+        if isinstance(valor, pd.DataFrame):
+            pd.testing.assert_frame_equal(resultado[titulo], valor, obj=titulo)
+        elif isinstance(valor, pd.Series):
+            pd.testing.assert_series_equal(resultado[titulo], valor, obj=titulo)
+        else:
+            assert resultado[titulo] == valor, titulo
+
+
+@pytest.mark.parametrize("populacao", list(POPULACOES))
+@pytest.mark.parametrize("formato", ["xlsx", "parquet"])
+def test_blocos_equivalem_a_uma_passada(bases, populacao, formato):
+    (arquivo,) = [a for a in bases[populacao] if a.endswith(formato)]
+    inteiro, _, ausentes = exploratoria.analisar(populacao, arquivo, tamanho_bloco=10 * LINHAS)
+
+    assert inteiro["Total de linhas"] == LINHAS and not ausentes
+    for tamanho in (97, 500):
+        em_blocos, _, _ = exploratoria.analisar(populacao, arquivo, tamanho_bloco=tamanho)
+        _comparar(em_blocos, inteiro)
+
+
+def test_describe_e_contagens_iguais_ao_pandas(bases):
+    (arquivo,) = [a for a in bases["servidor"] if a.endswith("parquet")]
+    resultado, _, _ = exploratoria.analisar("servidor", arquivo, tamanho_bloco=333)
+    df = pd.read_parquet(arquivo)
+
+    nascimento = pd.to_datetime(df['DT_NASC_SERVIDOR'])
+    idade = ((pd.Timestamp(exploratoria.DATA_REFERENCIA) - nascimento).dt.days // 365).rename('IDADE')
+    pd.testing.assert_series_equal(resultado["Faixas de idade"], idade.describe())
+    assert resultado["CPFs duplicados"] == int(df['ID_SERVIDOR_CPF'].duplicated().sum())
+
+    orgaos = resultado["Servidores por órgão"].set_index("Órgão")["Contagem"]
+    assert orgaos.to_dict() == df['NO_ORGAO'].value_counts().to_dict()
+    assert resultado["Previdência complementar (Sim)"] == int(np.count_nonzero(df['IN_PREV_COMP'] == 1))
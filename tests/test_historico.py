@@ -0,0 +1,85 @@
+import pytest
+
+from conftest import LINHAS, MESES, numero_do_resumo, orgaos_do_resumo
+from rpps_fundos import historico
+from rpps_fundos.pipeline import POPULACOES
+
+
+@pytest.fixture(scope="module")
+def pasta(processamento):
+    return processamento[0]
+
+
+def _formatar_cpf(cpf):
+    digitos = f"{int(cpf):011d}"
+    return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+
+
+def test_cargas_registradas(pasta):
+    cargas = historico.meses_carregados(pasta)
+    assert len(cargas) == len(MESES) * len(POPULACOES)
+    assert sorted(cargas['MES'].unique()) == list(MESES)
+    linhas = cargas.set_index(['MES', 'POPULACAO'])['LINHAS']
+    assert linhas[(MESES[0], "servidor")] == LINHAS
+    assert linhas[(MESES[1], "servidor")] == LINHAS + 500
+
+
+@pytest.mark.parametrize("populacao", list(POPULACOES))
+def test_incompativeis_batem_com_o_resumo(processamento, populacao):
+    pasta, resultados = processamento
+    for mes in MESES:
+        tabela = historico.incompativeis(pasta, mes, populacao)
+        assert len(tabela) == numero_do_resumo(resultados[mes][populacao]["resumo"], "Incompatíveis")
+        assert set(tabela['COMPATIBILIDADE_FUNDO']) == {"incompativel"}
+
+
+def test_incompativeis_sem_mes_usam_o_mais_recente(pasta):
+    tabela = historico.incompativeis(pasta)
+    assert set(tabela['MES']) == {MESES[-1]}
+    assert set(tabela['POPULACAO']) == set(POPULACOES)
+
+
+@pytest.mark.parametrize("populacao", list(POPULACOES))
+def test_historico_orgao_bate_com_o_resumo(processamento, populacao):
+    pasta, resultados = processamento
+    mes = MESES[-1]
+    esperado = orgaos_do_resumo(resultados[mes][populacao]["resumo"])
+    assert esperado
+    for orgao, n in esperado.items():
+        tabela = historico.historico_orgao(pasta, orgao, populacao=populacao)
+        linha = tabela[(tabela['MES'] == mes) & (tabela['COMPATIBILIDADE_FUNDO'] == "incompativel")]
+        assert linha['REGISTROS'].tolist() == [n]
+
+
+def test_historico_orgao_ultimos_e_colunas_invalidas(pasta):
+    orgao = "PREFEITURA DO MUNICIPIO DE SAO PAULO"
+    assert set(historico.historico_orgao(pasta, orgao, ultimos=1)['MES']) == {MESES[-1]}
+    with pytest.raises(ValueError):
+        historico.historico_orgao(pasta, orgao, por=['VL_CONTRIBUICAO'])
+
+
+def test_historico_cpf_com_pontuacao(pasta):
+    registro = historico.incompativeis(pasta, MESES[-1], "servidor").iloc[0]
+    tabela = historico.historico_cpf(pasta, _formatar_cpf(registro['CPF']))
+    assert (tabela['CPF'] == registro['CPF']).all()
+    atual = tabela[(tabela['MES'] == MESES[-1]) & (tabela['MATRICULA'] == registro['MATRICULA'])]
+    assert atual['COMPATIBILIDADE_FUNDO'].tolist() == ["incompativel"]
+    assert list(tabela['MES']) == sorted(tabela['MES'])
+
+
+def test_historico_cpf_do_pensionista(pasta):
+    registro = historico.incompativeis(pasta, MESES[-1], "pensionista").iloc[0]
+    tabela = historico.historico_cpf(pasta, registro['CPF_PENSIONISTA'])
+    assert (tabela['CPF_PENSIONISTA'] == registro['CPF_PENSIONISTA']).any()
+    assert set(tabela['POPULACAO']) >= {"pensionista"}
+
+
+def test_historico_matricula(pasta):
+    registro = historico.incompativeis(pasta, MESES[-1], "aposentado").iloc[0]
+    tabela = historico.historico_matricula(pasta, registro['MATRICULA'], populacao="aposentado")
+    assert len(tabela) >= 1
+    assert set(tabela['POPULACAO']) == {"aposentado"}
+    assert (tabela['MATRICULA'] == registro['MATRICULA']).all()
+    ultimos = historico.historico_matricula(pasta, registro['MATRICULA'], populacao="aposentado", ultimos=1)
+    assert set(ultimos['MES']) == {MESES[-1]}
+
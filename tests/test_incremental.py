@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rpps_fundos import incremental, pipeline, sintetico
+from rpps_fundos.pipeline import carregar
+
+LINHAS = 400
+
+
+@pytest.fixture
+def meses(tmp_path):
+    """Servidores de 2025_10 e 2025_11: em novembro, 10 ingressos alterados, 5 linhas novas e 3 matrículas repetidas."""
+    pasta = str(tmp_path / "dados")
+    outubro = sintetico.gerar("servidor", LINHAS, semente=2)
+    sintetico.salvar(outubro, "servidor", pasta, mes="2025_10")
+
+    novembro = outubro.copy()
+    novembro.attrs = {}  # sem attrs, as datas inválidas vão vazias: lidas como NaT, igual ao texto de outubro
+    alteradas = novembro.index[:10]
+    novembro.loc[alteradas, 'DT_ING_ENTE'] = pd.Timestamp("2019-03-01")
+    novas = sintetico.gerar("servidor", 5, semente=9, taxa_data_invalida=0)
+    novas.attrs = {}
+    novas['ID_SERVIDOR_MATRICULA'] += 10 * novembro['ID_SERVIDOR_MATRICULA'].max()
+    repetidas = novembro.iloc[100:103]  # a mesma matrícula duas vezes: as duas linhas passam pelas regras
+    novembro = pd.concat([novembro, novas, repetidas], ignore_index=True)
+    sintetico.salvar(novembro, "servidor", pasta, mes="2025_11")
+    return pasta, str(tmp_path / "resultados"), len(novembro)
+
+
+def _reclassificados(resultado):
+    (registro,) = [r for r in resultado["execucao"]["etapas"] if r["etapa"] == "classificacao"]
+    return registro["linhas"]
+
+
+def test_reaproveita_o_que_nao_mudou(meses):
+    pasta, resultados, total = meses
+    primeiro = incremental.processar_incremental("servidor", pasta_dados=pasta, pasta_resultados=resultados, mes="2025_10")
+    assert primeiro["delta"] == [] and _reclassificados(primeiro) == LINHAS
+
+    segundo = incremental.processar_incremental("servidor", pasta_dados=pasta, pasta_resultados=resultados, mes="2025_11")
+    reclassificados = 10 + 5 + 2 * 3
+    assert _reclassificados(segundo) == reclassificados
+    assert f"Reclassificados: {reclassificados} de {total} ({reclassificados / total:.2%})" in segundo["delta"]
+
+    # O reaproveitamento não muda o resultado da classificação completa
+    completo, _, _ = carregar("servidor", pasta_dados=pasta, mes="2025_11")
+    estado, meta = incremental.carregar_estado("servidor", resultados)
+    assert meta["linhas"] == total
+    np.testing.assert_array_equal(estado["CALCULO_FUNDO"].to_numpy(), completo['CALCULO_FUNDO'].to_numpy())
+    np.testing.assert_array_equal(estado["COMPATIBILIDADE_FUNDO"].to_numpy(), completo['COMPATIBILIDADE_FUNDO'].to_numpy())
+
+
+def test_datas_de_corte_alteradas_invalidam_o_estado(meses, monkeypatch):
+    pasta, resultados, total = meses
+    incremental.processar_incremental("servidor", pasta_dados=pasta, pasta_resultados=resultados, mes="2025_10")
+    assert incremental.carregar_estado("servidor", resultados)[0] is not None
+
+    monkeypatch.setattr(pipeline, "DATA_CORTE_NASC", datetime(1960, 1, 1))
+    assert incremental.carregar_estado("servidor", resultados) == (None, None)
+    resultado = incremental.processar_incremental("servidor", pasta_dados=pasta, pasta_resultados=resultados, mes="2025_11")
+    assert resultado["delta"] == [] and _reclassificados(resultado) == total
+
+    estado, meta = incremental.carregar_estado("servidor", resultados)
+    assert meta["cortes"]["DATA_CORTE_NASC"] == "1960-01-01T00:00:00"
+    completo, _, _ = carregar("servidor", pasta_dados=pasta, mes="2025_11")
+    np.testing.assert_array_equal(estado["CALCULO_FUNDO"].to_numpy(), completo['CALCULO_FUNDO'].to_numpy())
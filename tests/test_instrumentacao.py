@@ -0,0 +1,46 @@
+import json
+
+from rpps_fundos import sintetico
+from rpps_fundos.instrumentacao import ETAPAS, Instrumentacao, linhas_tempos
+from rpps_fundos.pipeline import POPULACOES, processar
+
+CAMPOS_ETAPA = {"etapa", "inicio_s", "segundos", "cpu_s", "linhas", "linhas_por_s", "rss_pico_mb", "tracemalloc_pico_mb"}
+
+
+def test_relatorio_json_de_uma_execucao(tmp_path):
+    pasta_dados, pasta_resultados = str(tmp_path / "dados"), str(tmp_path / "resultados")
+    sintetico.gerar_bases(pasta_dados, {"servidor": 500})
+
+    resultado = processar("servidor", pasta_dados=pasta_dados, pasta_resultados=pasta_resultados)
+    caminho = tmp_path / "resultados" / POPULACOES["servidor"]["arquivo_execucao"]
+    assert str(caminho) in resultado["saidas"]
+    relatorio = json.loads(caminho.read_text(encoding="utf-8"))
+
+    assert {"populacao", "data", "arquivo", "aba", "linhas", "modo", "segundos", "cpu_s", "rss_pico_mb", "etapas"} <= set(relatorio)
+    assert relatorio["populacao"] == "servidor" and relatorio["modo"] == "completo" and relatorio["linhas"] == 500
+    etapas = [registro["etapa"] for registro in relatorio["etapas"]]
+    assert etapas[:2] == ["leitura", "compactacao"]
+    assert {"datas", "classificacao", "duplicidade_cenarios", "rotulos", "escrita", "resumo"} <= set(etapas)
+    assert set(etapas) <= set(ETAPAS)
+    for registro in relatorio["etapas"]:
+        assert set(registro) == CAMPOS_ETAPA
+        assert registro["segundos"] >= 0 and registro["cpu_s"] >= 0
+        assert registro["tracemalloc_pico_mb"] is None  # sem --rastrear-alocacoes
+    inicios = [registro["inicio_s"] for registro in relatorio["etapas"]]
+    assert inicios == sorted(inicios)
+    assert relatorio["segundos"] >= max(registro["segundos"] for registro in relatorio["etapas"])
+    assert relatorio == resultado["execucao"]
+
+
+def test_etapa_como_decorador_e_com_alocacoes():
+    with Instrumentacao("servidor", rastrear_alocacoes=True) as instrumentacao:
+        @instrumentacao.etapa("classificacao", 1000)
+        def alocar():
+            return bytearray(5_000_000)
+
+        alocar()
+
+    (registro,) = instrumentacao.relatorio()["etapas"]
+    assert registro["etapa"] == "classificacao" and registro["linhas"] == 1000
+    assert registro["tracemalloc_pico_mb"] >= 4.9
+    assert linhas_tempos(instrumentacao.relatorio())[1].startswith(f"- {ETAPAS['classificacao']}:")
@@ -0,0 +1,163 @@
+import re
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from rpps_fundos.leitura import CODIGO_AUSENTE, INTEIRO_AUSENTE, iterar_blocos, ler_cabecalho, ler_colunas
+
+ABA = "SERVIDORES"
+COLUNAS = {
+    'ID_SERVIDOR_CPF': 'inteiro', 'NO_ORGAO': 'texto', 'DT_NASC_SERVIDOR': 'data',
+    'CO_TIPO_FUNDO': 'codigo', 'VL_CONTRIBUICAO': 'valor', 'ID_SERVIDOR_MATRICULA': 'objeto',
+}
+# A coluna G (VL_REMUNERACAO) não é lida, mas tem valor até a última linha
+LINHAS = [
+    [12345678909, "SEFAZ", datetime(1960, 5, 17), 1, 1234.56, 100001, 1.0],
+    ["111.444.777-35", "SEDUC", "17/05/1958", 2, None, "A-17", 2.0],
+    [None, None, None, None, None, None, 3.0],
+    [98765432100, "SEFAZ", datetime(1945, 1, 1), "X", 0.01, None, 4.0],
+    [None, None, None, None, None, None, 5.0],
+    [None, None, None, None, None, None, 6.0],
+]
+CABECALHO = list(COLUNAS)[:5] + ['ID_SERVIDOR_MATRICULA', 'VL_REMUNERACAO']
+
+
+def _salvar(caminho, linhas=LINHAS):
+    livro = openpyxl.Workbook()
+    aba = livro.active
+    aba.title = ABA
+    aba.append(CABECALHO)
+    for linha in linhas:
+        aba.append(linha)
+    livro.save(caminho)
+    return str(caminho)
+
+
+def _indice(letras):
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + ord(letra) - 64
+    return indice
+
+
+def _reescrever(origem, destino, planilha, **outros):
+    """Cópia do .xlsx com o XML da aba reescrito por planilha(dados) e membros extras/substituídos."""
+    with zipfile.ZipFile(origem) as entrada, zipfile.ZipFile(destino, "w") as saida:
+        for membro in entrada.namelist():
+            dados = entrada.read(membro)
+            if membro.startswith("xl/worksheets/"):
+                dados = planilha(dados)
+            saida.writestr(membro, outros.pop(membro, lambda d: d)(dados))
+        for membro, conteudo in outros.items():
+            saida.writestr(membro, conteudo(None))
+    return str(destino)
+
+
+def _textos_compartilhados(origem, destino):
+    """Cópia do .xlsx com os textos em xl/sharedStrings.xml (o openpyxl grava inlineStr)."""
+    textos = []
+
+    def compartilhar(m):
+        textos.append(m.group(2))
+        return m.group(1) + b'"s"><v>' + str(len(textos) - 1).encode() + b"</v></c>"
+
+    def planilha(dados):
+        return re.sub(rb'(<c\b[^>]*?t=)"inlineStr"><is><t>(.*?)</t></is></c>', compartilhar, dados)
+
+    tipo = (b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+            b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+    relacao = (b'<Relationship Id="rIdTextos" Target="sharedStrings.xml" Type="http://schemas.'
+               b'openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>')
+    caminho = _reescrever(origem, destino, planilha, **{
+        "[Content_Types].xml": lambda d: d.replace(b"</Types>", tipo),
+        "xl/_rels/workbook.xml.rels": lambda d: d.replace(b"</Relationships>", relacao),
+        "xl/sharedStrings.xml": lambda _: (
+            b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            + b"".join(b"<si><t>" + t + b"</t></si>" for t in textos) + b"</sst>"),
+    })
+    assert textos and b"inlineStr" not in zipfile.ZipFile(caminho).read("xl/worksheets/sheet1.xml")
+    return caminho
+
+
+def _sem_referencias(origem, destino):
+    """Cópia do .xlsx sem r= (opcional na especificação) nas linhas e nas células que seguem a anterior."""
+    def linha(m):
+        celulas, anterior = [], 0
+        for celula in re.findall(rb"<c\b.*?(?:/>|</c>)", m.group(2)):
+            coluna = _indice(re.search(rb' r="([A-Z]+)\d+"', celula).group(1).decode())
+            if coluna == anterior + 1:
+                celula = re.sub(rb' r="[A-Z]+\d+"', b"", celula, count=1)
+            anterior = coluna
+            celulas.append(celula)
+        return b"<row" + m.group(1) + b"".join(celulas) + b"</row>"
+
+    def planilha(dados):
+        dados = re.sub(rb'(<row\b[^>]*?) r="\d+"', rb"\1", dados)
+        dados = re.sub(rb"<row\b([^>]*>)(.*?)</row>", linha, dados, flags=re.S)
+        assert b"<row r=" not in dados and b'<c t="' in dados and b'<c r="' in dados
+        return dados
+
+    return _reescrever(origem, destino, planilha)
+
+
+def _esperado(caminho):
+    """pd.read_excel convertido para os tipos da leitura (códigos e inteiros ausentes = -1)."""
+    df = pd.read_excel(caminho, sheet_name=ABA)
+    return pd.DataFrame({
+        'ID_SERVIDOR_CPF': [INTEIRO_AUSENTE if pd.isna(v) else int(re.sub(r"\D", "", str(v))) for v in df['ID_SERVIDOR_CPF']],
+        'NO_ORGAO': df['NO_ORGAO'],
+        'DT_NASC_SERVIDOR': pd.to_datetime(df['DT_NASC_SERVIDOR'], dayfirst=True, errors="coerce").astype("datetime64[ns]"),
+        'CO_TIPO_FUNDO': pd.to_numeric(df['CO_TIPO_FUNDO'], errors="coerce").fillna(CODIGO_AUSENTE).astype(np.int8),
+        'VL_CONTRIBUICAO': df['VL_CONTRIBUICAO'].astype(np.float64),
+        'ID_SERVIDOR_MATRICULA': df['ID_SERVIDOR_MATRICULA'].astype(object),
+    })
+
+
+def _valores(df):
+    # Compara só os valores: o pandas infere str ou object para os textos conforme o bloco
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.fixture(params=["inline", "compartilhados", "sem_r"])
+def planilha(request, tmp_path):
+    caminho = _salvar(tmp_path / "servidor.xlsx")
+    if request.param != "inline":
+        caminho = _textos_compartilhados(caminho, tmp_path / "servidor_compartilhados.xlsx")
+    if request.param == "sem_r":
+        caminho = _sem_referencias(caminho, tmp_path / "servidor_sem_r.xlsx")
+    return caminho
+
+
+def test_igual_ao_read_excel(planilha):
+    lido = ler_colunas(planilha, ABA, COLUNAS)
+    esperado = _esperado(planilha)
+
+    assert len(lido) == len(LINHAS)  # linhas finais vazias nas colunas lidas continuam na aba
+    pd.testing.assert_frame_equal(_valores(lido), _valores(esperado))
+    assert lido['ID_SERVIDOR_CPF'].dtype == np.int64 and lido['CO_TIPO_FUNDO'].dtype == np.int8
+    assert lido['DT_NASC_SERVIDOR'].tolist()[:2] == [pd.Timestamp(1960, 5, 17), pd.Timestamp(1958, 5, 17)]
+    assert lido['NO_ORGAO'].tolist()[:2] == ["SEFAZ", "SEDUC"]
+    assert ler_cabecalho(planilha, ABA) == CABECALHO
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 2, 4, 100])
+def test_blocos_mantem_as_linhas_finais(planilha, tamanho_bloco):
+    blocos = list(iterar_blocos(planilha, ABA, COLUNAS, tamanho_bloco))
+
+    assert all(len(bloco) <= tamanho_bloco for bloco in blocos)
+    pd.testing.assert_frame_equal(_valores(pd.concat(blocos)), _valores(ler_colunas(planilha, ABA, COLUNAS)))
+
+
+def test_coluna_vazia_no_fim_nao_corta_as_linhas(tmp_path):
+    # Exemplo da revisão: A=[1, 2, vazio, vazio] e F=[1..4] -> 4 linhas, como no read_excel
+    linhas = [[1, None, None, None, None, 1.0, None], [2, None, None, None, None, 2.0, None]]
+    linhas += [[None] * 5 + [float(n), None] for n in (3, 4)]
+    caminho = _salvar(tmp_path / "servidor.xlsx", linhas)
+
+    lido = ler_colunas(caminho, ABA, {'ID_SERVIDOR_CPF': 'inteiro'})
+    assert lido['ID_SERVIDOR_CPF'].tolist() == [1, 2, INTEIRO_AUSENTE, INTEIRO_AUSENTE]
+    assert len(lido) == len(pd.read_excel(caminho, sheet_name=ABA))
@@ -0,0 +1,86 @@
+import json
+import os
+
+from rpps_fundos import sintetico
+from rpps_fundos.monitor import TENTATIVAS_ZIP, Monitor, populacao_do_arquivo
+
+ESPERA = 2.0
+
+
+def _monitor(tmp_path):
+    return Monitor(str(tmp_path / "dados"), str(tmp_path / "resultados"), espera=ESPERA)
+
+
+def test_populacao_do_arquivo():
+    assert populacao_do_arquivo("SERVIDOR_2025_10.xlsx") == "servidor"
+    assert populacao_do_arquivo("base_pensionistas.XLSX") == "pensionista"
+    assert populacao_do_arquivo("~$servidor_2025_10.xlsx") is None  # trava do Excel
+    assert populacao_do_arquivo("servidor_2025_10.csv") is None
+    assert populacao_do_arquivo("outros.xlsx") is None
+
+
+def test_processa_arquivo_novo_uma_unica_vez(tmp_path):
+    (arquivo,) = sintetico.gerar_bases(str(tmp_path / "dados"), {"servidor": 300})["servidor"]
+    caminho = os.path.abspath(arquivo)
+    monitor = _monitor(tmp_path)
+
+    assert monitor.pendentes(agora=0.0) == []  # visto agora: espera o tamanho e o mtime ficarem estáveis
+    assert monitor.pendentes(agora=ESPERA / 2) == []
+    (pronto,) = monitor.pendentes(agora=ESPERA)
+    assert pronto[:2] == (caminho, "servidor")
+
+    registro = monitor.processar(*pronto)
+    assert registro["erro"] is None and registro["populacao"] == "servidor"
+    assert any(saida.endswith("SERVIDOR_resumo_analise.txt") for saida in registro["saidas"])
+    assert monitor.concluidas.get_nowait() is registro
+    assert monitor.pendentes(agora=10 * ESPERA) == []
+
+    # Reiniciado, o monitor lê resultados/monitor.jsonl e não reprocessa o mesmo arquivo
+    with open(monitor.historico, encoding="utf-8") as f:
+        (linha,) = [json.loads(texto) for texto in f]
+    assert linha["arquivo"] == caminho and "resumo" not in linha
+    reiniciado = _monitor(tmp_path)
+    reiniciado.pendentes(agora=0.0)
+    assert reiniciado.pendentes(agora=ESPERA) == []
+
+    # Alterado (novo mtime), volta a ser processado
+    os.utime(arquivo, ns=(os.stat(arquivo).st_atime_ns, os.stat(arquivo).st_mtime_ns + 10**9))
+    reiniciado.pendentes(agora=0.0)
+    assert [p[0] for p in reiniciado.pendentes(agora=ESPERA)] == [caminho]
+
+
+def test_nao_processa_arquivo_ainda_sendo_copiado(tmp_path):
+    (origem,) = sintetico.gerar_bases(str(tmp_path / "origem"), {"aposentado": 300})["aposentado"]
+    os.makedirs(tmp_path / "dados")
+    destino = tmp_path / "dados" / os.path.basename(origem)
+    conteudo = open(origem, "rb").read()
+    monitor = _monitor(tmp_path)
+
+    destino.write_bytes(conteudo[:len(conteudo) // 3])
+    monitor.pendentes(agora=0.0)
+    assert monitor.pendentes(agora=ESPERA) == []  # tamanho estável, mas o zip está incompleto
+
+    with open(destino, "ab") as f:  # a cópia continua: tamanho muda e a espera recomeça
+        f.write(conteudo[len(conteudo) // 3:2 * len(conteudo) // 3])
+    assert monitor.pendentes(agora=ESPERA + 1) == []
+    assert monitor.pendentes(agora=2 * ESPERA) == []
+
+    destino.write_bytes(conteudo)
+    monitor.pendentes(agora=3 * ESPERA)
+    (pronto,) = monitor.pendentes(agora=4 * ESPERA)
+    assert monitor.processar(*pronto)["erro"] is None
+
+
+def test_zip_parado_incompleto_vira_erro_registrado(tmp_path):
+    (origem,) = sintetico.gerar_bases(str(tmp_path / "origem"), {"servidor": 100})["servidor"]
+    os.makedirs(tmp_path / "dados")
+    destino = tmp_path / "dados" / os.path.basename(origem)
+    destino.write_bytes(open(origem, "rb").read()[:500])
+    monitor = _monitor(tmp_path)
+
+    monitor.pendentes(agora=0.0)
+    assert monitor.pendentes(agora=ESPERA * (TENTATIVAS_ZIP - 1)) == []
+    (pronto,) = monitor.pendentes(agora=ESPERA * TENTATIVAS_ZIP)
+    registro = monitor.processar(*pronto)
+    assert registro["erro"] and registro["saidas"] == []
+    assert monitor.pendentes(agora=ESPERA * 10 * TENTATIVAS_ZIP) == []
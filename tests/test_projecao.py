@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rpps_fundos import projecao, sintetico
+from rpps_fundos.classificacao import COMPATIVEL, FUNDO_INDEFINIDO, FUNFIN, FUNPREV, INCOMPATIVEL
+from rpps_fundos.esquema import compactar
+from rpps_fundos.pipeline import POPULACOES, classificar
+
+CRONOGRAMA = {"2027_01": 0.08, "2025_11": 0.05}  # fora de ordem de propósito
+
+
+def test_horizonte_inclui_os_extremos():
+    meses = projecao.horizonte("2025_11")
+    assert projecao.rotulos_meses(meses[[0, -1]]) == ["2025_11", projecao.FIM_HORIZONTE]
+    assert len(meses) == 42
+    assert projecao.mes_seguinte("2025_12") == "2026_01"
+    with pytest.raises(ValueError):
+        projecao.horizonte("2030_01")
+
+
+def test_escalonar_degraus():
+    meses = projecao.horizonte("2025_10", "2027_02")
+    aliquotas = projecao.escalonar(CRONOGRAMA, meses)
+    assert aliquotas[0] == 0.0  # antes do primeiro degrau
+    assert (aliquotas[1:15] == 0.05).all()  # 2025_11 a 2026_12
+    assert (aliquotas[15:] == 0.08).all()
+    assert (projecao.escalonar({}, meses) == 0).all()
+
+
+def test_fator_reajuste_acumulado():
+    meses = projecao.horizonte("2026_04", "2027_06")
+    fator = projecao.fator_reajuste({"2027_05": 0.05, "2026_05": 0.04}, meses)
+    assert fator[0] == 1.0
+    assert fator[1] == pytest.approx(1.04)
+    assert fator[-1] == pytest.approx(1.04 * 1.05)
+    assert (projecao.fator_reajuste(None, meses) == 1).all()
+
+
+@pytest.fixture
+def quadro():
+    # compatível FUNFIN, a menor (calculado FUNFIN), a maior (informado FUNFIN), indefinido informado FUNFIN, fora
+    return pd.DataFrame({
+        'NO_ORGAO': pd.Categorical(["A", "B", "A", "B", "A"]),
+        'CO_TIPO_FUNDO': np.array([FUNFIN, FUNPREV, FUNFIN, FUNFIN, FUNPREV], dtype=np.int8),
+        'CALCULO_FUNDO': np.array([FUNFIN, FUNFIN, FUNPREV, FUNDO_INDEFINIDO, FUNPREV], dtype=np.int8),
+        'COMPATIBILIDADE_FUNDO': np.array([COMPATIVEL, INCOMPATIVEL, INCOMPATIVEL, INCOMPATIVEL, COMPATIVEL],
+                                          dtype=np.int8),
+        'VL_CONTRIBUICAO': [140.0, 280.0, 70.0, np.nan, 1000.0],
+    })
+
+
+def test_projetar_e_por_mes(quadro):
+    meses = projecao.horizonte("2025_10", "2025_12")
+    resultado = projecao.projetar("servidor", quadro, CRONOGRAMA, meses, reajustes={"2025_12": 0.10})
+    assert resultado.linhas.tolist() == [0, 1, 2, 3]
+
+    mensal = projecao.por_mes(resultado).set_index('MES')
+    # remuneração = VL_CONTRIBUICAO / 14%: 1000, 2000 e 500; a linha sem contribuição não soma
+    assert mensal.loc["2025_10", projecao.MEDIDAS].tolist() == [0, 0, 0, 0, 0]
+    assert mensal.loc["2025_11", 'FUNFIN_CALCULADO'] == pytest.approx(3000 * 0.05)
+    assert mensal.loc["2025_11", 'FUNFIN_INFORMADO'] == pytest.approx(1500 * 0.05)
+    assert mensal.loc["2025_11", 'RISCO_A_MENOR'] == pytest.approx(2000 * 0.05)
+    assert mensal.loc["2025_11", 'RISCO_A_MAIOR'] == pytest.approx(500 * 0.05)
+    assert mensal.loc["2025_12", 'EM_RISCO'] == pytest.approx(2500 * 0.05 * 1.10)
+
+    contribuicao = projecao.projetar("servidor", quadro, CRONOGRAMA, meses, base="contribuicao")
+    assert projecao.por_mes(contribuicao).loc[1, 'FUNFIN_CALCULADO'] == pytest.approx(420 * 0.05)
+    with pytest.raises(ValueError):
+        projecao.projetar("servidor", quadro, CRONOGRAMA, meses, base="folha")
+
+
+def test_aposentados_projetados_sobre_a_contribuicao(quadro):
+    meses = projecao.horizonte("2025_11", "2025_11")
+    padrao = projecao.projetar("aposentado", quadro, CRONOGRAMA, meses)
+    assert projecao.por_mes(padrao).loc[0, 'FUNFIN_CALCULADO'] == pytest.approx(420 * 0.05)  # sem / 14%
+    with pytest.raises(ValueError, match="não se aplica a aposentado"):
+        projecao.projetar("aposentado", quadro, CRONOGRAMA, meses, base="remuneracao")
+
+    projecoes = [projecao.projetar(p, quadro, CRONOGRAMA, meses) for p in ("servidor", "aposentado")]
+    mensal = pd.concat([projecao.por_mes(p) for p in projecoes])
+    orgaos = pd.concat([projecao.por_orgao(p, quadro)[0] for p in projecoes])
+    bases = {p: projecao.base_da_populacao(p) for p in ("servidor", "aposentado")}
+    resumo = projecao.resumo_projecao(mensal, orgaos, {"servidor": CRONOGRAMA, "aposentado": CRONOGRAMA}, bases, None)
+    assert "3. Base (servidor): remuneracao (VL_CONTRIBUICAO / 14,00%)" in resumo
+    assert "3. Base (aposentado): contribuicao (VL_CONTRIBUICAO)" in resumo
+
+
+def test_registros_em_risco(quadro):
+    quadro['ID_SERVIDOR_MATRICULA'] = [1, 2, 3, 4, 5]
+    quadro['ID_SERVIDOR_CPF'] = [11, 22, 33, -1, 55]  # -1: CPF ausente na leitura
+    resultado = projecao.projetar("servidor", quadro, CRONOGRAMA, projecao.horizonte("2025_11", "2025_12"))
+    tabela = projecao.registros_em_risco(resultado, quadro)
+    assert tabela['MATRICULA'].tolist() == [2, 3, 4]
+    assert tabela['RISCO'].tolist() == ["a menor", "a maior", "a maior"]
+    assert tabela['TOTAL_PROJETADO'].tolist() == pytest.approx([200.0, 50.0, 0.0])
+    assert tabela['CPF'].isna().tolist() == [False, False, True]
+
+
+def test_por_orgao_bate_com_agrupamento_do_pandas():
+    config = POPULACOES["servidor"]
+    df = sintetico.gerar("servidor", 5000, semente=3, colunas=list(config["colunas"]))
+    df = classificar("servidor", compactar(df, config["colunas"]))
+    meses = projecao.horizonte("2025_11")
+    resultado = projecao.projetar("servidor", df, CRONOGRAMA, meses, reajustes={"2026_05": 0.04})
+    totais, mensal, nomes = projecao.por_orgao(resultado, df)
+
+    # Independente: fluxo de cada registro no horizonte, somado por órgão com groupby
+    registros = df.iloc[resultado.linhas]
+    fluxo = registros['VL_CONTRIBUICAO'].fillna(0).to_numpy() / 0.14 * (
+        projecao.escalonar(CRONOGRAMA, meses) * projecao.fator_reajuste({"2026_05": 0.04}, meses)).sum()
+    esperado = pd.DataFrame({
+        'NO_ORGAO': registros['NO_ORGAO'].astype(object).to_numpy(),
+        'FUNFIN_CALCULADO': fluxo * (registros['CALCULO_FUNDO'].to_numpy() == FUNFIN),
+        'EM_RISCO': fluxo * (registros['COMPATIBILIDADE_FUNDO'].to_numpy() == INCOMPATIVEL),
+    }).groupby('NO_ORGAO').sum()
+
+    totais = totais.set_index('NO_ORGAO')
+    assert list(totais.index) == list(esperado.index) == list(nomes)
+    for medida in ('FUNFIN_CALCULADO', 'EM_RISCO'):
+        np.testing.assert_allclose(totais[medida], esperado[medida], rtol=1e-9)
+        np.testing.assert_allclose(mensal[medida].sum(axis=0), projecao.por_mes(resultado)[medida], rtol=1e-9)
+    assert totais['REGISTROS_EM_RISCO'].sum() == (resultado.pesos[:, -1] > 0).sum()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rpps_fundos import classificacao, simulacao
+from rpps_fundos.classificacao import COMPATIVEL, FUNDO_INDEFINIDO, FUNFIN, FUNPREV
+
+LINHAS = 4000
+CORTES_ENTE = np.array(["2010-01-01", "2018-12-27", "2020-06-30", "1990-01-01"], dtype="datetime64[ns]")
+CORTES_NASC = np.array(["1957-02-28", "1950-01-01", "1965-12-31"], dtype="datetime64[ns]")
+
+
+@pytest.fixture(scope="module")
+def base():
+    """Datas sorteadas em poucos dias (muitas iguais aos cortes), NaT e IN_PREV_COMP 1, 2 e outros."""
+    rng = np.random.default_rng(11)
+    ingressos = rng.choice(np.concatenate([CORTES_ENTE, CORTES_ENTE + np.timedelta64(1, "D"),
+                                           np.array(["1985-03-01", "2024-01-01"], dtype="datetime64[ns]")]), LINHAS)
+    nascimentos = rng.choice(np.concatenate([CORTES_NASC, CORTES_NASC - np.timedelta64(1, "D"),
+                                             np.array(["1940-01-01", "1990-01-01"], dtype="datetime64[ns]")]), LINHAS)
+    ingressos[rng.random(LINHAS) < 0.05] = np.datetime64("NaT")
+    nascimentos[rng.random(LINHAS) < 0.05] = np.datetime64("NaT")
+    valores = rng.gamma(2.0, 500.0, LINHAS)
+    valores[rng.random(LINHAS) < 0.02] = np.nan
+    return pd.DataFrame({
+        'DT_ING_ENTE': ingressos, 'DT_NASC': nascimentos,
+        'IN_PREV_COMP': rng.choice([1, 2, 0, 9, classificacao.CODIGO_AUSENTE], LINHAS).astype(np.int8),
+        'CO_TIPO_FUNDO': rng.choice([FUNPREV, FUNFIN, 0, classificacao.CODIGO_AUSENTE], LINHAS).astype(np.int8),
+        'VL_CONTRIBUICAO': valores,
+    })
+
+
+def _par_a_par(df, corte_ente, corte_nasc):
+    """A mesma linha do resultado, reclassificando a base inteira com o par de cortes."""
+    calculo = classificacao.calcular_fundo(df['DT_ING_ENTE'], df['DT_NASC'], df['IN_PREV_COMP'], corte_ente, corte_nasc)
+    compativel = classificacao.calcular_compatibilidade(df['CO_TIPO_FUNDO'], calculo) == COMPATIVEL
+    vl = df['VL_CONTRIBUICAO'].fillna(0).to_numpy()
+    return {
+        "FUNFIN": int((calculo == FUNFIN).sum()), "FUNPREV": int((calculo == FUNPREV).sum()),
+        "INDEFINIDO": int((calculo == FUNDO_INDEFINIDO).sum()),
+        "COMPATIVEIS": int(compativel.sum()), "INCOMPATIVEIS": int((~compativel).sum()),
+        "VL_CONTRIBUICAO_FUNFIN": vl[calculo == FUNFIN].sum(), "VL_CONTRIBUICAO_FUNPREV": vl[calculo == FUNPREV].sum(),
+        "VL_CONTRIBUICAO_INCOMPATIVEL": vl[~compativel].sum(),
+    }
+
+
+def test_igual_a_classificar_par_a_par(base):
+    pares = simulacao.grade_cortes(CORTES_ENTE, CORTES_NASC) + [(CORTES_ENTE[1], CORTES_NASC[0])]  # par repetido
+    resultado = simulacao.simular_cortes(base['DT_ING_ENTE'], base['DT_NASC'], base['IN_PREV_COMP'],
+                                         base['CO_TIPO_FUNDO'], base['VL_CONTRIBUICAO'], pares)
+
+    assert len(resultado) == len(pares)
+    for (corte_ente, corte_nasc), linha in zip(pares, resultado.to_dict("records")):
+        assert (linha.pop("DATA_CORTE_ENTE"), linha.pop("DATA_CORTE_NASC")) == (corte_ente, corte_nasc)
+        esperado = _par_a_par(base, corte_ente, corte_nasc)
+        assert linha == pytest.approx(esperado, rel=1e-9), (corte_ente, corte_nasc)
+        assert linha["FUNFIN"] + linha["FUNPREV"] + linha["INDEFINIDO"] == LINHAS
+
+
+def test_sem_datas_validas_nao_ha_funfin(base):
+    # NaT nunca atende FUNFIN; para FUNPREV, só o IN_PREV_COMP = 1 decide (complemento de "não FUNPREV")
+    sem_datas = base.assign(DT_ING_ENTE=np.datetime64("NaT"), DT_NASC=np.datetime64("NaT"))
+    resultado = simulacao.simular_cortes(sem_datas['DT_ING_ENTE'], sem_datas['DT_NASC'], sem_datas['IN_PREV_COMP'],
+                                         sem_datas['CO_TIPO_FUNDO'], sem_datas['VL_CONTRIBUICAO'],
+                                         [(CORTES_ENTE[0], CORTES_NASC[0])])
+    assert resultado["FUNFIN"].tolist() == [0]
+    assert resultado["FUNPREV"].tolist() == [int((base['IN_PREV_COMP'] == 1).sum())]
+
+
+def test_posicoes_e_dominancia_contra_contagem_direta():
+    cortes = np.array(["2000-01-01", "2010-01-01"], dtype="datetime64[ns]")
+    valores = np.array(["1999-12-31", "2000-01-01", "2005-01-01", "2010-01-01", "2011-01-01", "NaT"],
+                       dtype="datetime64[ns]")
+    assert simulacao._posicoes(valores, cortes, nat_no_fim=True).tolist() == [0, 0, 1, 1, 2, 2]
+    assert simulacao._posicoes(valores, cortes, nat_no_fim=False).tolist() == [0, 0, 1, 1, 2, 0]
+
+    rng = np.random.default_rng(3)
+    k, l = 3, 4
+    pos_ing, pos_nasc, pesos = rng.integers(0, k + 1, 500), rng.integers(0, l + 1, 500), rng.random(500)
+    matriz = simulacao._dominancia(pos_ing, pos_nasc, pesos, k, l)
+    for j in range(k):
+        for m in range(l):
+            # ingresso <= corte_ente[j] (posição <= j) e nascimento > corte_nasc[m] (posição > m)
+            assert matriz[j, m] == pytest.approx(pesos[(pos_ing <= j) & (pos_nasc > m)].sum())
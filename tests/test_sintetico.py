@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from rpps_fundos import benchmark, sintetico
+from rpps_fundos.classificacao import INCOMPATIVEL
+from rpps_fundos.pipeline import POPULACOES, carregar
+
+
+def test_gerar_segue_o_layout_e_e_reprodutivel():
+    df = sintetico.gerar("servidor", 500, semente=3, taxa_data_invalida=0.02)
+
+    assert list(df.columns) == [nome for nome, _ in sintetico.ler_layout("servidor")]
+    pd.testing.assert_frame_equal(df, sintetico.gerar("servidor", 500, semente=3, taxa_data_invalida=0.02))
+    assert not df.equals(sintetico.gerar("servidor", 500, semente=4, taxa_data_invalida=0.02))
+    for nome, linhas in df.attrs["datas_invalidas"].items():
+        assert df[nome].iloc[linhas].isna().all()
+    assert len(df.attrs["datas_invalidas"]["DT_NASC_SERVIDOR"]) > 0
+
+
+def test_gerar_cpfs_distintos_com_digitos_validos():
+    cpfs = sintetico.gerar_cpfs(np.random.default_rng(0), 2000)
+    assert len(np.unique(cpfs)) == 2000
+    for cpf in cpfs[:50]:
+        digitos = [int(d) for d in f"{cpf:011d}"]
+        for n in (9, 10):
+            resto = sum(d * p for d, p in zip(digitos[:n], range(n + 1, 1, -1))) * 10 % 11
+            assert digitos[n] == resto % 10
+
+
+def test_bases_geradas_sao_lidas_pelo_pipeline(tmp_path):
+    arquivos = sintetico.gerar_bases(str(tmp_path), 400, semente=1)
+
+    assert set(arquivos) == set(POPULACOES)
+    for populacao in POPULACOES:
+        df, arquivo, _ = carregar(populacao, pasta_dados=str(tmp_path))
+        assert arquivo == arquivos[populacao][0]
+        assert len(df) == 400
+        assert (df['COMPATIBILIDADE_FUNDO'] == INCOMPATIVEL).any()
+
+
+def test_benchmark_mede_todas_as_etapas(tmp_path):
+    medidas = benchmark.executar_benchmark((300,), populacoes=["servidor"], memoria=False, pasta=str(tmp_path))
+
+    assert set(medidas["etapa"]) <= set(benchmark.ETAPAS)
+    assert {"leitura", "leitura_cache", "classificacao", "escrita", "resumo"} <= set(medidas["etapa"])
+    assert (medidas["linhas"] == 300).all() and (medidas["entrada"] == "xlsx").all()
+    assert (medidas["segundos"] >= 0).all()
+
+    anterior = medidas.assign(versao="anterior", segundos=medidas["segundos"] / 10)
+    comparacao = benchmark.comparar(medidas.assign(segundos=medidas["segundos"] + 1), anterior)
+    assert comparacao["regressao"].all()
+    assert not benchmark.comparar(medidas, medidas)["regressao"].any()  # mesma versão não é referência
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rpps_fundos import sintetico, validacao
+from rpps_fundos.pipeline import POPULACOES, VALIDACAO_SERVIDOR, carregar, processar
+
+
+@pytest.fixture(autouse=True)
+def limites(monkeypatch):
+    # Cada teste parte dos limites padrão, sem afetar os demais
+    monkeypatch.setattr(validacao, "LIMITES", dict(validacao.LIMITES))
+
+
+def _bits(resultado, regras, nome):
+    bit = [regra.nome for regra in regras].index(nome)
+    return (resultado.mascara >> bit & 1).astype(bool).tolist()
+
+
+def test_base_de_calculo_acima_do_teto_especifico_linha_a_linha():
+    df = pd.DataFrame({
+        'VL_BASE_CALCULO': [5000.0, 40000.0, 40000.0, np.nan],
+        'VL_TETO_ESPECIFICO': [39000.0, 39000.0, 46000.0, 39000.0],
+    })
+    resultado = validacao.validar(df, VALIDACAO_SERVIDOR)
+    assert _bits(resultado, VALIDACAO_SERVIDOR, "base_calculo_acima_teto_especifico") == [False, True, False, False]
+    assert resultado.contagens["base_calculo_acima_teto_especifico"] == 1
+    assert "contribuicao_abaixo_minimo" in resultado.ausentes
+
+
+def test_limites_vigentes_na_avaliacao():
+    regras = [validacao.abaixo('VL_CONTRIBUICAO', validacao.CONTRIBUICAO_MINIMA, "abaixo_minimo", "abaixo"),
+              validacao.acima('VL_CONTRIBUICAO', validacao.CONTRIBUICAO_MAXIMA, "acima_teto", "acima")]
+    df = pd.DataFrame({'VL_CONTRIBUICAO': [200.0, 240.0, 7000.0]})
+
+    padrao = validacao.validar(df, regras)
+    assert padrao.contagens == {"abaixo_minimo": 1, "acima_teto": 1}  # 14% de 1631 = 228,34; de 46366,19 = 6491,27
+
+    validacao.definir_limites(salario_minimo=1800, teto_remuneratorio=45000)
+    atualizado = validacao.validar(df, regras)
+    assert _bits(atualizado, regras, "abaixo_minimo") == [True, True, False]
+    assert _bits(atualizado, regras, "acima_teto") == [False, False, True]
+    assert validacao.valor_limite(validacao.CONTRIBUICAO_MAXIMA) == 6300.0
+
+
+def test_definir_limites_mantem_o_que_nao_foi_informado():
+    teto = validacao.LIMITES["TETO_REMUNERATORIO"]
+    limites = validacao.definir_limites(salario_minimo=1700)
+    assert limites == {"SALARIO_MINIMO": 1700.0, "TETO_REMUNERATORIO": teto}
+    with pytest.raises(ValueError):
+        validacao.definir_limites(teto_remuneratorio=0)
+
+
+def test_resumo_mostra_o_limite_vigente():
+    regras = [validacao.acima('VL_CONTRIBUICAO', validacao.CONTRIBUICAO_MAXIMA, "acima_teto", "Acima do teto")]
+    df = pd.DataFrame({'VL_CONTRIBUICAO': [7000.0, 100.0]})
+    df['VALIDACAO'] = validacao.validar(df, regras).mascara
+    assert "3.1 - [1] Acima do teto (6491.27): 1" in validacao.resumo_validacao(df, regras)
+
+
+@pytest.mark.parametrize("populacao", list(POPULACOES))
+def test_extrato_sem_as_colunas_so_da_validacao(tmp_path, populacao):
+    config = POPULACOES[populacao]
+    df = sintetico.gerar(populacao, 300, semente=5)
+    sintetico.salvar(df, populacao, str(tmp_path / "completo"))
+    sintetico.salvar(df.drop(columns=config["opcionais"]), populacao, str(tmp_path / "reduzido"))
+
+    completo, _, _ = carregar(populacao, pasta_dados=str(tmp_path / "completo"))
+    reduzido, _, _ = carregar(populacao, pasta_dados=str(tmp_path / "reduzido"))
+    assert not set(config["opcionais"]) & set(reduzido.columns)
+    pd.testing.assert_series_equal(reduzido['COMPATIBILIDADE_FUNDO'], completo['COMPATIBILIDADE_FUNDO'])
+
+    resultado = processar(populacao, pasta_dados=str(tmp_path / "reduzido"), pasta_resultados=str(tmp_path / "resultados"))
+    assert resultado["execucao"]["linhas"] == 300
+    texto = (tmp_path / "resultados" / config["arquivo_validacao"]).read_text(encoding="utf-8")
+    assert "VL_TETO_ESPECIFICO: não avaliada (coluna ausente)" in texto